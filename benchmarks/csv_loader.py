@@ -0,0 +1,101 @@
+"""Benchmark the cosmos sales CSV loaders.
+
+Compares the previous ``kedro_datasets.pandas.CSVDataset`` configuration (plus the
+``pd.to_datetime``/``handle_empty_numeric`` passes it required in the node) with
+``ArrowCSVDataset`` on a synthetic cp1250 file of the requested size.
+
+    python benchmarks/csv_loader.py --size-mb 2048
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from kedro_datasets.pandas import CSVDataset  # noqa: E402
+
+from coding_challenge.extras.datasets import ArrowCSVDataset  # noqa: E402
+from coding_challenge.utils.transformations import handle_empty_numeric  # noqa: E402
+
+PANDAS_LOAD_ARGS = {
+    "sep": ";",
+    "decimal": ",",
+    "encoding": "cp1250",
+    "parse_dates": ["Datum"],
+    "dayfirst": True,
+}
+
+ARROW_LOAD_ARGS = {
+    "sep": ";",
+    "decimal": ",",
+    "encoding": "cp1250",
+    "parse_dates": ["Datum"],
+    "date_format": "%d.%m.%Y",
+    "dtype": {"VK-Menge": "double"},
+    "fill_null": {"VK-Menge": 0},
+}
+
+
+def write_sales_file(path: Path, size_mb: int, chunk_rows: int = 1_000_000) -> None:
+    rng = np.random.default_rng(42)
+    dates = pd.date_range("2020-01-01", periods=1500).strftime("%d.%m.%Y").to_numpy()
+    header = True
+
+    with open(path, "w", encoding="cp1250", newline="") as f:
+        while path.stat().st_size < size_mb * 1024 * 1024:
+            quantity = rng.normal(5, 4, chunk_rows).round(2).astype(str)
+            quantity[rng.random(chunk_rows) < 0.01] = ""
+            chunk = pd.DataFrame({
+                "Datum": dates[rng.integers(0, len(dates), chunk_rows)],
+                "Kunde": rng.integers(1, 500, chunk_rows),
+                "Artikel": rng.integers(1, 5000, chunk_rows),
+                "VK-Menge": np.char.replace(quantity, ".", ","),
+                "VK-Betrag": np.char.replace(rng.uniform(0, 50, chunk_rows).round(2).astype(str), ".", ","),
+            })
+            chunk.to_csv(f, sep=";", index=False, header=header)
+            header = False
+            f.flush()
+
+
+def load_pandas(path: Path) -> pd.DataFrame:
+    df = CSVDataset(filepath=str(path), load_args=PANDAS_LOAD_ARGS).load()
+    df["Datum"] = pd.to_datetime(df["Datum"])
+    df["VK-Menge"] = handle_empty_numeric(df["VK-Menge"])
+    return df
+
+
+def load_arrow(path: Path) -> pd.DataFrame:
+    return ArrowCSVDataset(filepath=str(path), load_args=ARROW_LOAD_ARGS).load()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--file", type=Path, help="reuse an existing sales file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = Path(tmp) / "sales_2024_01_01.csv"
+            write_sales_file(path, args.size_mb)
+        print(f"{path}: {path.stat().st_size / 1024 ** 2:,.0f} MB")
+
+        results = {}
+        for name, loader in [("pandas CSVDataset", load_pandas), ("ArrowCSVDataset", load_arrow)]:
+            start = time.perf_counter()
+            df = loader(path)
+            results[name] = df
+            print(f"{name:<20} {time.perf_counter() - start:8.2f} s  {len(df):,} rows")
+
+        expected, actual = results.values()
+        pd.testing.assert_frame_equal(expected, actual, check_dtype=False)
+
+
+if __name__ == "__main__":
+    main()
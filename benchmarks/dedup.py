@@ -0,0 +1,79 @@
+"""Benchmark ``deduplicate_incremental_data`` against the previous sort-based version.
+
+Builds a sales-like history with overlapping extraction windows and times both
+implementations at each requested size, checking that they keep the same rows.
+
+    python benchmarks/dedup.py --rows 1000000 10000000 100000000 --stores 1000 --products 5000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from coding_challenge.utils.transformations import deduplicate_incremental_data  # noqa: E402
+
+KEY_COLS = ["target_date", "number_store", "number_product"]
+
+
+def sort_based(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values("extraction_date", kind="stable").drop_duplicates(
+        subset=KEY_COLS,
+        keep="last"
+    )
+
+
+def make_history(
+    n_rows: int,
+    n_stores: int = 1000,
+    n_products: int = 5000,
+    window_days: int = 14,
+    seed: int = 0
+) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_extractions = max(n_rows // 200_000, 30)
+    extraction_day = rng.integers(0, n_extractions, n_rows)
+    target_day = extraction_day - rng.integers(0, window_days, n_rows)
+    start = np.datetime64("2020-01-01", "ns")
+    one_day = np.timedelta64(1, "D")
+    return pd.DataFrame({
+        "target_date": start + target_day * one_day,
+        "number_store": rng.integers(1, n_stores + 1, n_rows, dtype=np.int32),
+        "number_product": rng.integers(1, n_products + 1, n_rows, dtype=np.int32),
+        "extraction_date": start + extraction_day * one_day,
+        "raw_quantity": rng.normal(5, 3, n_rows),
+    })
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 100_000_000])
+    parser.add_argument("--stores", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--skip-check", action="store_true", help="do not compare the results")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'sort + drop_duplicates':>24} {'scatter-max latest-wins':>24} {'speedup':>8}")
+    for n_rows in args.rows:
+        df = make_history(n_rows, args.stores, args.products)
+        sort_seconds, expected = timed(sort_based, df)
+        scatter_seconds, actual = timed(lambda frame: deduplicate_incremental_data(frame, KEY_COLS), df)
+        if not args.skip_check:
+            pd.testing.assert_frame_equal(actual, expected.sort_index())
+        speedup = sort_seconds / scatter_seconds
+        print(f"{n_rows:>12,} {sort_seconds:>22.2f} s {scatter_seconds:>22.2f} s {speedup:>7.1f}x")
+        del df, expected, actual
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark ``join_dimensions`` against the chained ``pd.merge`` calls it replaces.
+
+Builds a galaxy-like fact table (sales/deliveries per store, product and day) with the
+two mappings and the product, price and store masters, and reports time and peak
+traced memory of both joins, checking that they produce the same frame.
+
+    python benchmarks/dimension_join.py --rows 1000000 10000000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from coding_challenge.utils.joins import join_dimensions  # noqa: E402
+
+N_STORES = 300
+N_PRODUCTS = 5000
+
+
+def make_tables(n_rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    fact = pd.DataFrame({
+        "target_date": np.datetime64("2024-01-01", "ns") + rng.integers(0, 365, n_rows) * np.timedelta64(1, "D"),
+        "number_store": rng.integers(1, N_STORES + 1, n_rows, dtype=np.int32),
+        "number_product": rng.integers(1, N_PRODUCTS + 1, n_rows, dtype=np.int32),
+        "sales_qty": rng.random(n_rows, dtype=np.float32),
+        "delivery_qty": rng.random(n_rows, dtype=np.float32),
+    })
+    # a few unmapped keys, like new articles missing from the mapping
+    products = np.arange(1, N_PRODUCTS + 1, dtype=np.int32)
+    stores = np.arange(1, N_STORES + 1, dtype=np.int32)
+    dimensions = [
+        (pd.DataFrame({"number_product": products[:-10], "id_product": products[:-10] + 10_000_000}), "number_product"),
+        (pd.DataFrame({"number_store": stores[:-1], "id_store": stores[:-1] + 100_000_000}), "number_store"),
+        (pd.DataFrame({
+            "number_product": products,
+            "product_name": pd.Categorical([f"Artikel {p}" for p in products]),
+            "moq": rng.integers(0, 10, N_PRODUCTS),
+        }), "number_product"),
+        (pd.DataFrame({"number_product": products[::2], "price": rng.random(len(products[::2]))}), "number_product"),
+        (pd.DataFrame({
+            "number_store": stores,
+            "store_name": pd.Categorical([f"Filiale {s}" for s in stores]),
+            "store_address": pd.Categorical([f"Straße {s} – 12345 – Ort" for s in stores]),
+        }), "number_store"),
+    ]
+    return fact, dimensions
+
+
+def chained_merges(fact, dimensions):
+    merged = fact.copy()
+    for dimension, key in dimensions:
+        merged = merged.merge(dimension, on=key, how="left")
+    return merged
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    mb = 1024 ** 2
+    print(f"{'rows':>12} {'merge':>9} {'peak':>9} {'lookup':>9} {'peak':>9} {'result':>9}")
+    for n_rows in args.rows:
+        fact, dimensions = make_tables(n_rows)
+        expected, merge_seconds, merge_peak = measure(chained_merges, fact, dimensions)
+        del expected
+        joined, join_seconds, join_peak = measure(join_dimensions, fact, dimensions)
+        result_size = joined.memory_usage(deep=True).sum()
+        del joined
+
+        print(
+            f"{n_rows:>12,} {merge_seconds:>8.2f}s {merge_peak / mb:>7.0f}MB "
+            f"{join_seconds:>8.2f}s {join_peak / mb:>7.0f}MB {result_size / mb:>7.0f}MB"
+        )
+
+    fact, dimensions = make_tables(100_000)
+    pd.testing.assert_frame_equal(join_dimensions(fact, dimensions), chained_merges(fact, dimensions))
+
+
+if __name__ == "__main__":
+    main()
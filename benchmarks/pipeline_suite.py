@@ -0,0 +1,130 @@
+"""Time every node of ``etl_cosmos`` and ``etl_galaxy`` end to end at several scales.
+
+Generates synthetic raw data per scale (``synthetic_data.py``), runs both pipelines on
+it with ``kedro run`` in a fresh process and appends the per-node metrics recorded by
+``PerformanceHooks`` to ``benchmarks/results/pipeline_suite.csv``, tagged with the git
+commit, so that runs can be compared across commits.
+
+    python benchmarks/pipeline_suite.py --scales small medium
+    python benchmarks/pipeline_suite.py --compare
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_data import Scale, generate  # noqa: E402
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+RESULTS = PROJECT_PATH / "benchmarks" / "results" / "pipeline_suite.csv"
+
+SCALES = {
+    "small": Scale(stores=10, products=100, days=14, overlap=7),
+    "medium": Scale(stores=50, products=500, days=30, overlap=14),
+    "large": Scale(stores=150, products=1500, days=60, overlap=14, density=0.3),
+}
+
+RUNS = [
+    ("1001", "1001_customer", "etl_cosmos"),
+    ("1001", "1001_customer", "etl_cosmos_duckdb"),
+    ("1003", "1003_customer", "etl_galaxy"),
+]
+
+
+def git_commit() -> str:
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=PROJECT_PATH, capture_output=True, text=True
+        ).stdout.strip()
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    return f"{commit}-dirty" if git("status", "--porcelain", "--untracked-files=no") else commit
+
+
+def run_pipeline(data_path: Path, env: str, pipeline: str, handoff: str) -> float:
+    environ = dict(os.environ, filepath_prefix=str(data_path), handoff=handoff)
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "kedro", "run", "--env", env, "--pipeline", pipeline],
+        cwd=PROJECT_PATH, env=environ, check=True, stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def latest_metrics(data_path: Path) -> pd.DataFrame:
+    versions = sorted((data_path / "08_reporting" / "performance_metrics.parquet").iterdir())
+    return pd.read_parquet(versions[-1] / "performance_metrics.parquet")
+
+
+def run_suite(scales, handoff: str, results: Path = RESULTS) -> pd.DataFrame:
+    commit = git_commit()
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    frames = []
+    for scale_name in scales:
+        scale = SCALES[scale_name]
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            generate(Path(tmp), scale)
+            print(f"{scale_name}: generated {asdict(scale)} in {time.perf_counter() - start:.1f}s")
+
+            for customer, env, pipeline in RUNS:
+                data_path = Path(tmp) / f"customer_{customer}"
+                wall = run_pipeline(data_path, env, pipeline, handoff)
+                metrics = latest_metrics(data_path)
+                nodes = metrics.loc[metrics["kind"] == "node", [
+                    "name", "wall_seconds", "cpu_seconds", "peak_rss_delta_mb", "rows_in", "rows_out"
+                ]]
+                total = pd.DataFrame([{"name": "<run>", "wall_seconds": wall}])
+                frame = pd.concat([nodes, total], ignore_index=True)
+                frame.insert(0, "pipeline", pipeline)
+                frame.insert(0, "handoff", handoff)
+                frame.insert(0, "scale", scale_name)
+                frame.insert(0, "timestamp", timestamp)
+                frame.insert(0, "commit", commit)
+                frames.append(frame)
+                print(f"{scale_name}: {pipeline} finished in {wall:.1f}s")
+
+    new = pd.concat(frames, ignore_index=True)
+    results.parent.mkdir(parents=True, exist_ok=True)
+    new.to_csv(results, mode="a", header=not results.exists(), index=False)
+    return new
+
+
+def compare(results: Path = RESULTS, last: int = 2) -> pd.DataFrame:
+    """Node wall times of the ``last`` suite runs side by side (newest run last)."""
+    history = pd.read_csv(results)
+    runs = history[["commit", "timestamp"]].drop_duplicates().tail(last)
+    history = history.merge(runs, on=["commit", "timestamp"])
+    history["run"] = history["commit"] + " " + history["timestamp"]
+    index = ["scale", "pipeline", "name"]
+    table = history.pivot_table(index=index, columns="run", values="wall_seconds")
+    order = pd.MultiIndex.from_frame(history[index].drop_duplicates())
+    return table.reindex(index=order, columns=list(runs["commit"] + " " + runs["timestamp"]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--handoff", choices=["disk", "memory"], default="disk")
+    parser.add_argument("--results", type=Path, default=RESULTS)
+    parser.add_argument("--compare", action="store_true", help="only compare the stored runs")
+    parser.add_argument("--last", type=int, default=2, help="number of runs to compare")
+    args = parser.parse_args()
+
+    if not args.compare:
+        run_suite(args.scales, args.handoff, args.results)
+    with pd.option_context("display.width", 200, "display.max_rows", None, "display.float_format", "{:.2f}".format):
+        print(compare(args.results, args.last))
+
+
+if __name__ == "__main__":
+    main()
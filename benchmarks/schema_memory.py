@@ -0,0 +1,68 @@
+"""Report memory and file size of a customer's datasets with and without the schema.
+
+"before" are the dtypes pandas infers without a schema (int64/float64/object),
+"after" is ``cast_to_schema``. Run it on the output of a pipeline run:
+
+    python benchmarks/schema_memory.py <BASE_DATA_PATH>/customer_1001
+"""
+import argparse
+import io
+import sys
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from coding_challenge.utils.schema import cast_to_schema, to_arrow, to_default_dtypes  # noqa: E402
+
+DATASETS = {
+    "02_intermediate/sales.parquet": "sales",
+    "02_intermediate/deliveries.parquet": "deliveries",
+    "02_intermediate/sales_deliveries.parquet": "sales_deliveries",
+    "02_intermediate/products.parquet": "products",
+    "02_intermediate/prices.parquet": "prices",
+    "02_intermediate/stores.parquet": "stores",
+    "03_primary/primary_dataset": "primary",
+    "03_primary/ml_dataset": "ml",
+    "03_primary/app_dataset": "app",
+    "03_primary/app_products.parquet": "products",
+    "03_primary/app_stores.parquet": "stores",
+    "03_primary/app_weekly_cube": "cube",
+    "03_primary/app_monthly_cube": "cube",
+}
+
+
+def parquet_size(df, typed: bool) -> int:
+    buffer = io.BytesIO()
+    if typed:
+        pq.write_table(to_arrow(df), buffer)
+    else:
+        df.to_parquet(buffer, index=False)
+    return buffer.tell()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("customer_path", type=Path)
+    args = parser.parse_args()
+
+    mb = 1024 ** 2
+    print(f"{'dataset':<40} {'rows':>10} {'RAM before':>11} {'RAM after':>10} {'file before':>12} {'file after':>11}")
+    for relative_path, schema in DATASETS.items():
+        path = args.customer_path / relative_path
+        if not path.exists():
+            continue
+
+        after = cast_to_schema(pq.read_table(path).to_pandas(date_as_object=False), schema)
+        before = to_default_dtypes(after)
+
+        print(
+            f"{relative_path:<40} {len(after):>10,} "
+            f"{before.memory_usage(deep=True).sum() / mb:>9.1f}MB {after.memory_usage(deep=True).sum() / mb:>8.1f}MB "
+            f"{parquet_size(before, typed=False) / mb:>10.2f}MB {parquet_size(after, typed=True) / mb:>9.2f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark ``SeriesStore`` lookups against filtering the app dataset in pandas.
+
+Builds an app-like dataset of stores x products x days for each requested size,
+writes its series index and times cold (memory-mapped) and cached lookups of random
+series next to the ``df.query`` the notebook used to do.
+
+    python benchmarks/series_lookup.py --rows 1000000 10000000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from coding_challenge.query import SeriesStore, build_series_index, write_series_index  # noqa: E402
+
+N_DAYS = 365
+
+
+def make_app_dataset(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_series = max(n_rows // N_DAYS, 1)
+    n_rows = n_series * N_DAYS
+    series = np.repeat(np.arange(n_series), N_DAYS)
+    days = np.tile(np.arange(N_DAYS), n_series)
+    return pd.DataFrame({
+        "id_store": (series // 1000 + 1).astype(np.int32),
+        "id_product": (series % 1000 + 1).astype(np.int32),
+        "target_date": np.datetime64("2024-01-01", "ns") + days * np.timedelta64(1, "D"),
+        "sales_qty": rng.random(n_rows, dtype=np.float32),
+        "return_qty": np.zeros(n_rows, dtype=np.float32),
+        "delivery_qty": rng.random(n_rows, dtype=np.float32),
+        "stockout": rng.random(n_rows) < 0.1,
+        "price": np.ones(n_rows, dtype=np.float32),
+    })
+
+
+def per_call_ms(func, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        func(*key)
+    return (time.perf_counter() - start) / len(keys) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    print(f"{'rows':>12} {'cold':>10} {'cached':>10} {'df.query':>10}")
+    for n_rows in args.rows:
+        df = make_app_dataset(n_rows)
+        with tempfile.TemporaryDirectory() as path:
+            write_series_index(build_series_index(df), path)
+            store = SeriesStore(path, cache_size=args.lookups)
+            keys = list(store.keys())
+            keys = [keys[i] for i in rng.integers(0, len(keys), args.lookups)]
+
+            cold = per_call_ms(store.series, keys)
+            cached = per_call_ms(store.series, keys)
+            query = per_call_ms(
+                lambda s, p: df.query("id_store == @s & id_product == @p"), keys[:20]
+            )
+            del store
+
+        print(f"{n_rows:>12,} {cold:>8.3f}ms {cached:>8.3f}ms {query:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
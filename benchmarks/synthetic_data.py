@@ -0,0 +1,222 @@
+"""Generate synthetic raw data in the cosmos (CSV) and galaxy (JSON) formats.
+
+Writes the layout described in ``data/README.md`` for one cosmos and one galaxy
+customer: one file per daily extraction in every ``00_*`` folder, each covering the
+``overlap`` days before the extraction (corrections of the past), cp1250 CSVs with
+decimal commas, a share of products delivered twice a day, and the mapping tables.
+
+    python benchmarks/synthetic_data.py /tmp/synthetic --stores 50 --products 500 --days 30 --overlap 7
+
+The customer folders can be run with ``filepath_prefix=/tmp/synthetic/customer_1001``.
+"""
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import orjson
+import pandas as pd
+
+PRODUCT_NAMES = ["Brötchen", "Laugenbrezel", "Roggenbrot", "Käsekuchen", "Mohnzopf", "Apfelstrudel"]
+PRODUCT_GROUPS = ["Brot", "Kleingebäck", "Kuchen", "Snacks"]
+CITIES = [("München", "Bayern", 80331), ("Köln", "Nordrhein-Westfalen", 50667), ("Görlitz", "Sachsen", 2826)]
+
+
+@dataclass
+class Scale:
+    stores: int = 20
+    products: int = 200
+    days: int = 14
+    overlap: int = 7
+    density: float = 0.5
+    twice_daily: float = 0.2
+    start: str = "2024-01-01"
+    seed: int = 0
+
+    @property
+    def extraction_dates(self) -> pd.DatetimeIndex:
+        return pd.date_range(pd.Timestamp(self.start) + pd.Timedelta(days=self.overlap), periods=self.days)
+
+
+def _window(extraction: pd.Timestamp, scale: Scale) -> pd.DatetimeIndex:
+    return pd.date_range(extraction - pd.Timedelta(days=scale.overlap), periods=scale.overlap)
+
+
+def _grid(dates: pd.DatetimeIndex, scale: Scale, rng: np.random.Generator):
+    """Store/product/date combinations with activity, ``density`` of the full grid."""
+    n = len(dates) * scale.stores * scale.products
+    keep = np.flatnonzero(rng.random(n) < scale.density)
+    date_index, rest = np.divmod(keep, scale.stores * scale.products)
+    store_index, product_index = np.divmod(rest, scale.products)
+    return dates[date_index], store_index + 1, product_index + 1
+
+
+def _numbers(customer: int, scale: Scale):
+    products = 1000 + np.arange(1, scale.products + 1)
+    stores = 100 + np.arange(1, scale.stores + 1)
+    return products, stores
+
+
+def _write_mappings(base: Path, customer: int, products: np.ndarray, stores: np.ndarray) -> None:
+    (base / "01_mappings").mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        "id_product": customer * 100_000 + np.arange(1, len(products) + 1),
+        "number_product": products,
+    }).to_parquet(base / "01_mappings" / "mapping_product.parquet", index=False)
+    pd.DataFrame({
+        "id_store": customer * 100_000 + 90_000 + np.arange(1, len(stores) + 1),
+        "number_store": stores,
+    }).to_parquet(base / "01_mappings" / "mapping_store.parquet", index=False)
+
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    df.to_csv(path, sep=";", decimal=",", index=False, encoding="cp1250", float_format="%.2f")
+
+
+def generate_cosmos(base: Path, customer: int, scale: Scale) -> None:
+    rng = np.random.default_rng(scale.seed)
+    products, stores = _numbers(customer, scale)
+    prices = np.round(rng.uniform(0.5, 5.0, scale.products), 2)
+    twice_daily = rng.random(scale.products) < scale.twice_daily
+
+    for folder in ["00_sales", "00_deliveries", "00_products", "00_stores"]:
+        (base / folder).mkdir(parents=True, exist_ok=True)
+
+    for extraction in scale.extraction_dates:
+        dates, store_index, product_index = _grid(_window(extraction, scale), scale, rng)
+        quantity = np.round(rng.gamma(2.0, 4.0, len(dates)), 2)
+        returns = rng.random(len(dates)) < 0.05
+        quantity[returns] = -np.round(rng.uniform(1, 3, returns.sum()), 2)
+        _write_csv(pd.DataFrame({
+            "Datum": dates.strftime("%d.%m.%Y"),
+            "Kunde": stores[store_index - 1],
+            "Artikel": products[product_index - 1],
+            "VK-Menge": quantity,
+            "VK-Betrag": quantity * prices[product_index - 1],
+        }), base / "00_sales" / f"Verkauf_{extraction:%Y_%m_%d}.csv")
+
+        dates, store_index, product_index = _grid(_window(extraction, scale), scale, rng)
+        second = twice_daily[product_index - 1]
+        deliveries = pd.DataFrame({
+            "Datum": np.concatenate([dates.strftime("%d.%m.%Y"), dates[second].strftime("%d.%m.%Y")]),
+            "ArtNr": np.concatenate([products[product_index - 1], products[product_index[second] - 1]]),
+            "Kunde_Nummer": np.concatenate([stores[store_index - 1], stores[store_index[second] - 1]]),
+            "LI-Menge": rng.integers(1, 20, len(dates) + second.sum()).astype(float),
+            "Lieferzeit": ["05:30"] * len(dates) + ["13:00"] * int(second.sum()),
+        })
+        _write_csv(deliveries, base / "00_deliveries" / f"Lieferung_{extraction:%Y_%m_%d}.csv")
+
+        snapshot = f"{extraction:%Y_%m_%d}_0600"
+        missing_price = rng.random(scale.products) < 0.02
+        _write_csv(pd.DataFrame({
+            "ArtNr": products,
+            "Artikelgruppe": np.array(PRODUCT_GROUPS)[np.arange(scale.products) % len(PRODUCT_GROUPS)],
+            "Preis": np.where(missing_price, np.nan, prices),
+            "Bezeichnung": [f"{PRODUCT_NAMES[i % len(PRODUCT_NAMES)]} {i}" for i in range(scale.products)],
+            "Mindestbestellmenge": np.where(
+                rng.random(scale.products) < 0.1, np.nan, rng.integers(1, 10, scale.products)
+            ),
+        }), base / "00_products" / f"Artikel_{snapshot}.csv")
+
+        city = [CITIES[i % len(CITIES)] for i in range(scale.stores)]
+        _write_csv(pd.DataFrame({
+            "Nummer": stores,
+            "Straße": [f"Hauptstraße {i}" for i in range(1, scale.stores + 1)],
+            "PLZ": [plz for _, _, plz in city],
+            "Ort": [name for name, _, _ in city],
+            "Land": "DE",
+            "Bundesland": [state for _, state, _ in city],
+        }), base / "00_stores" / f"Filialen_{snapshot}.csv")
+
+    _write_mappings(base, customer, products, stores)
+
+
+def generate_galaxy(base: Path, customer: int, scale: Scale) -> None:
+    rng = np.random.default_rng(scale.seed + 1)
+    products, stores = _numbers(customer, scale)
+    prices = np.round(rng.uniform(0.5, 5.0, scale.products), 2)
+    twice_daily = rng.random(scale.products) < scale.twice_daily
+
+    for folder in ["00_deliveries_sales", "00_products", "00_prices", "00_stores"]:
+        (base / folder).mkdir(parents=True, exist_ok=True)
+
+    for extraction in scale.extraction_dates:
+        dates, store_index, product_index = _grid(_window(extraction, scale), scale, rng)
+        sales = rng.integers(0, 30, len(dates))
+        delivered = rng.integers(0, 30, len(dates))
+        last_sale = rng.integers(12, 20, len(dates))
+
+        filialen = {}
+        for i, (date, store, product) in enumerate(zip(dates.strftime("%d/%m/%y"), store_index, product_index)):
+            history = filialen.setdefault((date, stores[store - 1]), [])
+            for delivery_number in (1, 2) if twice_daily[product - 1] else (1,):
+                history.append({
+                    "ArtikelNummer": str(products[product - 1]),
+                    "Kundenbestellmenge": "0",
+                    "LieferNummer": str(delivery_number),
+                    "Liefermenge": str(delivered[i] // delivery_number),
+                    "UhrzeitErsterVk": "07:15:00",
+                    "UhrzeitLetzterVk": f"{last_sale[i]}:45:00",
+                    "Verkaufsmenge": str(sales[i]),
+                })
+        stamp = f"{extraction:%Y_%m_%d}_06_00_00"
+        (base / "00_deliveries_sales" / f"Lieferungen_Verkaeufe_{stamp}.json").write_bytes(orjson.dumps({
+            "Filiale": [
+                {"Datum": date, "FilialNummer": str(store), "ArtikelHistory": history}
+                for (date, store), history in filialen.items()
+            ]
+        }))
+
+        (base / "00_products" / f"Artikel_{stamp}.json").write_bytes(orjson.dumps({"Artikel": [{
+            "ArtikelNummer": str(product),
+            "ArtikelName": f"{PRODUCT_NAMES[i % len(PRODUCT_NAMES)]} {i}",
+            "Artikelgruppe": PRODUCT_GROUPS[i % len(PRODUCT_GROUPS)],
+            "BestellMindestEinheit": str(1 + i % 6),
+            "ArtikelHaltbarTage": "1",
+            "ArtikelMasseinheit": "Stk",
+            "BestellMindestMasseinheit": "Stk",
+        } for i, product in enumerate(products)]}))
+        (base / "00_prices" / f"Preise_{stamp}.json").write_bytes(orjson.dumps({"Verkaufspreise": [
+            {"ArtikelNummer": str(product), "Artikelpreis": f"{price:.2f}"}
+            for product, price in zip(products, prices)
+        ]}))
+        (base / "00_stores" / f"Filialen_{stamp}.json").write_bytes(orjson.dumps({"Filialliste": [{
+            "FilialNummer": str(store),
+            "FilialName": f"Filiale {CITIES[i % len(CITIES)][0]} {i}",
+            "FilialAnschrift": (
+                f"Hauptstraße {i}\n{CITIES[i % len(CITIES)][2]:05d}\n"
+                f"{CITIES[i % len(CITIES)][0]}\nDE\nBY"
+            ),
+        } for i, store in enumerate(stores)]}))
+
+    _write_mappings(base, customer, products, stores)
+
+
+def generate(path: Path, scale: Scale, cosmos_customer: int = 1001, galaxy_customer: int = 1003) -> None:
+    generate_cosmos(Path(path) / f"customer_{cosmos_customer}", cosmos_customer, scale)
+    generate_galaxy(Path(path) / f"customer_{galaxy_customer}", galaxy_customer, scale)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--stores", type=int, default=Scale.stores)
+    parser.add_argument("--products", type=int, default=Scale.products)
+    parser.add_argument("--days", type=int, default=Scale.days, help="number of daily extractions")
+    parser.add_argument("--overlap", type=int, default=Scale.overlap, help="days covered by every extraction")
+    parser.add_argument("--density", type=float, default=Scale.density, help="share of store/product/days with data")
+    parser.add_argument("--seed", type=int, default=Scale.seed)
+    args = parser.parse_args()
+
+    generate(args.path, Scale(
+        stores=args.stores,
+        products=args.products,
+        days=args.days,
+        overlap=args.overlap,
+        density=args.density,
+        seed=args.seed,
+    ))
+
+
+if __name__ == "__main__":
+    main()
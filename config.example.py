@@ -3,6 +3,6 @@ BASE_DATA_PATH = "C:/path/to/your/data"
 CUSTOMER_IDS = ["1001", "1002", "1003"]
 
 OUTPUT_LAYER = "03_primary"
-APP_DATASET_FILE = "app_dataset.parquet"
-ML_DATASET_FILE = "ml_dataset.parquet"
-
+# hive-partitioned directories: customer=<id>/target_month=<YYYY-MM>/part-0.parquet
+APP_DATASET_DIR = "app_dataset"
+ML_DATASET_DIR = "ml_dataset"
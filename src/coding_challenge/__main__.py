@@ -1,12 +1,18 @@
 """coding challenge file for ensuring the package is executable
 as `coding-challenge` and `python -m coding_challenge`
+
+`python -m coding_challenge run-customers` runs all customer environments
+concurrently, see `coding_challenge.customer_runner`.
 """
 import importlib
+import sys
 from pathlib import Path
 
 from kedro.framework.cli.utils import KedroCliError, load_entry_points
 from kedro.framework.project import configure_project
 
+from coding_challenge import customer_runner
+
 
 def _find_run_command(package_name):
     try:
@@ -39,6 +45,8 @@ def _find_run_command_in_plugins(plugins):
 def main(*args, **kwargs):
     package_name = Path(__file__).parent.name
     configure_project(package_name)
+    if sys.argv[1:2] == [customer_runner.COMMAND]:
+        sys.exit(customer_runner.main(sys.argv[2:]))
     run = _find_run_command(package_name)
     run(*args, **kwargs)
 
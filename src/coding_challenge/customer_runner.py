@@ -0,0 +1,156 @@
+"""Runs the ERP pipeline of every customer environment concurrently.
+
+Every ``conf/<id>_customer`` environment declares the pipeline that processes it in
+its ``parameters.yml``::
+
+    erp_pipeline: etl_cosmos
+
+``run_customers`` runs one Kedro session per customer in a process pool, using the
+``CachingSequentialRunner``. Every worker bootstraps the project itself, so the
+pool works with the ``spawn`` start method of Windows and macOS as well as with
+``fork``. A failing customer is reported in the summary and does not stop the others::
+
+    python -m coding_challenge run-customers --workers 3
+"""
+import argparse
+import logging
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from kedro.framework.project import pipelines, settings
+from kedro.framework.session import KedroSession
+from kedro.framework.startup import bootstrap_project
+
+from coding_challenge.runner import CachingSequentialRunner
+
+logger = logging.getLogger(__name__)
+
+COMMAND = "run-customers"
+CUSTOMER_ENV_SUFFIX = "_customer"
+PIPELINE_PARAMETER = "erp_pipeline"
+
+
+@dataclass
+class CustomerRun:
+    env: str
+    pipeline: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def discover_customers(project_path: Path, conf_source: str = None) -> Dict[str, str]:
+    """Maps every customer environment to the pipeline named by its ``erp_pipeline``."""
+    conf_path = Path(conf_source) if conf_source else project_path / settings.CONF_SOURCE
+
+    customers = {}
+    for env_path in sorted(conf_path.glob(f"*{CUSTOMER_ENV_SUFFIX}")):
+        if not env_path.is_dir():
+            continue
+        config_loader = settings.CONFIG_LOADER_CLASS(
+            conf_source=str(conf_path), env=env_path.name, **settings.CONFIG_LOADER_ARGS
+        )
+        pipeline = config_loader["parameters"].get(PIPELINE_PARAMETER)
+        if pipeline is None:
+            raise ValueError(f"Environment '{env_path.name}' does not define '{PIPELINE_PARAMETER}'")
+        customers[env_path.name] = pipeline
+    return customers
+
+
+def _run_customer(project_path: Path, env: str, pipeline: str, conf_source: str = None) -> CustomerRun:
+    run = CustomerRun(env=env, pipeline=pipeline)
+    start = time.perf_counter()
+    try:
+        with KedroSession.create(
+            project_path=project_path, env=env, conf_source=conf_source
+        ) as session:
+            session.run(pipeline_name=pipeline, runner=CachingSequentialRunner())
+    except Exception:  # pylint: disable=broad-except
+        # reported in the summary
+        run.error = traceback.format_exc()
+    run.seconds = time.perf_counter() - start
+    return run
+
+
+def run_customers(
+    project_path: Path,
+    envs: Sequence[str] = None,
+    max_workers: int = None,
+    conf_source: str = None,
+    mp_context: multiprocessing.context.BaseContext = None,
+) -> List[CustomerRun]:
+    customers = discover_customers(project_path, conf_source)
+    if envs:
+        unknown = sorted(set(envs) - set(customers))
+        if unknown:
+            raise ValueError(f"Unknown customer environments {unknown}, expected some of {sorted(customers)}")
+        customers = {env: customers[env] for env in envs}
+
+    unknown = sorted(set(customers.values()) - set(pipelines))
+    if unknown:
+        raise ValueError(f"Unknown pipelines {unknown}, expected some of {sorted(pipelines)}")
+
+    runs = []
+    # spawned workers do not inherit the project configuration of the parent
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=bootstrap_project,
+        initargs=(project_path,),
+    ) as executor:
+        futures = {
+            executor.submit(_run_customer, project_path, env, pipeline, conf_source): (env, pipeline)
+            for env, pipeline in customers.items()
+        }
+        for future in as_completed(futures):
+            env, pipeline = futures[future]
+            try:
+                run = future.result()
+            except Exception:  # pylint: disable=broad-except
+                # e.g. a worker process died
+                run = CustomerRun(env=env, pipeline=pipeline, error=traceback.format_exc())
+            if run.succeeded:
+                logger.info("%s (%s) finished in %.1fs", run.env, run.pipeline, run.seconds)
+            else:
+                logger.error("%s (%s) failed:\n%s", run.env, run.pipeline, run.error)
+            runs.append(run)
+
+    return sorted(runs, key=lambda run: run.env)
+
+
+def format_summary(runs: List[CustomerRun], wall_seconds: float) -> str:
+    lines = [f"{'environment':<20} {'pipeline':<12} {'status':<7} {'seconds':>8}"]
+    for run in runs:
+        status = "ok" if run.succeeded else "FAILED"
+        lines.append(f"{run.env:<20} {run.pipeline:<12} {status:<7} {run.seconds:>8.1f}")
+    lines.append(
+        f"{len(runs)} customers in {wall_seconds:.1f}s wall time "
+        f"({sum(run.seconds for run in runs):.1f}s summed), "
+        f"{sum(not run.succeeded for run in runs)} failed"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog=f"coding-challenge {COMMAND}", description=__doc__.splitlines()[0])
+    parser.add_argument("--env", dest="envs", action="append", help="only run these customer environments")
+    parser.add_argument("--workers", type=int, default=None, help="size of the process pool (default: CPU count)")
+    parser.add_argument("--conf-source", default=None, help="configuration directory (default: conf)")
+    args = parser.parse_args(argv)
+
+    project_path = Path.cwd()
+    bootstrap_project(project_path)
+
+    start = time.perf_counter()
+    runs = run_customers(project_path, args.envs, args.workers, args.conf_source)
+    print(format_summary(runs, time.perf_counter() - start))
+
+    return 0 if all(run.succeeded for run in runs) else 1
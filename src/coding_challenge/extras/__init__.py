@@ -0,0 +1 @@
+"""Project-specific Kedro extensions."""
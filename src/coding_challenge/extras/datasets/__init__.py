@@ -0,0 +1,23 @@
+"""Custom datasets used by the customer catalogs."""
+
+from .arrow_csv_dataset import ArrowCSVDataset
+from .checkpointed_dataset import CheckpointedDataset
+from .fingerprinted_partitioned_dataset import FingerprintedPartitionedDataset
+from .hive_parquet_dataset import HiveParquetDataset
+from .optional_dataset import OptionalDataset
+from .partition_manifest_dataset import PartitionManifestDataset
+from .series_index_dataset import SeriesIndexDataset
+from .typed_parquet_dataset import TypedParquetDataset
+from .upsert_parquet_dataset import UpsertParquetDataset
+
+__all__ = [
+    "ArrowCSVDataset",
+    "CheckpointedDataset",
+    "FingerprintedPartitionedDataset",
+    "HiveParquetDataset",
+    "OptionalDataset",
+    "PartitionManifestDataset",
+    "SeriesIndexDataset",
+    "TypedParquetDataset",
+    "UpsertParquetDataset",
+]
@@ -0,0 +1,129 @@
+"""``ArrowCSVDataset`` loads delimited ERP extracts with the multithreaded pyarrow
+CSV reader and returns a pandas DataFrame with typed columns.
+
+Example catalog entry for the cosmos sales files::
+
+    raw_sales:
+      type: PartitionedDataset
+      path: ${filepath_prefix}/00_sales
+      dataset:
+        type: coding_challenge.extras.datasets.ArrowCSVDataset
+        load_args:
+          sep: ';'
+          decimal: ","
+          encoding: "cp1250"
+          parse_dates: ["Datum"]
+          date_format: "%d.%m.%Y"
+          fill_null: {"VK-Menge": 0}
+      filename_suffix: ".csv"
+
+``usecols`` restricts the columns that are converted (e.g. only the date column for a
+manifest). Every ``fill_null`` column has to be in the file unless it is left out by
+``usecols``, a missing one raises a ``DatasetError``.
+"""
+from copy import deepcopy
+from pathlib import PurePosixPath
+from typing import Any, Dict
+
+import fsspec
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv
+from kedro.io.core import (
+    AbstractDataset,
+    DatasetError,
+    get_filepath_str,
+    get_protocol_and_path,
+)
+
+
+class ArrowCSVDataset(AbstractDataset[pd.DataFrame, pd.DataFrame]):
+    DEFAULT_LOAD_ARGS: Dict[str, Any] = {
+        "sep": ",",
+        "decimal": ".",
+        "encoding": "utf8",
+        "parse_dates": [],
+        "date_format": "%d.%m.%Y",
+        "dtype": {},
+        "fill_null": {},
+        "usecols": None,
+        "block_size": None,
+        "use_threads": True,
+    }
+
+    def __init__(
+        self,
+        filepath: str,
+        load_args: Dict[str, Any] = None,
+        credentials: Dict[str, Any] = None,
+        fs_args: Dict[str, Any] = None,
+    ) -> None:
+        protocol, path = get_protocol_and_path(filepath)
+        self._protocol = protocol
+        self._filepath = PurePosixPath(path)
+        self._fs = fsspec.filesystem(
+            self._protocol, **deepcopy(credentials or {}), **deepcopy(fs_args or {})
+        )
+
+        self._load_args = deepcopy(self.DEFAULT_LOAD_ARGS)
+        if load_args is not None:
+            self._load_args.update(load_args)
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "filepath": self._filepath,
+            "protocol": self._protocol,
+            "load_args": self._load_args,
+        }
+
+    def _load(self) -> pd.DataFrame:
+        args = self._load_args
+
+        column_types = {
+            column: pa.type_for_alias(type_name) for column, type_name in args["dtype"].items()
+        }
+        column_types.update({column: pa.timestamp("ns") for column in args["parse_dates"]})
+
+        read_options = csv.ReadOptions(
+            encoding=args["encoding"],
+            use_threads=args["use_threads"],
+            **({"block_size": args["block_size"]} if args["block_size"] else {}),
+        )
+        parse_options = csv.ParseOptions(delimiter=args["sep"])
+        convert_options = csv.ConvertOptions(
+            column_types=column_types,
+            decimal_point=args["decimal"],
+            timestamp_parsers=[args["date_format"]],
+            **({"include_columns": list(args["usecols"])} if args["usecols"] else {}),
+        )
+
+        load_path = get_filepath_str(self._filepath, self._protocol)
+        with self._fs.open(load_path, mode="rb") as fs_file:
+            table = csv.read_csv(
+                fs_file,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options,
+            )
+
+        fill_null = {
+            column: value for column, value in args["fill_null"].items()
+            if not args["usecols"] or column in args["usecols"]
+        }
+        missing = [column for column in fill_null if column not in table.column_names]
+        if missing:
+            raise DatasetError(f"fill_null columns {missing} are not in '{load_path}'")
+
+        for column, value in fill_null.items():
+            index = table.schema.get_field_index(column)
+            table = table.set_column(index, column, pc.fill_null(table[column], value))
+
+        return table.to_pandas()
+
+    def _save(self, data: pd.DataFrame) -> None:
+        raise DatasetError(f"{self.__class__.__name__} is a read-only dataset")
+
+    def _exists(self) -> bool:
+        load_path = get_filepath_str(self._filepath, self._protocol)
+        return self._fs.exists(load_path)
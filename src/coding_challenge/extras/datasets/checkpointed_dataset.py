@@ -0,0 +1,132 @@
+"""``CheckpointedDataset`` hands data between nodes in memory and writes the wrapped
+dataset as a checkpoint in the background.
+
+``handoff`` selects the run mode:
+
+- ``disk`` (default): a transparent wrapper, every save is written before the node
+  finishes and loads read it back, so a debug run materializes everything.
+- ``memory``: saves keep the data in memory for the downstream nodes and ``checkpoint``
+  decides what happens on disk: ``async`` queues the write on a background thread,
+  ``skip`` never writes it.
+
+Checkpoints are written by one thread in the order they were saved, so e.g. a
+watermark is never on disk before the state it describes. ``wait_for_checkpoints``
+(called by ``coding_challenge.hooks.CheckpointHooks`` at the end of a run) blocks until
+all of them are written and raises the first failed one.
+
+The catalogs take the run mode from the ``handoff`` global, e.g.
+``handoff=memory kedro run --env 1001_customer --pipeline etl_cosmos``::
+
+    intermediate_sales:
+      type: coding_challenge.extras.datasets.CheckpointedDataset
+      handoff: ${handoff|disk}
+      checkpoint: async
+      dataset:
+        type: coding_challenge.extras.datasets.TypedParquetDataset
+        filepath: ${filepath_prefix}/02_intermediate/sales.parquet
+        schema: sales
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+import pyarrow as pa
+from kedro.io.core import AbstractDataset, DatasetError, parse_dataset_definition
+
+from .typed_parquet_dataset import TypedParquetDataset
+
+logger = logging.getLogger(__name__)
+
+HANDOFF_MODES = ("disk", "memory")
+CHECKPOINT_MODES = ("async", "skip")
+
+_lock = threading.Lock()
+_writer = None
+_pending: List[Future] = []
+
+
+def _submit_checkpoint(dataset: AbstractDataset, data: Any) -> None:
+    global _writer  # pylint: disable=global-statement
+    with _lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        _pending.append(_writer.submit(dataset.save, data))
+
+
+def wait_for_checkpoints() -> None:
+    """Blocks until all queued checkpoints are written, raises the first failure."""
+    with _lock:
+        pending = list(_pending)
+        _pending.clear()
+
+    errors = []
+    for future in pending:
+        error = future.exception()
+        if error is not None:
+            logger.error("Writing a checkpoint failed: %s", error)
+            errors.append(error)
+
+    if errors:
+        raise DatasetError(f"{len(errors)} checkpoint(s) could not be written") from errors[0]
+
+
+class CheckpointedDataset(AbstractDataset):
+    def __init__(
+        self,
+        dataset: Union[str, Dict[str, Any]],
+        handoff: str = "disk",
+        checkpoint: str = "async",
+    ):
+        if handoff not in HANDOFF_MODES:
+            raise DatasetError(f"Unknown handoff '{handoff}', expected one of {HANDOFF_MODES}")
+        if checkpoint not in CHECKPOINT_MODES:
+            raise DatasetError(f"Unknown checkpoint '{checkpoint}', expected one of {CHECKPOINT_MODES}")
+
+        dataset = dataset if isinstance(dataset, dict) else {"type": dataset}
+        dataset_type, dataset_config = parse_dataset_definition(deepcopy(dataset))
+        self._dataset = dataset_type(**dataset_config)
+        self._handoff = handoff
+        self._checkpoint = checkpoint
+
+        self._data = None
+        self._in_memory = False
+
+    def _typed(self, data: Any) -> bool:
+        return isinstance(self._dataset, TypedParquetDataset) and isinstance(data, (pd.DataFrame, pa.Table))
+
+    def _load(self) -> Any:
+        if not self._in_memory:
+            return self._dataset.load()
+        return self._dataset.from_arrow(self._data) if self._typed(self._data) else self._data
+
+    def _save(self, data: Any) -> None:
+        if self._handoff == "disk":
+            self._dataset.save(data)
+            return
+
+        # typed data is kept as the table the dataset writes, so loads get the dtypes of a
+        # load from disk and the writer thread an immutable table downstream nodes cannot change
+        data = self._dataset.to_arrow(data) if self._typed(data) else data
+        self._data = data
+        self._in_memory = True
+        if self._checkpoint == "async":
+            _submit_checkpoint(self._dataset, data if isinstance(data, pa.Table) else deepcopy(data))
+
+    def _exists(self) -> bool:
+        return self._in_memory or self._dataset.exists()
+
+    def _release(self) -> None:
+        # a queued checkpoint keeps its own reference until it is written
+        self._data = None
+        self._in_memory = False
+        self._dataset.release()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "dataset": str(self._dataset),
+            "handoff": self._handoff,
+            "checkpoint": self._checkpoint,
+        }
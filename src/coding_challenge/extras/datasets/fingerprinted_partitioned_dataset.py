@@ -0,0 +1,25 @@
+"""``FingerprintedPartitionedDataset`` is a ``PartitionedDataset`` whose partitions can be
+fingerprinted without loading them, so ``coding_challenge.runner.CachingSequentialRunner``
+can tell whether the input of a cached node changed.
+
+Example catalog entry::
+
+    landed_products:
+      type: coding_challenge.extras.datasets.FingerprintedPartitionedDataset
+      path: ${filepath_prefix}/00_landing/products
+      dataset: kedro_datasets.pandas.ParquetDataset
+      filename_suffix: ".parquet"
+"""
+import hashlib
+
+from kedro.io import PartitionedDataset
+
+
+class FingerprintedPartitionedDataset(PartitionedDataset):
+    def fingerprint(self) -> str:
+        """Hash of the path, size and modification time of every partition."""
+        digest = hashlib.sha256()
+        for path in sorted(self._list_partitions()):
+            info = self._filesystem.info(path)
+            digest.update(f"{path}\0{info['size']}\0{info.get('mtime', info.get('LastModified'))}\0".encode())
+        return digest.hexdigest()
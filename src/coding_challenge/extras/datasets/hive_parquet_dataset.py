@@ -0,0 +1,157 @@
+"""``HiveParquetDataset`` writes a typed table (see ``TypedParquetDataset``) as a
+hive-partitioned Parquet directory, one folder per customer and target month::
+
+    app_dataset/customer=1001/target_month=2024-01/part-0.parquet
+
+Every file is sorted by ``sort_by`` (store, product, date) and split into row groups of
+``row_group_size`` rows with min/max statistics and a page index, so readers that filter
+on customer, month, store or product only open the matching folders and row groups::
+
+    pd.read_parquet(
+        ".../03_primary/app_dataset",
+        filters=[("id_store", "=", 100190001), ("id_product", "=", 10010001)],
+    )
+
+A saved table replaces the customer's data. As in ``UpsertParquetDataset`` months whose
+rows did not change are not rewritten and files are replaced atomically; months that are
+not in the table are removed.
+
+A ``pyarrow.dataset.Scanner`` (e.g. the dense ML panel of ``utils.grid``) is written
+batch by batch: every batch is sorted and appended to a temporary file of its months, so
+the batches have to arrive in ``sort_by`` order for the files to be sorted as a whole.
+The temporary files of unchanged months are discarded at the end.
+
+Example catalog entry::
+
+    app_dataset:
+      type: coding_challenge.extras.datasets.HiveParquetDataset
+      filepath: ${filepath_prefix}/03_primary/app_dataset
+      schema: app
+      customer: 1001
+"""
+import logging
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from kedro.io.core import get_filepath_str
+
+from coding_challenge.utils.schema import check_columns
+
+from .upsert_parquet_dataset import UpsertParquetDataset, row_hashes
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ["customer", "target_month"]
+
+
+class HiveParquetDataset(UpsertParquetDataset):
+    DEFAULT_SAVE_ARGS: Dict[str, Any] = {
+        "compression": "snappy",
+        "row_group_size": 64 * 1024,
+        "write_statistics": True,
+        "write_page_index": True,
+    }
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        filepath: str,
+        schema: str,
+        customer: int,
+        date_column: str = "target_date",
+        sort_by: List[str] = None,
+        return_type: str = "pandas",
+        load_args: Dict[str, Any] = None,
+        save_args: Dict[str, Any] = None,
+        credentials: Dict[str, Any] = None,
+        fs_args: Dict[str, Any] = None,
+    ) -> None:
+        super().__init__(
+            filepath=filepath,
+            schema=schema,
+            date_column=date_column,
+            sort_by=sort_by or ["id_store", "id_product", date_column],
+            mode="replace",
+            return_type=return_type,
+            load_args=load_args,
+            save_args=save_args,
+            credentials=credentials,
+            fs_args=fs_args,
+        )
+        self._customer = int(customer)
+
+    def _describe(self) -> Dict[str, Any]:
+        return {**super()._describe(), "customer": self._customer}
+
+    def _root(self) -> str:
+        root = get_filepath_str(self._filepath, self._protocol)
+        return str(PurePosixPath(root) / f"customer={self._customer}")
+
+    def _partition_labels(self, table: pa.Table) -> pa.ChunkedArray:
+        return pc.strftime(table[self._date_column], format="%Y-%m")
+
+    def _partition_path(self, label: str) -> str:
+        return f"{self._root()}/target_month={label}/part-0.parquet"
+
+    def _load(self) -> Union[pd.DataFrame, pa.Table]:
+        load_args = {"partitioning": "hive", **self._load_args}
+        table = pq.read_table(self._root(), filesystem=self._fs, **load_args)
+        table = table.drop_columns([col for col in PARTITION_COLUMNS if col in table.column_names])
+        return self.from_arrow(table)
+
+    def _save(self, data: Union[pd.DataFrame, pa.Table, ds.Scanner]) -> None:
+        self._fs.makedirs(self._root(), exist_ok=True)
+        stored = self._read_fingerprints()
+
+        if isinstance(data, ds.Scanner):
+            fingerprints = self._save_batches(data, stored)
+        else:
+            fingerprints = self._write_changed(self.to_arrow(data), stored)
+
+        for month_path in self._fs.glob(f"{self._root()}/target_month=*"):
+            if month_path.rsplit("=", 1)[-1] not in fingerprints:
+                self._fs.rm(month_path, recursive=True)
+        self._write_fingerprints(fingerprints)
+
+    def _save_batches(self, scanner: ds.Scanner, stored: Dict[str, str]) -> Dict[str, str]:
+        check_columns(scanner.projected_schema.names, self._schema)
+        writer_args = {k: v for k, v in self._save_args.items() if k != "row_group_size"}
+        row_group_size = self._save_args.get("row_group_size")
+
+        # one open writer per month, each batch adds row groups to the months it covers
+        files, writers, digests = {}, {}, {}
+        try:
+            for batch in scanner.to_reader():
+                for month, part in self._partitions(pa.Table.from_batches([batch])):
+                    if month not in writers:
+                        path = self._partition_path(month)
+                        self._fs.makedirs(str(PurePosixPath(path).parent), exist_ok=True)
+                        files[month] = self._fs.open(self._temporary_path(path), mode="wb")
+                        writers[month] = pq.ParquetWriter(files[month], part.schema, **writer_args)
+                        digests[month] = self._digest(part.schema)
+                    writers[month].write_table(part, row_group_size=row_group_size)
+                    digests[month].update(row_hashes(part))
+        finally:
+            for month, writer in writers.items():
+                writer.close()
+                files[month].close()
+
+        fingerprints, written = {}, 0
+        for month, digest in digests.items():
+            fingerprints[month] = digest.hexdigest()
+            path = self._partition_path(month)
+            if stored.get(month) == fingerprints[month] and self._fs.exists(path):
+                self._fs.rm(self._temporary_path(path))
+            else:
+                self._commit(self._temporary_path(path), path)
+                written += 1
+
+        logger.info("Wrote %d of %d partitions of %s", written, len(fingerprints), self._root())
+        return fingerprints
+
+    def _exists(self) -> bool:
+        return self._fs.exists(self._root())
@@ -0,0 +1,28 @@
+"""``OptionalDataset`` wraps another dataset and loads ``None`` as long as the
+underlying data does not exist yet, e.g. state carried over from a previous run.
+"""
+from copy import deepcopy
+from typing import Any, Dict, Union
+
+from kedro.io.core import AbstractDataset, parse_dataset_definition
+
+
+class OptionalDataset(AbstractDataset):
+    def __init__(self, dataset: Union[str, Dict[str, Any]]):
+        dataset = dataset if isinstance(dataset, dict) else {"type": dataset}
+        dataset_type, dataset_config = parse_dataset_definition(deepcopy(dataset))
+        self._dataset = dataset_type(**dataset_config)
+
+    def _load(self) -> Any:
+        if not self._dataset.exists():
+            return None
+        return self._dataset.load()
+
+    def _save(self, data: Any) -> None:
+        self._dataset.save(data)
+
+    def _exists(self) -> bool:
+        return self._dataset.exists()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"dataset": str(self._dataset)}
@@ -0,0 +1,215 @@
+"""``PartitionManifestDataset`` describes the files of a partitioned folder: extraction
+timestamp (parsed from the file name), size, content hash and the min/max of the
+date column of every file. The manifest is persisted and only files that are new
+or changed since the last load are hashed and read again.
+
+The date range is read from the raw file (only its ``date_column``, or the whole file for
+a ``date_extractor``) or, with ``landed_path``, from the Parquet statistics of the landed
+copy (see ``coding_challenge.utils.landing``), so the raw file is not parsed twice. A landed
+copy is only used if the landing record ``<landed_path>/_sources.json`` lists the raw
+file's current content hash; until then (e.g. new files before the landing nodes ran)
+the range is left empty, or read from the raw file if that is configured as well.
+
+Example catalog entry for the cosmos sales files::
+
+    sales_manifest:
+      type: coding_challenge.extras.datasets.PartitionManifestDataset
+      path: ${filepath_prefix}/00_sales
+      dataset: <same definition as raw_sales>
+      filename_suffix: ".csv"
+      manifest: ${filepath_prefix}/02_intermediate/sales_manifest.parquet
+      landed_path: ${filepath_prefix}/00_landing/sales
+"""
+import hashlib
+import json
+import re
+from copy import deepcopy
+from pathlib import PurePosixPath
+from typing import Any, Dict, Union
+
+import pandas as pd
+import pyarrow.parquet as pq
+from kedro.io import PartitionedDataset
+from kedro.io.core import DatasetError, parse_dataset_definition
+from kedro.utils import load_obj
+
+MANIFEST_COLUMNS = [
+    "partition_id",
+    "extraction_date",
+    "size",
+    "modified",
+    "content_hash",
+    "min_date",
+    "max_date",
+    "landed_hash",
+]
+
+# landing record written next to the landed copies: partition id -> content hash
+LANDED_SOURCES = "_sources.json"
+
+EXTRACTION_PATTERN = (
+    r"(?P<year>\d{4})_(?P<month>\d{2})_(?P<day>\d{2})"
+    r"(?:_(?P<hour>\d{2})_(?P<minute>\d{2})_(?P<second>\d{2}))?"
+)
+
+
+class PartitionManifestDataset(PartitionedDataset):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: str,
+        dataset: Union[str, Dict[str, Any]],
+        manifest: Union[str, Dict[str, Any]],
+        date_column: str = None,
+        date_extractor: str = None,
+        landed_path: str = None,
+        landed_date_column: str = "target_date",
+        extraction_pattern: str = EXTRACTION_PATTERN,
+        filepath_arg: str = "filepath",
+        filename_suffix: str = "",
+        credentials: Dict[str, Any] = None,
+        load_args: Dict[str, Any] = None,
+        fs_args: Dict[str, Any] = None,
+    ):
+        super().__init__(
+            path=path,
+            dataset=dataset,
+            filepath_arg=filepath_arg,
+            filename_suffix=filename_suffix,
+            credentials=credentials,
+            load_args=load_args,
+            fs_args=fs_args,
+        )
+
+        if date_column is not None and date_extractor is not None:
+            raise DatasetError("Specify only one of 'date_column' and 'date_extractor'")
+        if date_column is None and date_extractor is None and landed_path is None:
+            raise DatasetError("Specify one of 'date_column', 'date_extractor' and 'landed_path'")
+
+        manifest = deepcopy(manifest) if isinstance(manifest, dict) else {"filepath": manifest}
+        manifest.setdefault("type", "kedro_datasets.pandas.ParquetDataset")
+        manifest_type, manifest_config = parse_dataset_definition(manifest)
+        self._manifest_dataset = manifest_type(**manifest_config)
+
+        self._date_column = date_column
+        self._date_extractor = load_obj(date_extractor) if date_extractor else None
+        self._extraction_pattern = re.compile(extraction_pattern)
+        self._landed_path = landed_path.rstrip("/") if landed_path else None
+        self._landed_date_column = landed_date_column
+
+    def _extraction_date(self, partition_id: str) -> pd.Timestamp:
+        match = self._extraction_pattern.search(PurePosixPath(partition_id).name)
+        if match is None:
+            raise DatasetError(f"No extraction timestamp in partition '{partition_id}'")
+        parts = {name: int(value) for name, value in match.groupdict().items() if value}
+        return pd.Timestamp(**parts)
+
+    def _content_hash(self, path: str) -> str:
+        digest = hashlib.md5()
+        with self._filesystem.open(path, mode="rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _date_range(self, path: str):
+        if self._date_column is None and self._date_extractor is None:
+            return pd.NaT, pd.NaT
+
+        kwargs = deepcopy(self._dataset_config)
+        kwargs[self._filepath_arg] = self._join_protocol(path)
+        if self._date_column is not None:
+            # only the date column is converted (usecols of ArrowCSVDataset and pandas CSV)
+            kwargs["load_args"] = {**kwargs.get("load_args", {}), "usecols": [self._date_column]}
+        data = self._dataset_type(**kwargs).load()
+
+        if self._date_extractor is not None:
+            dates = pd.Series(self._date_extractor(data))
+        else:
+            dates = pd.to_datetime(data[self._date_column])
+
+        return dates.min(), dates.max()
+
+    def _landed_sources(self) -> Dict[str, str]:
+        path = f"{self._landed_path}/{LANDED_SOURCES}" if self._landed_path else None
+        if path is None or not self._filesystem.exists(path):
+            return {}
+        with self._filesystem.open(path, mode="r") as f:
+            return json.load(f)
+
+    def _landed_date_range(self, partition_id: str):
+        """Min/max of the date column from the row group statistics of the landed copy."""
+        with self._filesystem.open(f"{self._landed_path}/{partition_id}.parquet", mode="rb") as f:
+            parquet = pq.ParquetFile(f)
+            column = parquet.schema_arrow.get_field_index(self._landed_date_column)
+            statistics = [
+                parquet.metadata.row_group(i).column(column).statistics
+                for i in range(parquet.metadata.num_row_groups)
+            ]
+            if all(stats is not None and stats.has_min_max for stats in statistics):
+                bounds = [(stats.min, stats.max) for stats in statistics]
+                return (
+                    pd.Timestamp(min(low for low, _ in bounds)) if bounds else pd.NaT,
+                    pd.Timestamp(max(high for _, high in bounds)) if bounds else pd.NaT,
+                )
+            dates = pd.to_datetime(parquet.read(columns=[self._landed_date_column]).column(0).to_pandas())
+            return dates.min(), dates.max()
+
+    def _describe_partition(
+        self, path: str, partition_id: str, size: int, modified: str, sources: Dict[str, str]
+    ) -> dict:
+        entry = {
+            "partition_id": partition_id,
+            "extraction_date": self._extraction_date(partition_id),
+            "size": size,
+            "modified": modified,
+            "content_hash": self._content_hash(path),
+            "landed_hash": None,
+        }
+        if sources.get(partition_id) == entry["content_hash"]:
+            return self._with_landed_range(entry)
+        entry["min_date"], entry["max_date"] = self._date_range(path)
+        return entry
+
+    def _with_landed_range(self, entry: dict) -> dict:
+        min_date, max_date = self._landed_date_range(entry["partition_id"])
+        return {**entry, "min_date": min_date, "max_date": max_date, "landed_hash": entry["content_hash"]}
+
+    def _load(self) -> pd.DataFrame:
+        previous = {}
+        if self._manifest_dataset.exists():
+            previous = self._manifest_dataset.load().set_index("partition_id", drop=False)
+            previous = previous.to_dict(orient="index")
+
+        entries = []
+        changed = False
+        sources = self._landed_sources()
+
+        for path in self._list_partitions():
+            partition_id = self._path_to_partition(path)
+            info = self._filesystem.info(path)
+            size = int(info["size"])
+            modified = str(info.get("mtime", info.get("LastModified", "")))
+
+            entry = previous.get(partition_id)
+            if entry is None or entry["size"] != size or entry["modified"] != modified:
+                entry = self._describe_partition(path, partition_id, size, modified, sources)
+                changed = True
+            elif entry.get("landed_hash") != entry["content_hash"] == sources.get(partition_id):
+                # landed since the file was described
+                entry = self._with_landed_range(entry)
+                changed = True
+            entries.append(entry)
+
+        if not entries:
+            raise DatasetError(f"No partitions found in '{self._path}'")
+
+        manifest = pd.DataFrame(entries, columns=MANIFEST_COLUMNS)
+        if changed or len(entries) != len(previous):
+            self._manifest_dataset.save(manifest)
+
+        return manifest
+
+    def _save(self, data: Any) -> None:
+        raise DatasetError(f"{self.__class__.__name__} is a read-only dataset")
+
+    def _describe(self) -> Dict[str, Any]:
+        return {**super()._describe(), "manifest": str(self._manifest_dataset)}
@@ -0,0 +1,43 @@
+"""``SeriesIndexDataset`` persists the output of
+``coding_challenge.query.build_series_index`` as a versioned directory of ``.npy``
+columns and loads the current version as a memory-mapped ``coding_challenge.query.SeriesStore``.
+
+Memory mapping needs local files, so only local paths are supported.
+
+Example catalog entry::
+
+    app_series:
+      type: coding_challenge.extras.datasets.SeriesIndexDataset
+      filepath: ${filepath_prefix}/03_primary/app_series
+"""
+import os
+from typing import Any, Dict
+
+import numpy as np
+from kedro.io.core import AbstractDataset, DatasetError, get_protocol_and_path
+
+from coding_challenge.query import SeriesStore, write_series_index
+from coding_challenge.query.series_store import CURRENT_FILE
+
+
+class SeriesIndexDataset(AbstractDataset[Dict[str, np.ndarray], SeriesStore]):
+    def __init__(self, filepath: str, cache_size: int = 256) -> None:
+        protocol, path = get_protocol_and_path(filepath)
+        if protocol != "file":
+            raise DatasetError(
+                f"{self.__class__.__name__} memory-maps its files and needs a local path, got '{filepath}'"
+            )
+        self._filepath = path
+        self._cache_size = cache_size
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"filepath": self._filepath, "cache_size": self._cache_size}
+
+    def _load(self) -> SeriesStore:
+        return SeriesStore(self._filepath, cache_size=self._cache_size)
+
+    def _save(self, data: Dict[str, np.ndarray]) -> None:
+        write_series_index(data, self._filepath)
+
+    def _exists(self) -> bool:
+        return os.path.exists(os.path.join(self._filepath, CURRENT_FILE))
@@ -0,0 +1,139 @@
+"""``TypedParquetDataset`` loads/saves a pandas DataFrame as Parquet and casts it to
+one of the declared table schemas in ``coding_challenge.utils.schema`` on the way
+in and out: int32 ids and numbers, date32 dates, float32 quantities and
+dictionary-encoded strings.
+
+Example catalog entry::
+
+    primary_dataset:
+      type: coding_challenge.extras.datasets.TypedParquetDataset
+      filepath: ${filepath_prefix}/03_primary/complete_dataset.parquet
+      schema: primary
+
+With ``return_type: arrow`` the data is loaded as a ``pyarrow.Table`` as written, without
+a conversion to pandas; combine it with ``load_args: {columns: [...]}`` to read only the
+columns a node needs. Both DataFrames and ``pyarrow.Table`` objects can be saved, the
+latter are written from their buffers as they are. A ``pyarrow.dataset.Scanner`` is
+written batch by batch, so results larger than memory (e.g. the record batch reader of a
+DuckDB query, wrapped with ``Scanner.from_batches``) can be saved as well. Kedro would
+save the batches of a bare ``RecordBatchReader`` one at a time, like a generator node.
+
+Files are written to a hidden temporary file next to the target and renamed when complete,
+so readers see either the previous or the new file, never a partially written one.
+"""
+from copy import deepcopy
+from pathlib import PurePosixPath
+from typing import Any, Dict, Union
+
+import fsspec
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from kedro.io.core import (
+    AbstractDataset,
+    get_filepath_str,
+    get_protocol_and_path,
+)
+
+from coding_challenge.utils.schema import TABLES, cast_to_schema, check_columns, to_arrow
+
+RETURN_TYPES = ("pandas", "arrow")
+
+
+class TypedParquetDataset(
+    AbstractDataset[Union[pd.DataFrame, pa.Table], Union[pd.DataFrame, pa.Table]]
+):
+    DEFAULT_LOAD_ARGS: Dict[str, Any] = {}
+    DEFAULT_SAVE_ARGS: Dict[str, Any] = {"compression": "snappy"}
+
+    def __init__(
+        self,
+        filepath: str,
+        schema: str,
+        return_type: str = "pandas",
+        load_args: Dict[str, Any] = None,
+        save_args: Dict[str, Any] = None,
+        credentials: Dict[str, Any] = None,
+        fs_args: Dict[str, Any] = None,
+    ) -> None:
+        if schema not in TABLES:
+            raise ValueError(f"Unknown schema '{schema}', expected one of {sorted(TABLES)}")
+        if return_type not in RETURN_TYPES:
+            raise ValueError(f"Unknown return_type '{return_type}', expected one of {RETURN_TYPES}")
+
+        protocol, path = get_protocol_and_path(filepath)
+        self._protocol = protocol
+        self._filepath = PurePosixPath(path)
+        self._schema = schema
+        self._return_type = return_type
+        self._fs = fsspec.filesystem(
+            self._protocol, **deepcopy(credentials or {}), **deepcopy(fs_args or {})
+        )
+
+        self._load_args = {**self.DEFAULT_LOAD_ARGS, **(load_args or {})}
+        self._save_args = {**self.DEFAULT_SAVE_ARGS, **(save_args or {})}
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            "filepath": self._filepath,
+            "protocol": self._protocol,
+            "schema": self._schema,
+            "return_type": self._return_type,
+            "load_args": self._load_args,
+            "save_args": self._save_args,
+        }
+
+    def from_arrow(self, table: pa.Table) -> Union[pd.DataFrame, pa.Table]:
+        """The loaded data of ``table``, cast to the schema."""
+        if self._return_type == "arrow":
+            return table
+        df = table.to_pandas(date_as_object=False)
+        return cast_to_schema(df, self._schema, validate="columns" not in self._load_args)
+
+    def to_arrow(self, data: Union[pd.DataFrame, pa.Table]) -> pa.Table:
+        """The table written for ``data``, cast to the schema."""
+        if isinstance(data, pa.Table):
+            check_columns(data.column_names, self._schema)
+            return data
+        return to_arrow(cast_to_schema(data, self._schema))
+
+    def _temporary_path(self, path: str) -> str:
+        path = PurePosixPath(path)
+        return str(path.with_name(f".{path.name}.tmp"))
+
+    def _commit(self, temporary: str, path: str) -> None:
+        # a rename within the directory, atomic on local and POSIX file systems
+        self._fs.mv(temporary, path)
+
+    def _write_table(self, table: pa.Table, path: str) -> None:
+        temporary = self._temporary_path(path)
+        with self._fs.open(temporary, mode="wb") as f:
+            pq.write_table(table, f, **self._save_args)
+        self._commit(temporary, path)
+
+    def _load(self) -> Union[pd.DataFrame, pa.Table]:
+        load_path = get_filepath_str(self._filepath, self._protocol)
+        with self._fs.open(load_path, mode="rb") as f:
+            table = pq.read_table(f, **self._load_args)
+        return self.from_arrow(table)
+
+    def _save(self, data: Union[pd.DataFrame, pa.Table, ds.Scanner]) -> None:
+        save_path = get_filepath_str(self._filepath, self._protocol)
+        self._fs.makedirs(str(PurePosixPath(save_path).parent), exist_ok=True)
+
+        if isinstance(data, ds.Scanner):
+            check_columns(data.projected_schema.names, self._schema)
+            temporary = self._temporary_path(save_path)
+            with self._fs.open(temporary, mode="wb") as f:
+                with pq.ParquetWriter(f, data.projected_schema, **self._save_args) as writer:
+                    for batch in data.to_reader():
+                        writer.write_batch(batch)
+            self._commit(temporary, save_path)
+            return
+
+        self._write_table(self.to_arrow(data), save_path)
+
+    def _exists(self) -> bool:
+        load_path = get_filepath_str(self._filepath, self._protocol)
+        return self._fs.exists(load_path)
@@ -0,0 +1,259 @@
+"""``UpsertParquetDataset`` stores a typed table (see ``TypedParquetDataset``) as one
+Parquet file per day of its date column and only rewrites the days whose rows changed::
+
+    primary_dataset/2024-01-04.parquet
+    primary_dataset/2024-01-05.parquet
+    primary_dataset/_fingerprints.json
+
+Saving upserts the table: the rows of every day are sorted by ``sort_by`` and
+fingerprinted, days whose fingerprint equals the stored one are left untouched, the others
+are replaced and days missing from the table are kept. Every file is written to a hidden
+temporary file and renamed, so readers never see a partially written day. A daily run that
+re-extracts a few trailing days therefore only writes those days.
+
+With ``mode: replace`` the saved table is the complete dataset: unchanged days are still
+skipped, but the files and fingerprints of days missing from the table are removed, so a
+full rebuild drops days that no longer exist upstream. Use it for outputs whose node
+always returns every day (the primary dataset, the cubes).
+
+A ``pyarrow.dataset.Scanner`` (e.g. the DuckDB primary dataset) is saved without holding
+the whole stream in memory: the rows of every batch are appended to hidden spill files of
+their days, then each day is read back on its own, sorted, fingerprinted and, if it
+changed, written and renamed like a saved table. At most ``MAX_OPEN_SPILLS`` spill files
+are open at a time, so a day can be spread over several of them.
+
+Loading reads all days into one table (``load_args`` as for ``TypedParquetDataset``).
+
+Example catalog entry::
+
+    primary_dataset:
+      type: coding_challenge.extras.datasets.UpsertParquetDataset
+      filepath: ${filepath_prefix}/03_primary/primary_dataset
+      schema: primary
+      mode: replace
+"""
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from pathlib import PurePosixPath
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from kedro.io.core import DatasetError, get_filepath_str
+
+from coding_challenge.utils.schema import check_columns
+
+from .typed_parquet_dataset import TypedParquetDataset
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINTS = "_fingerprints.json"
+
+# upsert keeps the days missing from a saved table, replace removes them
+SAVE_MODES = ("upsert", "replace")
+
+# spill files kept open while a scanner is saved, the least recently written is closed first
+MAX_OPEN_SPILLS = 64
+
+
+def row_hashes(table: pa.Table) -> bytes:
+    """Hash of every row's values, independent of how the table is chunked or encoded."""
+    df = table.to_pandas(date_as_object=False)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+
+
+class UpsertParquetDataset(TypedParquetDataset):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        filepath: str,
+        schema: str,
+        date_column: str = "target_date",
+        sort_by: List[str] = None,
+        mode: str = "upsert",
+        return_type: str = "pandas",
+        load_args: Dict[str, Any] = None,
+        save_args: Dict[str, Any] = None,
+        credentials: Dict[str, Any] = None,
+        fs_args: Dict[str, Any] = None,
+    ) -> None:
+        super().__init__(
+            filepath=filepath,
+            schema=schema,
+            return_type=return_type,
+            load_args=load_args,
+            save_args=save_args,
+            credentials=credentials,
+            fs_args=fs_args,
+        )
+        if mode not in SAVE_MODES:
+            raise DatasetError(f"Unknown mode '{mode}', expected one of {SAVE_MODES}")
+        self._date_column = date_column
+        self._sort_by = sort_by or ["id_store", "id_product", "number_store", "number_product"]
+        self._mode = mode
+
+    def _describe(self) -> Dict[str, Any]:
+        return {**super()._describe(), "sort_by": self._sort_by, "mode": self._mode}
+
+    def _root(self) -> str:
+        return get_filepath_str(self._filepath, self._protocol)
+
+    def _partition_labels(self, table: pa.Table) -> pa.ChunkedArray:
+        return pc.strftime(table[self._date_column], format="%Y-%m-%d")
+
+    def _partition_path(self, label: str) -> str:
+        return f"{self._root()}/{label}.parquet"
+
+    def _partitions(self, table: pa.Table) -> Iterator[Tuple[str, pa.Table]]:
+        """Rows of every partition label, sorted by ``sort_by``."""
+        sort_by = [col for col in self._sort_by if col in table.column_names]
+        table = table.append_column("_partition", self._partition_labels(table))
+        table = table.sort_by([("_partition", "ascending")] + [(col, "ascending") for col in sort_by])
+
+        # the table is sorted by label, so every partition is one contiguous slice
+        labels = table["_partition"].combine_chunks()
+        table = table.drop_columns(["_partition"])
+        boundaries = pc.run_end_encode(labels).run_ends.to_pylist() if len(table) else []
+
+        start = 0
+        for end in boundaries:
+            yield labels[start].as_py(), table.slice(start, end - start)
+            start = end
+
+    @staticmethod
+    def _digest(schema: pa.Schema) -> "hashlib._Hash":
+        return hashlib.sha256(schema.remove_metadata().to_string().encode())
+
+    def _fingerprint(self, part: pa.Table) -> str:
+        digest = self._digest(part.schema)
+        digest.update(row_hashes(part))
+        return digest.hexdigest()
+
+    def _read_fingerprints(self) -> Dict[str, str]:
+        path = f"{self._root()}/{FINGERPRINTS}"
+        if not self._fs.exists(path):
+            return {}
+        with self._fs.open(path, mode="r") as f:
+            return json.load(f)
+
+    def _write_fingerprints(self, fingerprints: Dict[str, str]) -> None:
+        path = f"{self._root()}/{FINGERPRINTS}"
+        temporary = self._temporary_path(path)
+        with self._fs.open(temporary, mode="w") as f:
+            json.dump(dict(sorted(fingerprints.items())), f, indent=0)
+        self._commit(temporary, path)
+
+    def _write_changed(self, table: pa.Table, stored: Dict[str, str]) -> Dict[str, str]:
+        """Writes the partitions of ``table`` whose fingerprint is not in ``stored``,
+        returns the fingerprints of all partitions of ``table``."""
+        return self._write_partitions(self._partitions(table), stored)
+
+    def _write_partitions(
+        self, partitions: Iterator[Tuple[str, pa.Table]], stored: Dict[str, str]
+    ) -> Dict[str, str]:
+        fingerprints, written = {}, 0
+        for label, part in partitions:
+            fingerprints[label] = self._fingerprint(part)
+            path = self._partition_path(label)
+            if stored.get(label) == fingerprints[label] and self._fs.exists(path):
+                continue
+            self._fs.makedirs(str(PurePosixPath(path).parent), exist_ok=True)
+            self._write_table(part, path)
+            written += 1
+
+        logger.info("Wrote %d of %d partitions of %s", written, len(fingerprints), self._root())
+        return fingerprints
+
+    def _spill_path(self, label: str, piece: int) -> str:
+        path = PurePosixPath(self._partition_path(label))
+        return str(path.with_name(f".{path.name}.spill-{piece}"))
+
+    def _spill_batches(self, scanner: ds.Scanner) -> Dict[str, List[str]]:
+        """Appends the rows of every batch to spill files of their partitions, returns the
+        spill files of every label."""
+        check_columns(scanner.projected_schema.names, self._schema)
+        spills: Dict[str, List[str]] = {}
+        writers: "OrderedDict[str, Tuple[Any, pq.ParquetWriter]]" = OrderedDict()
+        try:
+            for batch in scanner.to_reader():
+                for label, part in self._partitions(pa.Table.from_batches([batch])):
+                    if label in writers:
+                        writers.move_to_end(label)
+                    else:
+                        if len(writers) >= MAX_OPEN_SPILLS:
+                            _, (f, writer) = writers.popitem(last=False)
+                            writer.close()
+                            f.close()
+                        path = self._spill_path(label, len(spills.get(label, [])))
+                        self._fs.makedirs(str(PurePosixPath(path).parent), exist_ok=True)
+                        f = self._fs.open(path, mode="wb")
+                        writers[label] = (f, pq.ParquetWriter(f, part.schema))
+                        spills.setdefault(label, []).append(path)
+                    writers[label][1].write_table(part)
+        except BaseException:
+            self._remove_spills(spills, writers)
+            raise
+        for f, writer in writers.values():
+            writer.close()
+            f.close()
+        return spills
+
+    def _remove_spills(
+        self, spills: Dict[str, List[str]], writers: Dict[str, Tuple[Any, pq.ParquetWriter]] = None
+    ) -> None:
+        for f, writer in (writers or {}).values():
+            writer.close()
+            f.close()
+        for paths in spills.values():
+            for path in paths:
+                if self._fs.exists(path):
+                    self._fs.rm(path)
+
+    def _spilled_partitions(self, spills: Dict[str, List[str]]) -> Iterator[Tuple[str, pa.Table]]:
+        """Rows of every spilled partition sorted by ``sort_by``, one partition in memory at a time."""
+        for label, paths in sorted(spills.items()):
+            table = pq.read_table(paths, filesystem=self._fs)
+            for path in paths:
+                self._fs.rm(path)
+            yield from self._partitions(table)
+
+    def _remove_missing(self, fingerprints: Dict[str, str]) -> None:
+        """Removes the day files whose label is not in ``fingerprints``."""
+        removed = 0
+        for path in self._fs.glob(f"{self._root()}/*.parquet"):
+            if PurePosixPath(path).stem not in fingerprints:
+                self._fs.rm(path)
+                removed += 1
+        if removed:
+            logger.info("Removed %d partitions missing from the data of %s", removed, self._root())
+
+    def _load(self) -> Union[pd.DataFrame, pa.Table]:
+        paths = sorted(self._fs.glob(f"{self._root()}/*.parquet"))
+        table = pq.read_table(paths, filesystem=self._fs, **self._load_args)
+        return self.from_arrow(table)
+
+    def _save(self, data: Union[pd.DataFrame, pa.Table, ds.Scanner]) -> None:
+        self._fs.makedirs(self._root(), exist_ok=True)
+        stored = self._read_fingerprints()
+
+        if isinstance(data, ds.Scanner):
+            spills = self._spill_batches(data)
+            try:
+                saved = self._write_partitions(self._spilled_partitions(spills), stored)
+            finally:
+                self._remove_spills(spills)
+        else:
+            saved = self._write_changed(self.to_arrow(data), stored)
+
+        if self._mode == "replace":
+            self._remove_missing(saved)
+            self._write_fingerprints(saved)
+        else:
+            self._write_fingerprints({**stored, **saved})
+
+    def _exists(self) -> bool:
+        return bool(self._fs.glob(f"{self._root()}/*.parquet"))
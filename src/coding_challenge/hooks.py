@@ -0,0 +1,203 @@
+"""Project hooks."""
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import psutil
+import pyarrow as pa
+from kedro.framework.hooks import hook_impl
+
+from coding_challenge.extras.datasets.checkpointed_dataset import wait_for_checkpoints
+
+logger = logging.getLogger(__name__)
+
+METRICS_DATASET = "performance_metrics"
+
+
+class CheckpointHooks:
+    """Finishes the background checkpoints of ``CheckpointedDataset`` before a run ends."""
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        wait_for_checkpoints()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        try:
+            wait_for_checkpoints()
+        except Exception:  # pylint: disable=broad-except
+            # the pipeline error is the one to report
+            pass
+
+
+def data_size(data: Any) -> Tuple[Optional[int], Optional[int]]:
+    """Rows and bytes of a DataFrame or arrow table, ``(None, None)`` for anything else."""
+    if isinstance(data, pd.DataFrame):
+        return len(data), int(data.memory_usage(index=False).sum())
+    if isinstance(data, pa.Table):
+        return data.num_rows, data.nbytes
+    return None, None
+
+
+def _sum_sizes(values) -> Tuple[Optional[int], Optional[int]]:
+    sizes = [data_size(value) for value in values]
+    sizes = [size for size in sizes if size[0] is not None]
+    if not sizes:
+        return None, None
+    return sum(rows for rows, _ in sizes), sum(size for _, size in sizes)
+
+
+@dataclass
+class Measurement:
+    kind: str
+    name: str
+    node: Optional[str]
+    started_at: datetime = field(default_factory=datetime.now)
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rss_start_mb: float = 0.0
+    peak_rss_delta_mb: float = 0.0
+    rows_in: Optional[int] = None
+    bytes_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    bytes_out: Optional[int] = None
+
+
+class PerformanceHooks:
+    """Records wall/CPU time, peak RSS growth and rows/bytes of every node, dataset load
+    and dataset save. The metrics of a run are saved to the ``performance_metrics``
+    catalog entry of the customer (a versioned Parquet file, so one file per run) and the
+    slowest nodes are logged when the run ends.
+
+    Peak memory is sampled by a background thread every ``sample_interval`` seconds.
+    CPU time is the process time and includes the worker threads of a node.
+    """
+
+    def __init__(self, sample_interval: float = 0.01, summary_size: int = 10):
+        self._sample_interval = sample_interval
+        self._summary_size = summary_size
+        self._process = None
+        self._lock = threading.Lock()
+        self._open: Dict[Tuple[str, str], Tuple[Measurement, float, float, int]] = {}
+        self._peaks: Dict[Tuple[str, str], int] = {}
+        self._measurements: List[Measurement] = []
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self._sample_interval):
+            rss = self._process.memory_info().rss
+            with self._lock:
+                for key, peak in self._peaks.items():
+                    if rss > peak:
+                        self._peaks[key] = rss
+
+    def _start(self, kind: str, name: str, node: Optional[str]) -> Measurement:
+        rss = self._process.memory_info().rss
+        measurement = Measurement(kind, name, node, rss_start_mb=rss / 1024 ** 2)
+        with self._lock:
+            self._open[kind, name] = measurement, time.perf_counter(), time.process_time(), rss
+            self._peaks[kind, name] = rss
+        return measurement
+
+    def _finish(self, kind: str, name: str) -> Optional[Measurement]:
+        rss = self._process.memory_info().rss
+        with self._lock:
+            if (kind, name) not in self._open:
+                return None
+            measurement, wall, cpu, rss_start = self._open.pop((kind, name))
+            peak = max(self._peaks.pop((kind, name)), rss)
+        measurement.wall_seconds = time.perf_counter() - wall
+        measurement.cpu_seconds = time.process_time() - cpu
+        measurement.peak_rss_delta_mb = (peak - rss_start) / 1024 ** 2
+        self._measurements.append(measurement)
+        return measurement
+
+    @hook_impl
+    def before_pipeline_run(self) -> None:
+        # created per run, the hooks instance is inherited by forked run-customers workers
+        self._process = psutil.Process()
+        self._measurements = []
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._sampler.start()
+
+    @hook_impl
+    def before_node_run(self, node) -> None:
+        self._start("node", node.name, node.name)
+
+    @hook_impl
+    def after_node_run(self, node, inputs: Dict[str, Any], outputs: Dict[str, Any]) -> None:
+        measurement = self._finish("node", node.name)
+        if measurement is not None:
+            measurement.rows_in, measurement.bytes_in = _sum_sizes(inputs.values())
+            measurement.rows_out, measurement.bytes_out = _sum_sizes(outputs.values())
+
+    @hook_impl
+    def on_node_error(self, node) -> None:
+        self._finish("node", node.name)
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str, node) -> None:
+        self._start("load", dataset_name, node.name if node else None)
+
+    @hook_impl
+    def after_dataset_loaded(self, dataset_name: str, data: Any) -> None:
+        measurement = self._finish("load", dataset_name)
+        if measurement is not None:
+            measurement.rows_out, measurement.bytes_out = data_size(data)
+
+    @hook_impl
+    def before_dataset_saved(self, dataset_name: str, data: Any, node) -> None:
+        measurement = self._start("save", dataset_name, node.name if node else None)
+        measurement.rows_in, measurement.bytes_in = data_size(data)
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str) -> None:
+        self._finish("save", dataset_name)
+
+    def metrics(self, run_params: Dict[str, Any]) -> pd.DataFrame:
+        metrics = pd.DataFrame([asdict(measurement) for measurement in self._measurements])
+        metrics.insert(0, "pipeline", run_params.get("pipeline_name") or "__default__")
+        metrics.insert(0, "env", run_params.get("env"))
+        metrics.insert(0, "session_id", run_params.get("session_id"))
+        return metrics.astype({col: "Int64" for col in ["rows_in", "bytes_in", "rows_out", "bytes_out"]})
+
+    def summary(self, metrics: pd.DataFrame) -> List[str]:
+        """One line per slowest node, logged one by one so log handlers don't wrap a table."""
+        nodes = metrics[metrics["kind"] == "node"].nlargest(self._summary_size, "wall_seconds")
+        io = metrics[metrics["kind"] != "node"].groupby("node")["wall_seconds"].sum()
+        lines = []
+        for row in nodes.itertuples():
+            rows_in = row.rows_in if pd.notna(row.rows_in) else "-"
+            rows_out = row.rows_out if pd.notna(row.rows_out) else "-"
+            lines.append(
+                f"{row.name}: {row.wall_seconds:.2f}s wall, {row.cpu_seconds:.2f}s CPU, "
+                f"{io.get(row.name, 0.0):.2f}s I/O, {row.peak_rss_delta_mb:.0f}MB peak, "
+                f"{rows_in} -> {rows_out} rows"
+            )
+        return lines
+
+    def _report(self, run_params: Dict[str, Any], catalog) -> None:
+        self._stop.set()
+        if not self._measurements:
+            return
+        metrics = self.metrics(run_params)
+
+        if METRICS_DATASET in catalog.list():
+            catalog.save(METRICS_DATASET, metrics)
+        logger.info("Slowest nodes of %s:", run_params.get("env"))
+        for line in self.summary(metrics):
+            logger.info("  %s", line)
+
+    @hook_impl
+    def after_pipeline_run(self, run_params: Dict[str, Any], catalog) -> None:
+        self._report(run_params, catalog)
+
+    @hook_impl
+    def on_pipeline_error(self, run_params: Dict[str, Any], catalog) -> None:
+        self._report(run_params, catalog)
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 from kedro.framework.project import find_pipelines
-from kedro.pipeline import Pipeline
+from kedro.pipeline import Pipeline, pipeline
+
+# ERP pipelines that can be followed by the optional ml_features stage
+ML_FEATURE_PIPELINES = ["etl_cosmos", "etl_cosmos_duckdb", "etl_galaxy"]
 
 
 def register_pipelines() -> dict[str, Pipeline]:
@@ -12,5 +15,22 @@ def register_pipelines() -> dict[str, Pipeline]:
         A mapping from pipeline names to ``Pipeline`` objects.
     """
     pipelines = find_pipelines()
-    pipelines["__default__"] = sum(pipelines.values())
+    # ml_features reads the ML dataset of an ERP pipeline, select e.g. etl_cosmos_ml_features
+    ml_features = pipelines.pop("ml_features")
+    # etl_cosmos_duckdb is an alternative backend of etl_cosmos with the same outputs
+    pipelines["__default__"] = sum(
+        pipeline for name, pipeline in pipelines.items() if name != "etl_cosmos_duckdb"
+    )
+
+    for name in ML_FEATURE_PIPELINES:
+        features = ml_features
+        if name == "etl_galaxy":
+            features = pipeline(
+                ml_features,
+                inputs={"ml_dataset": "galaxy_ml_dataset"},
+                outputs={"ml_features": "galaxy_ml_features"},
+                parameters={"params:ml_features": "params:ml_features"},
+                namespace="galaxy",
+            )
+        pipelines[f"{name}_ml_features"] = pipelines[name] + features
     return pipelines
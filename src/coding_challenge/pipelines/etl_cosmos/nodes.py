@@ -1,81 +1,223 @@
 import pandas as pd
 import logging
-from typing import Dict
+from functools import partial
+from typing import Dict, Optional, Tuple
 
 from coding_challenge.utils.transformations import (
     handle_empty_numeric,
     calculate_returns_from_sales,
     aggregate_multiple_deliveries,
     deduplicate_incremental_data,
-    calculate_stockout_simple,
+    merge_incremental_state,
 )
+from coding_challenge.utils.joins import join_dimensions
+from coding_challenge.utils.landing import canonical_columns, land_partitions, update_landed_sources
+from coding_challenge.utils.partitions import (
+    load_partitions,
+    manifest_lookup,
+    prune_superseded_partitions,
+    select_new_partitions,
+    update_watermark,
+)
+from coding_challenge.utils.scd import build_versions
+from coding_challenge.utils.stockout import evaluate_stockout
 
 logger = logging.getLogger(__name__)
 
+# raw ERP column -> canonical column of the landed files
+SALES_COLUMNS = {
+    'Datum': 'target_date',
+    'Kunde': 'number_store',
+    'Artikel': 'number_product',
+    'VK-Menge': 'raw_quantity',
+    'VK-Betrag': 'revenue'
+}
+DELIVERY_COLUMNS = {
+    'Datum': 'target_date',
+    'ArtNr': 'number_product',
+    'Kunde_Nummer': 'number_store',
+    'LI-Menge': 'delivery_qty'
+}
+PRODUCT_COLUMNS = {
+    'ArtNr': 'number_product',
+    'Bezeichnung': 'product_name',
+    'Artikelgruppe': 'product_group',
+    'Preis': 'price',
+    'Mindestbestellmenge': 'moq'
+}
+STORE_COLUMNS = {
+    'Nummer': 'number_store',
+    'Straße': 'store_name',
+    'PLZ': 'postal_code',
+    'Ort': 'city'
+}
+
+
+def _master_extraction_date(filename: str) -> pd.Timestamp:
+    parts = filename.split('_')
+    return pd.to_datetime(f"{parts[1]}-{parts[2]}-{parts[3]}")
+
+
+def _land(
+    raw_dict: Dict[str, pd.DataFrame],
+    landed: Optional[dict],
+    columns: Dict[str, str],
+    ingestion: Optional[dict],
+    partition_loading: Optional[dict],
+    fingerprints: Optional[Dict[str, str]] = None,
+    sources: Optional[Dict[str, str]] = None
+) -> Dict[str, pd.DataFrame]:
+    return land_partitions(
+        raw_dict,
+        landed,
+        preprocess=partial(canonical_columns, columns=columns),
+        full_rebuild=(ingestion or {}).get('full_rebuild', False),
+        fingerprints=fingerprints,
+        sources=sources,
+        **(partition_loading or {})
+    )
+
 
-def process_sales_files(sales_dict: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-    all_sales = []
+def _land_tracked(
+    raw_dict: Dict[str, pd.DataFrame],
+    landed: Optional[dict],
+    manifest: pd.DataFrame,
+    sources: Optional[Dict[str, str]],
+    columns: Dict[str, str],
+    ingestion: Optional[dict],
+    partition_loading: Optional[dict]
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    # files whose content hash differs from the one they were landed from are landed again
+    fingerprints = dict(zip(manifest['partition_id'], manifest['content_hash']))
+    new_landed = _land(raw_dict, landed, columns, ingestion, partition_loading, fingerprints, sources)
+    full_rebuild = (ingestion or {}).get('full_rebuild', False)
     
-    for filename, df_or_func in sales_dict.items():
-        df = df_or_func() if callable(df_or_func) else df_or_func
-        
-        parts = filename.replace('.csv', '').split('_')
-        extraction_date = pd.to_datetime(f"{parts[-3]}-{parts[-2]}-{parts[-1]}")
-        
-        df = df.copy()
-        df['extraction_date'] = extraction_date
-        all_sales.append(df)
+    return new_landed, update_landed_sources(sources, new_landed, fingerprints, full_rebuild)
+
+
+def land_sales_files(
+    sales_dict: Dict[str, pd.DataFrame],
+    landed_sales: Optional[dict],
+    manifest: pd.DataFrame,
+    landed_sources: Optional[Dict[str, str]] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    return _land_tracked(
+        sales_dict, landed_sales, manifest, landed_sources, SALES_COLUMNS, ingestion, partition_loading
+    )
+
+
+def land_delivery_files(
+    delivery_dict: Dict[str, pd.DataFrame],
+    landed_deliveries: Optional[dict],
+    manifest: pd.DataFrame,
+    landed_sources: Optional[Dict[str, str]] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    return _land_tracked(
+        delivery_dict, landed_deliveries, manifest, landed_sources, DELIVERY_COLUMNS, ingestion,
+        partition_loading
+    )
+
+
+def land_product_master(
+    product_dict: Dict[str, pd.DataFrame],
+    landed_products: Optional[dict] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Dict[str, pd.DataFrame]:
+    return _land(product_dict, landed_products, PRODUCT_COLUMNS, ingestion, partition_loading)
+
+
+def land_store_master(
+    store_dict: Dict[str, pd.DataFrame],
+    landed_stores: Optional[dict] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Dict[str, pd.DataFrame]:
+    return _land(store_dict, landed_stores, STORE_COLUMNS, ingestion, partition_loading)
+
+
+def process_sales_files(
+    sales_dict: Dict[str, pd.DataFrame],
+    manifest: pd.DataFrame,
+    previous_sales: Optional[pd.DataFrame] = None,
+    watermark: Optional[dict] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Tuple[pd.DataFrame, dict]:
+    full_rebuild = (ingestion or {}).get('full_rebuild', False) or previous_sales is None
+    partitions, full_rebuild = select_new_partitions(
+        sales_dict, watermark, manifest, full_rebuild=full_rebuild
+    )
     
-    combined = pd.concat(all_sales, ignore_index=True)
+    if not partitions and not full_rebuild:
+        logger.info("No new sales files since %s", watermark['last_extraction'])
+        return previous_sales, watermark
     
-    combined = combined.rename(columns={
-        'Datum': 'target_date',
-        'Kunde': 'number_store',
-        'Artikel': 'number_product',
-        'VK-Menge': 'raw_quantity',
-        'VK-Betrag': 'revenue'
-    })
+    logger.info(
+        "Processing %d sales files (%s)",
+        len(partitions), 'full rebuild' if full_rebuild else 'incremental'
+    )
     
-    combined['target_date'] = pd.to_datetime(combined['target_date'])
+    loaded = load_partitions(
+        prune_superseded_partitions(partitions, manifest),
+        manifest_lookup(manifest, 'extraction_date'),
+        **(partition_loading or {})
+    )
+    combined = pd.concat(loaded.values(), ignore_index=True)
     
     combined = deduplicate_incremental_data(
         combined,
         key_cols=['target_date', 'number_store', 'number_product']
     )
     
-    combined['raw_quantity'] = handle_empty_numeric(combined['raw_quantity'])
-    
     split_data = calculate_returns_from_sales(combined['raw_quantity'])
     combined['sales_qty'] = split_data['sales_qty']
     combined['return_qty'] = split_data['return_qty']
     
-    return combined[['target_date', 'number_store', 'number_product', 'sales_qty', 'return_qty']]
+    sales = combined[['target_date', 'number_store', 'number_product', 'sales_qty', 'return_qty']]
+    
+    if not full_rebuild:
+        sales = merge_incremental_state(
+            previous_sales,
+            sales,
+            key_cols=['target_date', 'number_store', 'number_product']
+        )
+    
+    return sales, update_watermark(watermark, partitions, manifest, full_rebuild)
 
 
-def process_delivery_files(delivery_dict: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-    all_deliveries = []
-    
-    for filename, df_or_func in delivery_dict.items():
-        df = df_or_func() if callable(df_or_func) else df_or_func
-        
-        parts = filename.replace('.csv', '').split('_')
-        extraction_date = pd.to_datetime(f"{parts[-3]}-{parts[-2]}-{parts[-1]}")
-        
-        df = df.copy()
-        df['extraction_date'] = extraction_date
-        all_deliveries.append(df)
+def process_delivery_files(
+    delivery_dict: Dict[str, pd.DataFrame],
+    manifest: pd.DataFrame,
+    previous_deliveries: Optional[pd.DataFrame] = None,
+    watermark: Optional[dict] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Tuple[pd.DataFrame, dict]:
+    full_rebuild = (ingestion or {}).get('full_rebuild', False) or previous_deliveries is None
+    partitions, full_rebuild = select_new_partitions(
+        delivery_dict, watermark, manifest, full_rebuild=full_rebuild
+    )
     
-    combined = pd.concat(all_deliveries, ignore_index=True)
+    if not partitions and not full_rebuild:
+        logger.info("No new delivery files since %s", watermark['last_extraction'])
+        return previous_deliveries, watermark
     
-    combined = combined.rename(columns={
-        'Datum': 'target_date',
-        'ArtNr': 'number_product',
-        'Kunde_Nummer': 'number_store',
-        'LI-Menge': 'delivery_qty'
-    })
+    logger.info(
+        "Processing %d delivery files (%s)",
+        len(partitions), 'full rebuild' if full_rebuild else 'incremental'
+    )
     
-    combined['target_date'] = pd.to_datetime(combined['target_date'])
-    combined['delivery_qty'] = handle_empty_numeric(combined['delivery_qty'])
+    loaded = load_partitions(
+        prune_superseded_partitions(partitions, manifest),
+        manifest_lookup(manifest, 'extraction_date'),
+        **(partition_loading or {})
+    )
+    combined = pd.concat(loaded.values(), ignore_index=True)
     
     combined = deduplicate_incremental_data(
         combined,
@@ -88,70 +230,37 @@ def process_delivery_files(delivery_dict: Dict[str, pd.DataFrame]) -> pd.DataFra
         agg_col='delivery_qty'
     )
     
-    return aggregated
+    if not full_rebuild:
+        aggregated = merge_incremental_state(
+            previous_deliveries,
+            aggregated,
+            key_cols=['target_date', 'number_store', 'number_product']
+        )
+    
+    return aggregated, update_watermark(watermark, partitions, manifest, full_rebuild)
 
 
-def process_product_master(product_dict: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-    all_products = []
-    
-    for filename, df_or_func in product_dict.items():
-        df = df_or_func() if callable(df_or_func) else df_or_func
-        
-        parts = filename.split('_')
-        date_part = f"{parts[1]}-{parts[2]}-{parts[3]}"
-        extraction_date = pd.to_datetime(date_part)
-        
-        df = df.copy()
-        df['extraction_date'] = extraction_date
-        all_products.append(df)
-    
-    combined = pd.concat(all_products, ignore_index=True)
-    
-    combined = combined.rename(columns={
-        'ArtNr': 'number_product',
-        'Bezeichnung': 'product_name',
-        'Preis': 'price',
-        'Mindestbestellmenge': 'moq'
-    })
-    
-    combined = combined.sort_values('extraction_date').drop_duplicates(
-        subset=['number_product'],
-        keep='last'
-    )
+def process_product_master(
+    product_dict: Dict[str, pd.DataFrame],
+    partition_loading: Optional[dict] = None
+) -> pd.DataFrame:
+    loaded = load_partitions(product_dict, _master_extraction_date, **(partition_loading or {}))
+    combined = pd.concat(loaded.values(), ignore_index=True)
     
     combined['price'] = handle_empty_numeric(combined['price'])
     combined['moq'] = handle_empty_numeric(combined['moq'], default=0)
+    # files landed before the product group was kept have none
+    combined['product_group'] = combined.get('product_group')
     
-    return combined[['number_product', 'product_name', 'price', 'moq']]
+    return build_versions(combined, ['number_product'], ['product_name', 'product_group', 'price', 'moq'])
 
 
-def process_store_master(store_dict: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-    all_stores = []
-    
-    for filename, df_or_func in store_dict.items():
-        df = df_or_func() if callable(df_or_func) else df_or_func
-        
-        parts = filename.split('_')
-        date_part = f"{parts[1]}-{parts[2]}-{parts[3]}"
-        extraction_date = pd.to_datetime(date_part)
-        
-        df = df.copy()
-        df['extraction_date'] = extraction_date
-        all_stores.append(df)
-    
-    combined = pd.concat(all_stores, ignore_index=True)
-    
-    combined = combined.rename(columns={
-        'Nummer': 'number_store',
-        'Straße': 'store_name',
-        'PLZ': 'postal_code',
-        'Ort': 'city'
-    })
-    
-    combined = combined.sort_values('extraction_date').drop_duplicates(
-        subset=['number_store'],
-        keep='last'
-    )
+def process_store_master(
+    store_dict: Dict[str, pd.DataFrame],
+    partition_loading: Optional[dict] = None
+) -> pd.DataFrame:
+    loaded = load_partitions(store_dict, _master_extraction_date, **(partition_loading or {}))
+    combined = pd.concat(loaded.values(), ignore_index=True)
     
     combined['store_address'] = (
         combined['store_name'] + ' – ' +
@@ -159,7 +268,7 @@ def process_store_master(store_dict: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         combined['city']
     )
     
-    return combined[['number_store', 'store_name', 'store_address']]
+    return build_versions(combined, ['number_store'], ['store_name', 'store_address'])
 
 
 def join_all_data(
@@ -168,7 +277,8 @@ def join_all_data(
     products: pd.DataFrame,
     stores: pd.DataFrame,
     mapping_product: pd.DataFrame,
-    mapping_store: pd.DataFrame
+    mapping_store: pd.DataFrame,
+    stockout: Optional[dict] = None
 ) -> pd.DataFrame:
     merged = pd.merge(
         sales,
@@ -177,44 +287,13 @@ def join_all_data(
         how='outer'
     ).fillna({'sales_qty': 0, 'return_qty': 0, 'delivery_qty': 0})
     
-    merged = merged.merge(mapping_product, on='number_product', how='left')
-    merged = merged.merge(mapping_store, on='number_store', how='left')
-    
-    merged = merged.merge(products, on='number_product', how='left')
-    merged = merged.merge(stores, on='number_store', how='left')
+    merged = join_dimensions(merged, [
+        (mapping_product, 'number_product'),
+        (mapping_store, 'number_store'),
+        (products, 'number_product'),
+        (stores, 'number_store'),
+    ])
     
-    merged['stockout'] = calculate_stockout_simple(
-        merged['sales_qty'],
-        merged['delivery_qty']
-    )
+    merged['stockout'] = evaluate_stockout(merged, stockout)
     
     return merged
-
-
-def create_ml_dataset(df: pd.DataFrame) -> pd.DataFrame:
-    return df[[
-        'id_product',
-        'id_store',
-        'target_date',
-        'sales_qty',
-        'stockout'
-    ]].copy()
-
-
-def create_app_dataset(df: pd.DataFrame) -> pd.DataFrame:
-    return df[[
-        'id_product',
-        'id_store',
-        'target_date',
-        'sales_qty',
-        'return_qty',
-        'delivery_qty',
-        'stockout',
-        'price',
-        'product_name',
-        'number_product',
-        'moq',
-        'number_store',
-        'store_name',
-        'store_address'
-    ]].copy()
@@ -1,14 +1,18 @@
 
 from kedro.pipeline import Pipeline, node, pipeline
 
+from coding_challenge.utils.outputs import create_app_cubes, create_output_datasets
+
 from .nodes import (
+    land_sales_files,
+    land_delivery_files,
+    land_product_master,
+    land_store_master,
     process_sales_files,
     process_delivery_files,
     process_product_master,
     process_store_master,
     join_all_data,
-    create_ml_dataset,
-    create_app_dataset,
 )
 
 
@@ -16,36 +20,106 @@ def create_pipeline(**kwargs) -> Pipeline:
 
     return pipeline(
         [
+            # Landing: new and changed raw files parsed once into Parquet with canonical column names
+            node(
+                func=land_sales_files,
+                inputs=[
+                    "raw_sales",
+                    "previous_landed_sales",
+                    "sales_manifest",
+                    "previous_landed_sales_sources",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs=["landed_sales", "landed_sales_sources"],
+                name="land_sales",
+                tags=["landing"],
+            ),
+            node(
+                func=land_delivery_files,
+                inputs=[
+                    "raw_deliveries",
+                    "previous_landed_deliveries",
+                    "deliveries_manifest",
+                    "previous_landed_deliveries_sources",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs=["landed_deliveries", "landed_deliveries_sources"],
+                name="land_deliveries",
+                tags=["landing"],
+            ),
+            node(
+                func=land_product_master,
+                inputs=[
+                    "raw_products",
+                    "previous_landed_products",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs="landed_products",
+                name="land_products",
+                tags=["landing"],
+            ),
+            node(
+                func=land_store_master,
+                inputs=[
+                    "raw_stores",
+                    "previous_landed_stores",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs="landed_stores",
+                name="land_stores",
+                tags=["landing"],
+            ),
+            
             # Node 1: Process sales files
             node(
                 func=process_sales_files,
-                inputs="raw_sales",
-                outputs="intermediate_sales",
+                inputs=[
+                    "landed_sales",
+                    "sales_manifest",
+                    "previous_intermediate_sales",
+                    "previous_sales_watermark",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs=["intermediate_sales", "sales_watermark"],
                 name="process_sales",
             ),
             
             # Node 2: Process delivery files
             node(
                 func=process_delivery_files,
-                inputs="raw_deliveries",
-                outputs="intermediate_deliveries",
+                inputs=[
+                    "landed_deliveries",
+                    "deliveries_manifest",
+                    "previous_intermediate_deliveries",
+                    "previous_deliveries_watermark",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs=["intermediate_deliveries", "deliveries_watermark"],
                 name="process_deliveries",
             ),
             
             # Node 3: Process product master
             node(
                 func=process_product_master,
-                inputs="raw_products",
+                inputs=["landed_products", "params:partition_loading"],
                 outputs="intermediate_products",
                 name="process_products",
+                tags=["cacheable"],
             ),
             
             # Node 4: Process store master
             node(
                 func=process_store_master,
-                inputs="raw_stores",
+                inputs=["landed_stores", "params:partition_loading"],
                 outputs="intermediate_stores",
                 name="process_stores",
+                tags=["cacheable"],
             ),
             
             # Node 5: Join all data
@@ -58,25 +132,32 @@ def create_pipeline(**kwargs) -> Pipeline:
                     "intermediate_stores",
                     "mapping_product",
                     "mapping_store",
+                    "params:stockout",
                 ],
                 outputs="primary_dataset",
                 name="join_all_data",
             ),
             
-            # Node 6: Create ML dataset
+            # Node 6: Create ML and App datasets from one read of the primary dataset
             node(
-                func=create_ml_dataset,
-                inputs="primary_dataset",
-                outputs="ml_dataset",
-                name="create_ml_dataset",
+                func=create_output_datasets,
+                inputs=["primary_dataset", "intermediate_products", "intermediate_stores", "params:ml_grid"],
+                outputs=["ml_dataset", "app_dataset", "app_products", "app_stores", "app_series"],
+                name="create_output_datasets",
             ),
             
-            # Node 7: Create App dataset
+            # Node 7: Weekly/monthly rollups for the app dashboards, changed periods only
             node(
-                func=create_app_dataset,
-                inputs="primary_dataset",
-                outputs="app_dataset",
-                name="create_app_dataset",
+                func=create_app_cubes,
+                inputs=[
+                    "primary_dataset",
+                    "primary_fingerprints",
+                    "previous_app_cube_sources",
+                    "previous_app_weekly_cube",
+                    "previous_app_monthly_cube",
+                ],
+                outputs=["app_weekly_cube", "app_monthly_cube", "app_cube_sources"],
+                name="create_app_cubes",
             ),
         ]
     )
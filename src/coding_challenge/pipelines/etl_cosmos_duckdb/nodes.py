@@ -0,0 +1,187 @@
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from coding_challenge.utils.partitions import superseded_partitions
+from coding_challenge.utils.stockout import evaluate_stockout
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = 'target_date, number_store, number_product'
+
+# Dialect of the cosmos sales/delivery exports. The files are cp1250, which DuckDB cannot
+# decode natively, but the columns read here are ASCII in every single-byte encoding.
+CSV_OPTIONS = (
+    "delim=';', decimal_separator=',', header=true, encoding='latin-1', "
+    "dateformat='%d.%m.%Y', filename=true"
+)
+
+SALES_COLUMNS = {'Datum': 'DATE', 'Kunde': 'INTEGER', 'Artikel': 'INTEGER', 'VK-Menge': 'DOUBLE'}
+DELIVERY_COLUMNS = {'Datum': 'DATE', 'Kunde_Nummer': 'INTEGER', 'ArtNr': 'INTEGER', 'LI-Menge': 'DOUBLE'}
+
+
+def _connect(duckdb_params: dict) -> duckdb.DuckDBPyConnection:
+    config = {'preserve_insertion_order': True}
+    if duckdb_params.get('memory_limit'):
+        config['memory_limit'] = duckdb_params['memory_limit']
+    if duckdb_params.get('threads'):
+        config['threads'] = duckdb_params['threads']
+    if duckdb_params.get('temp_directory'):
+        os.makedirs(duckdb_params['temp_directory'], exist_ok=True)
+        config['temp_directory'] = duckdb_params['temp_directory']
+    return duckdb.connect(config=config)
+
+
+def _partition_files(manifest: pd.DataFrame, path: str, suffix: str = '.csv') -> pd.DataFrame:
+    # same selection and order as load_partitions(prune_superseded_partitions(...))
+    superseded = superseded_partitions(manifest)
+    files = manifest.loc[~manifest['partition_id'].isin(superseded), ['partition_id', 'extraction_date']]
+    files = files.sort_values('partition_id', kind='stable')
+    if len(superseded):
+        logger.info("Skipping %d partitions superseded by newer extractions", len(superseded))
+
+    return pd.DataFrame({
+        'filename': [str(Path(path) / f"{partition_id}{suffix}") for partition_id in files['partition_id']],
+        'extraction_date': files['extraction_date'].to_numpy(),
+    })
+
+
+def _load_raw(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    files: pd.DataFrame,
+    columns: dict,
+    names: List[str]
+) -> None:
+    """Reads the files into ``table`` in the order given, so that ``rowid`` is the
+    position of a row in the concatenation of the files (the pandas concat order)."""
+    types = ', '.join(f"'{col}': '{dtype}'" for col, dtype in columns.items())
+    selected = ', '.join(f'"{col}" AS {name}' for col, name in zip(columns, names))
+    con.execute(
+        f"CREATE TABLE {table} AS SELECT {selected}, filename "
+        f"FROM read_csv($files, {CSV_OPTIONS}, types={{{types}}})",
+        {'files': files['filename'].tolist()}
+    )
+
+
+def _latest_extraction(table: str, value: str) -> str:
+    """Keeps the last row of the latest extraction per key, like deduplicate_incremental_data."""
+    return f"""
+        SELECT target_date, number_store, number_product,
+               arg_max(
+                   coalesce({value}, 0), {{'extraction': e.extraction_date, 'position': t.rowid}}
+               ) AS {value}
+        FROM {table} t JOIN extractions_{table} e USING (filename)
+        GROUP BY ALL
+    """
+
+
+def _check_unique(con: duckdb.DuckDBPyConnection, relation: str, key: str) -> None:
+    duplicated = con.execute(
+        f"SELECT {key} FROM {relation} GROUP BY {key} HAVING count(*) > 1 LIMIT 5"
+    ).fetchall()
+    if duplicated:
+        raise ValueError(f"Dimension key '{key}' is not unique, e.g. {[row[0] for row in duplicated]}")
+
+
+def _effective_versions(relation: str, key: str) -> str:
+    """Versions of a dimension (see utils.scd) with the day they apply from in the as-of
+    join; the first version of a key also applies before it, as in utils.joins.asof_indexer."""
+    return f"""
+        SELECT *,
+               CASE WHEN row_number() OVER (PARTITION BY {key} ORDER BY valid_from) = 1
+                    THEN DATE '0001-01-01' ELSE valid_from::DATE END AS effective_from
+        FROM {relation}
+    """
+
+
+def build_primary_dataset(
+    sales_manifest: pd.DataFrame,
+    deliveries_manifest: pd.DataFrame,
+    products: pd.DataFrame,
+    stores: pd.DataFrame,
+    duckdb_params: Optional[dict] = None,
+    stockout: Optional[dict] = None
+) -> ds.Scanner:
+    duckdb_params = duckdb_params or {}
+    sources = duckdb_params['sources']
+    con = _connect(duckdb_params)
+
+    sales_files = _partition_files(sales_manifest, sources['sales'])
+    delivery_files = _partition_files(deliveries_manifest, sources['deliveries'])
+    logger.info(
+        "Processing %d sales and %d delivery files with DuckDB", len(sales_files), len(delivery_files)
+    )
+
+    con.register('extractions_sales', sales_files)
+    con.register('extractions_deliveries', delivery_files)
+    keys = ['target_date', 'number_store', 'number_product']
+    _load_raw(con, 'sales', sales_files, SALES_COLUMNS, keys + ['raw_quantity'])
+    _load_raw(con, 'deliveries', delivery_files, DELIVERY_COLUMNS, keys + ['delivery_qty'])
+
+    con.execute(f"CREATE VIEW mapping_product AS SELECT * FROM read_parquet('{sources['mapping_product']}')")
+    con.execute(f"CREATE VIEW mapping_store AS SELECT * FROM read_parquet('{sources['mapping_store']}')")
+    con.register('products', products)
+    con.register('stores', stores)
+    for relation, key in [
+        ('mapping_product', 'number_product'),
+        ('mapping_store', 'number_store'),
+        ('products', 'number_product, valid_from'),
+        ('stores', 'number_store, valid_from'),
+    ]:
+        _check_unique(con, relation, key)
+
+    # same columns, order and types as join_all_data + TypedParquetDataset(schema=primary)
+    con.execute(f"""
+        WITH sales AS ({_latest_extraction('sales', 'raw_quantity')}),
+        deliveries AS ({_latest_extraction('deliveries', 'delivery_qty')}),
+        merged AS (
+            SELECT {KEY_COLUMNS},
+                   greatest(coalesce(raw_quantity, 0), 0) AS sales_qty,
+                   abs(least(coalesce(raw_quantity, 0), 0)) AS return_qty,
+                   coalesce(delivery_qty, 0) AS delivery_qty
+            FROM sales FULL OUTER JOIN deliveries USING ({KEY_COLUMNS})
+        ),
+        product_versions AS ({_effective_versions('products', 'number_product')}),
+        store_versions AS ({_effective_versions('stores', 'number_store')})
+        SELECT
+            m.target_date::DATE AS target_date,
+            m.number_store::INTEGER AS number_store,
+            m.number_product::INTEGER AS number_product,
+            m.sales_qty::FLOAT AS sales_qty,
+            m.return_qty::FLOAT AS return_qty,
+            m.delivery_qty::FLOAT AS delivery_qty,
+            mp.id_product::INTEGER AS id_product,
+            ms.id_store::INTEGER AS id_store,
+            p.product_name::VARCHAR AS product_name,
+            p.product_group::VARCHAR AS product_group,
+            p.price::FLOAT AS price,
+            coalesce(p.moq, 0)::INTEGER AS moq,
+            s.store_name::VARCHAR AS store_name,
+            s.store_address::VARCHAR AS store_address
+        FROM merged m
+        LEFT JOIN mapping_product mp USING (number_product)
+        LEFT JOIN mapping_store ms USING (number_store)
+        -- master data valid on target_date
+        ASOF LEFT JOIN product_versions p
+            ON m.number_product = p.number_product AND m.target_date >= p.effective_from
+        ASOF LEFT JOIN store_versions s
+            ON m.number_store = s.number_store AND m.target_date >= s.effective_from
+    """)
+
+    # streamed into primary_dataset batch by batch, the connection lives as long as the reader
+    reader = con.to_arrow_reader(duckdb_params.get('batch_size', 1_000_000))
+    schema = reader.schema.append(pa.field('stockout', pa.bool_()))
+    batches = (
+        pa.RecordBatch.from_arrays(
+            batch.columns + [pa.array(evaluate_stockout(batch, stockout))], schema=schema
+        )
+        for batch in reader
+    )
+    return ds.Scanner.from_batches(batches, schema=schema)
@@ -0,0 +1,32 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from coding_challenge.pipelines import etl_cosmos
+from .nodes import build_primary_dataset
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    # master data and outputs as in etl_cosmos, sales/deliveries/join run out-of-core in DuckDB
+    cosmos = etl_cosmos.create_pipeline()
+
+    return pipeline(
+        [
+            # Node 1: Dedup sales and deliveries, outer join and dimension lookups in one query,
+            # stockout rules on the streamed batches
+            node(
+                func=build_primary_dataset,
+                inputs=[
+                    "duckdb_sales_manifest",
+                    "duckdb_deliveries_manifest",
+                    "intermediate_products",
+                    "intermediate_stores",
+                    "params:duckdb",
+                    "params:stockout",
+                ],
+                outputs="primary_dataset",
+                name="build_primary_dataset_duckdb",
+            ),
+        ]
+    ) + cosmos.only_nodes(
+        "land_products", "land_stores", "process_products", "process_stores", "create_output_datasets",
+        "create_app_cubes",
+    )
@@ -1,164 +1,325 @@
+import io
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pj
 import logging
-from typing import Dict
-import json
-
-from coding_challenge.utils.transformations import (
-    handle_empty_numeric,
-    calculate_returns_from_sales,
-    aggregate_multiple_deliveries,
-    deduplicate_incremental_data,
-    calculate_stockout_simple,
+from typing import Callable, Dict, Optional, Tuple
+import orjson
+
+from coding_challenge.utils.transformations import aggregate_latest_extraction
+from coding_challenge.utils.joins import join_dimensions
+from coding_challenge.utils.landing import land_partitions, update_landed_sources
+from coding_challenge.utils.partitions import (
+    load_partitions,
+    manifest_lookup,
+    prune_superseded_partitions,
 )
+from coding_challenge.utils.scd import build_versions
+from coding_challenge.utils.stockout import evaluate_stockout
 
 logger = logging.getLogger(__name__)
 
+# numeric strings of the JSON exports, e.g. "12" or "3.5"
+NUMBER_PATTERN = r'^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$'
 
-def process_deliveries_sales_json(json_dict: Dict[str, str]) -> pd.DataFrame:
-    all_records = []
-    
-    for filename, json_content_or_func in json_dict.items():
-        json_content = json_content_or_func() if callable(json_content_or_func) else json_content_or_func
-        
-        if isinstance(json_content, str):
-            data = json.loads(json_content)
-        else:
-            data = json_content
-        
-        parts = filename.replace('.json', '').split('_')
-        extraction_date = pd.to_datetime(f"{parts[-6]}-{parts[-5]}-{parts[-4]}")
-        
-        filialen = data[0]["Filiale"] if isinstance(data, list) else data["Filiale"]
-        
-        for filiale_entry in filialen:
-            datum_str = filiale_entry["Datum"]
-            filial_nummer = int(filiale_entry["FilialNummer"])
-            target_date = pd.to_datetime(datum_str, format="%d/%m/%y")
-            
-            for artikel in filiale_entry["ArtikelHistory"]:
-                record = {
-                    'target_date': target_date,
-                    'number_store': filial_nummer,
-                    'number_product': int(artikel["ArtikelNummer"]),
-                    'delivery_qty': float(artikel["Liefermenge"]),
-                    'sales_qty': float(artikel["Verkaufsmenge"]),
-                    'extraction_date': extraction_date
-                }
-                all_records.append(record)
-    
-    combined = pd.DataFrame(all_records)
-    
-    combined = deduplicate_incremental_data(
-        combined,
-        key_cols=['target_date', 'number_store', 'number_product']
+
+def _json_extraction_date(filename: str) -> pd.Timestamp:
+    parts = filename.replace('.json', '').split('_')
+    return pd.to_datetime(f"{parts[-6]}-{parts[-5]}-{parts[-4]}")
+
+
+def _parse_json(json_content):
+    if isinstance(json_content, (str, bytes)):
+        return orjson.loads(json_content)
+    return json_content
+
+
+def _filialen(data) -> list:
+    return data[0]["Filiale"] if isinstance(data, list) else data["Filiale"]
+
+
+def _json_bytes(json_content) -> bytes:
+    # pyarrow reads JSON objects, an export wrapped in a list is unwrapped first
+    if isinstance(json_content, str):
+        json_content = json_content.encode('utf-8')
+    if isinstance(json_content, bytes) and not json_content.lstrip().startswith(b'['):
+        return json_content
+    data = _parse_json(json_content)
+    return orjson.dumps(data[0] if isinstance(data, list) else data)
+
+
+def _field(struct: pa.Array, name: str) -> pa.Array:
+    # fields that are missing in the whole file are null
+    if pa.types.is_struct(struct.type) and struct.type.get_field_index(name) >= 0:
+        return struct.field(name)
+    return pa.nulls(len(struct))
+
+
+def _numbers(values: pa.Array, dtype: pa.DataType) -> pa.Array:
+    # numeric strings of the export, empty or unparsable values become null
+    if pa.types.is_string(values.type):
+        values = pc.utf8_trim_whitespace(values)
+        values = pc.if_else(
+            pc.match_substring_regex(values, NUMBER_PATTERN), values, pa.scalar(None, pa.string())
+        )
+    return pc.cast(values, dtype)
+
+
+def _identifiers(values: pa.Array, name: str) -> np.ndarray:
+    numbers = _numbers(values, pa.int64())
+    if numbers.null_count:
+        raise ValueError(f"{numbers.null_count} entries without a valid '{name}'")
+    return numbers.to_numpy()
+
+
+def _deliveries_sales_columns(json_content) -> pd.DataFrame:
+    # the file is decoded by the pyarrow JSON reader into nested column arrays, no Python objects per entry
+    json_bytes = _json_bytes(json_content)
+    table = pj.read_json(
+        io.BytesIO(json_bytes),
+        read_options=pj.ReadOptions(block_size=len(json_bytes) + 1),
+        parse_options=pj.ParseOptions(newlines_in_values=True),
     )
+    filialen = pc.list_flatten(table['Filiale']).combine_chunks()
     
-    aggregated = aggregate_multiple_deliveries(
-        combined,
-        group_cols=['target_date', 'number_store', 'number_product'],
-        agg_col='delivery_qty'
-    )
+    history = _field(filialen, 'ArtikelHistory')
+    if not pa.types.is_list(history.type):
+        history = pa.nulls(len(filialen), pa.list_(pa.struct([])))
+    artikel = pc.list_flatten(history)
+    filiale_of_entry = pc.list_parent_indices(history)
     
-    aggregated = aggregated.merge(
-        combined.groupby(['target_date', 'number_store', 'number_product'])['sales_qty'].first(),
-        on=['target_date', 'number_store', 'number_product']
-    )
+    def quantity(name):
+        return _numbers(_field(artikel, name), pa.float64()).to_numpy(zero_copy_only=False)
     
-    aggregated['return_qty'] = 0.0
+    def sale_time(name):
+        # "HH:MM:SS" as the time since midnight, empty or unparsable values become NaT
+        times = pc.strptime(
+            pc.cast(_field(artikel, name), pa.string()), format='%H:%M:%S', unit='ns', error_is_null=True
+        )
+        return pc.subtract(times, pc.floor_temporal(times, unit='day')).to_numpy(zero_copy_only=False)
     
-    return aggregated[['target_date', 'number_store', 'number_product', 'sales_qty', 'return_qty', 'delivery_qty']]
+    target_dates = pc.strptime(
+        pc.cast(_field(filialen, 'Datum'), pa.string()), format='%d/%m/%y', unit='ns'
+    )
+    store_numbers = _identifiers(_field(filialen, 'FilialNummer'), 'FilialNummer')
+    
+    return pd.DataFrame({
+        'target_date': pc.take(target_dates, filiale_of_entry).to_numpy(zero_copy_only=False),
+        'number_store': store_numbers[filiale_of_entry.to_numpy()],
+        'number_product': _identifiers(_field(artikel, 'ArtikelNummer'), 'ArtikelNummer'),
+        'delivery_qty': quantity("Liefermenge"),
+        'sales_qty': quantity("Verkaufsmenge"),
+        'customer_order_qty': quantity("Kundenbestellmenge"),
+        'delivery_number': pd.array(quantity("LieferNummer"), dtype='Int16'),
+        'first_sale_time': sale_time("UhrzeitErsterVk"),
+        'last_sale_time': sale_time("UhrzeitLetzterVk"),
+    })
 
 
-def process_products_json(json_dict: Dict[str, str]) -> pd.DataFrame:
-    all_products = []
+def _product_records(json_content) -> pd.DataFrame:
+    data = _parse_json(json_content)
+    products = data["Artikel"] if "Artikel" in data else data
     
-    for filename, json_content_or_func in json_dict.items():
-        json_content = json_content_or_func() if callable(json_content_or_func) else json_content_or_func
-        
-        if isinstance(json_content, str):
-            data = json.loads(json_content)
-        else:
-            data = json_content
+    records = []
+    for product in products:
+        moq_value = product.get("BestellMindestEinheit", 0)
+        if isinstance(moq_value, str):
+            moq_value = int(float(moq_value)) if moq_value else 0
         
-        parts = filename.replace('.json', '').split('_')
-        extraction_date = pd.to_datetime(f"{parts[-6]}-{parts[-5]}-{parts[-4]}")
-        
-        products = data["Artikel"] if "Artikel" in data else data
-        
-        for product in products:
-            moq_value = product.get("BestellMindestEinheit", 0)
-            if isinstance(moq_value, str):
-                moq_value = int(float(moq_value)) if moq_value else 0
-            
-            record = {
-                'number_product': int(product["ArtikelNummer"]),
-                'product_name': product["ArtikelName"],
-                'moq': int(moq_value),
-                'extraction_date': extraction_date
-            }
-            all_products.append(record)
-    
-    combined = pd.DataFrame(all_products)
-    
-    combined = combined.sort_values('extraction_date').drop_duplicates(
-        subset=['number_product'],
-        keep='last'
+        record = {
+            'number_product': int(product["ArtikelNummer"]),
+            'product_name': product["ArtikelName"],
+            'product_group': product.get("Artikelgruppe"),
+            'moq': int(moq_value),
+        }
+        records.append(record)
+    
+    return pd.DataFrame(records)
+
+
+def _price_records(json_content) -> pd.DataFrame:
+    data = _parse_json(json_content)
+    prices = data["Verkaufspreise"] if "Verkaufspreise" in data else data
+    
+    records = []
+    for price_entry in prices:
+        record = {
+            'number_product': int(price_entry["ArtikelNummer"]),
+            'price': float(price_entry.get("ArtikelPreis", price_entry.get("Artikelpreis", 0)))
+        }
+        records.append(record)
+    
+    return pd.DataFrame(records)
+
+
+def _store_records(json_content) -> pd.DataFrame:
+    data = _parse_json(json_content)
+    stores = data["Filialliste"] if "Filialliste" in data else data
+    
+    records = []
+    for store in stores:
+        record = {
+            'number_store': int(store["FilialNummer"]),
+            'store_name': store["FilialName"],
+            'store_address': store["FilialAnschrift"].replace('\n', ' – ')
+        }
+        records.append(record)
+    
+    return pd.DataFrame(records)
+
+
+def _land(
+    json_dict: Dict[str, str],
+    landed: Optional[dict],
+    preprocess: Callable[[str], pd.DataFrame],
+    ingestion: Optional[dict],
+    partition_loading: Optional[dict],
+    fingerprints: Optional[Dict[str, str]] = None,
+    sources: Optional[Dict[str, str]] = None
+) -> Dict[str, pd.DataFrame]:
+    return land_partitions(
+        json_dict,
+        landed,
+        preprocess=preprocess,
+        full_rebuild=(ingestion or {}).get('full_rebuild', False),
+        fingerprints=fingerprints,
+        sources=sources,
+        **(partition_loading or {})
     )
+
+
+def land_deliveries_sales_json(
+    json_dict: Dict[str, str],
+    landed: Optional[dict],
+    manifest: pd.DataFrame,
+    landed_sources: Optional[Dict[str, str]] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    # files whose content hash differs from the one they were landed from are landed again
+    fingerprints = dict(zip(manifest['partition_id'], manifest['content_hash']))
+    new_landed = _land(
+        json_dict, landed, _deliveries_sales_columns, ingestion, partition_loading,
+        fingerprints, landed_sources
+    )
+    full_rebuild = (ingestion or {}).get('full_rebuild', False)
     
-    return combined[['number_product', 'product_name', 'moq']]
+    return new_landed, update_landed_sources(landed_sources, new_landed, fingerprints, full_rebuild)
+
 
+def land_products_json(
+    json_dict: Dict[str, str],
+    landed: Optional[dict] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Dict[str, pd.DataFrame]:
+    return _land(json_dict, landed, _product_records, ingestion, partition_loading)
 
-def process_prices_json(json_dict: Dict[str, str]) -> pd.DataFrame:
-    all_prices = []
+
+def land_prices_json(
+    json_dict: Dict[str, str],
+    landed: Optional[dict] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Dict[str, pd.DataFrame]:
+    return _land(json_dict, landed, _price_records, ingestion, partition_loading)
+
+
+def land_stores_json(
+    json_dict: Dict[str, str],
+    landed: Optional[dict] = None,
+    ingestion: Optional[dict] = None,
+    partition_loading: Optional[dict] = None
+) -> Dict[str, pd.DataFrame]:
+    return _land(json_dict, landed, _store_records, ingestion, partition_loading)
+
+
+def process_deliveries_sales_json(
+    landed_dict: Dict[str, pd.DataFrame],
+    manifest: pd.DataFrame,
+    partition_loading: Optional[dict] = None
+) -> pd.DataFrame:
+    loaded = load_partitions(
+        prune_superseded_partitions(landed_dict, manifest),
+        manifest_lookup(manifest, 'extraction_date'),
+        **(partition_loading or {})
+    )
+    combined = pd.concat(loaded.values(), ignore_index=True)
     
-    for filename, json_content_or_func in json_dict.items():
-        json_content = json_content_or_func() if callable(json_content_or_func) else json_content_or_func
-        
-        if isinstance(json_content, str):
-            data = json.loads(json_content)
-        else:
-            data = json_content
-        
-        prices = data["Verkaufspreise"] if "Verkaufspreise" in data else data
-        
-        for price_entry in prices:
-            record = {
-                'number_product': int(price_entry["ArtikelNummer"]),
-                'price': float(price_entry.get("ArtikelPreis", price_entry.get("Artikelpreis", 0)))
-            }
-            all_prices.append(record)
+    # latest extraction wins per key, deliveries within that extraction are summed
+    aggregated = aggregate_latest_extraction(
+        combined,
+        key_cols=['target_date', 'number_store', 'number_product'],
+        agg={
+            'sales_qty': ('sales_qty', 'first'),
+            'delivery_qty': ('delivery_qty', 'sum'),
+            'customer_order_qty': ('customer_order_qty', 'first'),
+            'delivery_number': ('delivery_number', 'max'),
+            'first_sale_time': ('first_sale_time', 'min'),
+            'last_sale_time': ('last_sale_time', 'max'),
+        }
+    )
     
-    combined = pd.DataFrame(all_prices)
-    combined = combined.drop_duplicates(subset=['number_product'], keep='last')
+    aggregated['return_qty'] = 0.0
     
-    return combined
+    return aggregated[[
+        'target_date',
+        'number_store',
+        'number_product',
+        'sales_qty',
+        'return_qty',
+        'delivery_qty',
+        'customer_order_qty',
+        'delivery_number',
+        'first_sale_time',
+        'last_sale_time'
+    ]]
 
 
-def process_stores_json(json_dict: Dict[str, str]) -> pd.DataFrame:
-    all_stores = []
+def process_products_json(
+    landed_dict: Dict[str, pd.DataFrame],
+    partition_loading: Optional[dict] = None
+) -> pd.DataFrame:
+    loaded = load_partitions(
+        landed_dict,
+        _json_extraction_date,
+        **(partition_loading or {})
+    )
+    combined = pd.concat(loaded.values(), ignore_index=True)
+    # files landed before the product group was kept have none
+    combined['product_group'] = combined.get('product_group')
     
-    for filename, json_content_or_func in json_dict.items():
-        json_content = json_content_or_func() if callable(json_content_or_func) else json_content_or_func
-        
-        if isinstance(json_content, str):
-            data = json.loads(json_content)
-        else:
-            data = json_content
-        
-        stores = data["Filialliste"] if "Filialliste" in data else data
-        
-        for store in stores:
-            record = {
-                'number_store': int(store["FilialNummer"]),
-                'store_name': store["FilialName"],
-                'store_address': store["FilialAnschrift"].replace('\n', ' – ')
-            }
-            all_stores.append(record)
+    return build_versions(combined, ['number_product'], ['product_name', 'product_group', 'moq'])
+
+
+def process_prices_json(
+    landed_dict: Dict[str, pd.DataFrame],
+    partition_loading: Optional[dict] = None
+) -> pd.DataFrame:
+    loaded = load_partitions(
+        landed_dict,
+        _json_extraction_date,
+        **(partition_loading or {})
+    )
+    combined = pd.concat(loaded.values(), ignore_index=True)
     
-    combined = pd.DataFrame(all_stores)
-    combined = combined.drop_duplicates(subset=['number_store'], keep='last')
+    return build_versions(combined, ['number_product'], ['price'])
+
+
+def process_stores_json(
+    landed_dict: Dict[str, pd.DataFrame],
+    partition_loading: Optional[dict] = None
+) -> pd.DataFrame:
+    loaded = load_partitions(
+        landed_dict,
+        _json_extraction_date,
+        **(partition_loading or {})
+    )
+    combined = pd.concat(loaded.values(), ignore_index=True)
     
-    return combined
+    return build_versions(combined, ['number_store'], ['store_name', 'store_address'])
 
 
 def join_galaxy_data(
@@ -167,48 +328,17 @@ def join_galaxy_data(
     prices: pd.DataFrame,
     stores: pd.DataFrame,
     mapping_product: pd.DataFrame,
-    mapping_store: pd.DataFrame
+    mapping_store: pd.DataFrame,
+    stockout: Optional[dict] = None
 ) -> pd.DataFrame:
-    merged = sales_deliveries.copy()
+    merged = join_dimensions(sales_deliveries, [
+        (mapping_product, 'number_product'),
+        (mapping_store, 'number_store'),
+        (products, 'number_product'),
+        (prices, 'number_product'),
+        (stores, 'number_store'),
+    ])
     
-    merged = merged.merge(mapping_product, on='number_product', how='left')
-    merged = merged.merge(mapping_store, on='number_store', how='left')
-    merged = merged.merge(products, on='number_product', how='left')
-    merged = merged.merge(prices, on='number_product', how='left')
-    merged = merged.merge(stores, on='number_store', how='left')
-    
-    merged['stockout'] = calculate_stockout_simple(
-        merged['sales_qty'],
-        merged['delivery_qty']
-    )
+    merged['stockout'] = evaluate_stockout(merged, stockout)
     
     return merged
-
-
-def create_ml_dataset(df: pd.DataFrame) -> pd.DataFrame:
-    return df[[
-        'id_product',
-        'id_store',
-        'target_date',
-        'sales_qty',
-        'stockout'
-    ]].copy()
-
-
-def create_app_dataset(df: pd.DataFrame) -> pd.DataFrame:
-    return df[[
-        'id_product',
-        'id_store',
-        'target_date',
-        'sales_qty',
-        'return_qty',
-        'delivery_qty',
-        'stockout',
-        'price',
-        'product_name',
-        'number_product',
-        'moq',
-        'number_store',
-        'store_name',
-        'store_address'
-    ]].copy()
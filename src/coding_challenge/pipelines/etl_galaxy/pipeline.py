@@ -1,13 +1,17 @@
 
 from kedro.pipeline import Pipeline, node
+from coding_challenge.utils.outputs import create_app_cubes, create_output_datasets
+
 from .nodes import (
+    land_deliveries_sales_json,
+    land_products_json,
+    land_prices_json,
+    land_stores_json,
     process_deliveries_sales_json,
     process_products_json,
     process_prices_json,
     process_stores_json,
     join_galaxy_data,
-    create_ml_dataset,
-    create_app_dataset,
 )
 
 
@@ -15,33 +19,91 @@ def create_pipeline(**kwargs) -> Pipeline:
 
     return Pipeline(
         [
+            # Landing: new and changed JSON files flattened once into Parquet with canonical column names
+            node(
+                func=land_deliveries_sales_json,
+                inputs=[
+                    "raw_deliveries_sales",
+                    "galaxy_previous_landed_deliveries_sales",
+                    "deliveries_sales_manifest",
+                    "galaxy_previous_landed_deliveries_sales_sources",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs=["galaxy_landed_deliveries_sales", "galaxy_landed_deliveries_sales_sources"],
+                name="land_deliveries_sales_json",
+                tags=["landing"],
+            ),
+            node(
+                func=land_products_json,
+                inputs=[
+                    "raw_products",
+                    "galaxy_previous_landed_products",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs="galaxy_landed_products",
+                name="land_products_json",
+                tags=["landing"],
+            ),
+            node(
+                func=land_prices_json,
+                inputs=[
+                    "raw_prices",
+                    "galaxy_previous_landed_prices",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs="galaxy_landed_prices",
+                name="land_prices_json",
+                tags=["landing"],
+            ),
+            node(
+                func=land_stores_json,
+                inputs=[
+                    "raw_stores",
+                    "galaxy_previous_landed_stores",
+                    "params:ingestion",
+                    "params:partition_loading",
+                ],
+                outputs="galaxy_landed_stores",
+                name="land_stores_json",
+                tags=["landing"],
+            ),
             # Node 1: Process deliveries & sales JSON (nested structure)
             node(
                 func=process_deliveries_sales_json,
-                inputs="raw_deliveries_sales",
+                inputs=[
+                    "galaxy_landed_deliveries_sales",
+                    "deliveries_sales_manifest",
+                    "params:partition_loading",
+                ],
                 outputs="galaxy_intermediate_sales_deliveries",
                 name="process_deliveries_sales_json",
             ),
             # Node 2: Process product master JSON
             node(
                 func=process_products_json,
-                inputs="raw_products",
+                inputs=["galaxy_landed_products", "params:partition_loading"],
                 outputs="galaxy_intermediate_products",
                 name="process_products_json",
+                tags=["cacheable"],
             ),
             # Node 3: Process price JSON
             node(
                 func=process_prices_json,
-                inputs="raw_prices",
+                inputs=["galaxy_landed_prices", "params:partition_loading"],
                 outputs="galaxy_intermediate_prices",
                 name="process_prices_json",
+                tags=["cacheable"],
             ),
             # Node 4: Process store master JSON
             node(
                 func=process_stores_json,
-                inputs="raw_stores",
+                inputs=["galaxy_landed_stores", "params:partition_loading"],
                 outputs="galaxy_intermediate_stores",
                 name="process_stores_json",
+                tags=["cacheable"],
             ),
             # Node 5: Join all data sources + apply ID mappings
             node(
@@ -53,23 +115,41 @@ def create_pipeline(**kwargs) -> Pipeline:
                     "galaxy_intermediate_stores",
                     "mapping_product",
                     "mapping_store",
+                    "params:stockout",
                 ],
                 outputs="galaxy_primary_dataset",
                 name="join_galaxy_data",
             ),
-            # Node 6: Create ML dataset (minimal fields)
+            # Node 6: Create ML (minimal fields) and App (facts + dimensions) datasets from one read
             node(
-                func=create_ml_dataset,
-                inputs="galaxy_primary_dataset",
-                outputs="galaxy_ml_dataset",
-                name="galaxy_create_ml_dataset",
+                func=create_output_datasets,
+                inputs=[
+                    "galaxy_primary_dataset",
+                    "galaxy_intermediate_products",
+                    "galaxy_intermediate_stores",
+                    "params:ml_grid",
+                ],
+                outputs=[
+                    "galaxy_ml_dataset",
+                    "galaxy_app_dataset",
+                    "galaxy_app_products",
+                    "galaxy_app_stores",
+                    "galaxy_app_series",
+                ],
+                name="galaxy_create_output_datasets",
             ),
-            # Node 7: Create App dataset (all fields)
+            # Node 7: Weekly/monthly rollups for the app dashboards, changed periods only
             node(
-                func=create_app_dataset,
-                inputs="galaxy_primary_dataset",
-                outputs="galaxy_app_dataset",
-                name="galaxy_create_app_dataset",
+                func=create_app_cubes,
+                inputs=[
+                    "galaxy_primary_dataset",
+                    "galaxy_primary_fingerprints",
+                    "galaxy_previous_app_cube_sources",
+                    "galaxy_previous_app_weekly_cube",
+                    "galaxy_previous_app_monthly_cube",
+                ],
+                outputs=["galaxy_app_weekly_cube", "galaxy_app_monthly_cube", "galaxy_app_cube_sources"],
+                name="galaxy_create_app_cubes",
             ),
         ]
     )
@@ -0,0 +1,4 @@
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
@@ -0,0 +1,14 @@
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from coding_challenge.utils.features import feature_table
+
+
+def create_ml_features(ml: pa.Table, ml_features: dict) -> ds.Scanner:
+    # lags and trailing windows per store/product, sorted once and written in store chunks
+    return feature_table(
+        ml,
+        lags=ml_features.get('lags', []),
+        windows=ml_features.get('windows', []),
+        memory_budget_mb=ml_features.get('memory_budget_mb', 512),
+    )
@@ -0,0 +1,18 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import create_ml_features
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    # optional stage after the ERP pipelines, see register_pipelines
+    return pipeline(
+        [
+            # Node 1: Lag, rolling and stockout-adjusted demand features of the ML panel
+            node(
+                func=create_ml_features,
+                inputs=["ml_dataset", "params:ml_features"],
+                outputs="ml_features",
+                name="create_ml_features",
+            ),
+        ]
+    )
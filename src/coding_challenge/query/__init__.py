@@ -0,0 +1,19 @@
+"""Low-latency lookups of the daily app series of one (id_store, id_product) and wide
+views of the app star schema."""
+
+from .app_view import app_wide_view, read_app_view
+from .series_store import (
+    SERIES_COLUMNS,
+    SeriesStore,
+    build_series_index,
+    write_series_index,
+)
+
+__all__ = [
+    "SERIES_COLUMNS",
+    "SeriesStore",
+    "app_wide_view",
+    "build_series_index",
+    "read_app_view",
+    "write_series_index",
+]
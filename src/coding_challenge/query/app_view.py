@@ -0,0 +1,43 @@
+"""Wide rows of the app star schema, with the columns of the former denormalized app table.
+
+The app output of a customer is a narrow fact table ``app_dataset`` (ids, date, quantities,
+stockout, price, ``number_product``/``number_store``) and the versioned dimensions
+``app_products.parquet`` and ``app_stores.parquet`` with the names, moq and addresses.
+``read_app_view`` reads only the facts matching ``filters`` and joins the dimension
+versions valid on their ``target_date``::
+
+    read_app_view(
+        f"{BASE_DATA_PATH}/customer_1001/03_primary",
+        filters=[("id_store", "=", 100190001), ("id_product", "=", 10010001)],
+    )
+"""
+import os
+from typing import Any, List, Optional, Tuple
+
+import pandas as pd
+
+from coding_challenge.utils.joins import join_dimensions
+from coding_challenge.utils.schema import TABLES
+
+APP_DATASET = 'app_dataset'
+APP_PRODUCTS = 'app_products.parquet'
+APP_STORES = 'app_stores.parquet'
+
+
+def app_wide_view(app: pd.DataFrame, products: pd.DataFrame, stores: pd.DataFrame) -> pd.DataFrame:
+    """Joins the product and store versions onto the app facts.
+
+    The columns of the primary dataset come first, other columns of ``app`` (e.g. the hive
+    partition columns) follow.
+    """
+    wide = join_dimensions(app, [(products, 'number_product'), (stores, 'number_store')])
+    columns = TABLES['primary'] + [col for col in wide.columns if col not in TABLES['primary']]
+    return wide[columns]
+
+
+def read_app_view(path: str, filters: Optional[List[Tuple[str, str, Any]]] = None) -> pd.DataFrame:
+    """Wide app rows of the ``03_primary`` directory ``path`` matching the parquet ``filters``."""
+    app = pd.read_parquet(os.path.join(path, APP_DATASET), filters=filters)
+    products = pd.read_parquet(os.path.join(path, APP_PRODUCTS))
+    stores = pd.read_parquet(os.path.join(path, APP_STORES))
+    return app_wide_view(app, products, stores)
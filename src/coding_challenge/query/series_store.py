@@ -0,0 +1,169 @@
+"""Persisted (id_store, id_product) -> row range index over the app dataset.
+
+``build_series_index`` sorts the daily columns of the app dataset by store, product
+and date and records the row range of every series. ``SeriesStore`` memory-maps the
+written ``.npy`` columns, so opening a store and looking up a series only touches the
+pages of that series, independent of the size of the dataset::
+
+    store = SeriesStore([
+        f"{BASE_DATA_PATH}/customer_{customer}/03_primary/app_series"
+        for customer in ["1001", "1002", "1003"]
+    ])
+    store.series(100190001, 10010001, start="2024-01-01", end="2024-01-31")
+"""
+import os
+import shutil
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+SERIES_COLUMNS = ['target_date', 'sales_qty', 'return_qty', 'delivery_qty', 'stockout', 'price']
+
+INDEX_DTYPE = np.dtype([
+    ('id_store', np.int64),
+    ('id_product', np.int64),
+    ('start', np.int64),
+    ('stop', np.int64),
+])
+
+INDEX_FILE = 'index.npy'
+CURRENT_FILE = 'CURRENT'
+VERSION_FORMAT = '%Y-%m-%dT%H.%M.%S.%fZ'
+
+
+def build_series_index(app: Union[pd.DataFrame, pa.Table]) -> Dict[str, np.ndarray]:
+    """Returns the sorted series columns and the row range of every series.
+
+    Rows without an ``id_store`` or ``id_product`` cannot be looked up and are left out.
+    """
+    if isinstance(app, pa.Table):
+        app = app.select(['id_store', 'id_product'] + SERIES_COLUMNS).to_pandas(date_as_object=False)
+
+    app = app[app['id_store'].notna() & app['id_product'].notna()]
+
+    id_store = app['id_store'].to_numpy(dtype=np.int64)
+    id_product = app['id_product'].to_numpy(dtype=np.int64)
+    target_date = app['target_date'].to_numpy(dtype='datetime64[D]')
+
+    order = np.lexsort((target_date, id_product, id_store))
+    id_store, id_product = id_store[order], id_product[order]
+
+    starts = np.flatnonzero(
+        np.r_[True, (id_store[1:] != id_store[:-1]) | (id_product[1:] != id_product[:-1])]
+    )
+    index = np.empty(len(starts), dtype=INDEX_DTYPE)
+    index['id_store'] = id_store[starts]
+    index['id_product'] = id_product[starts]
+    index['start'] = starts
+    index['stop'] = np.r_[starts[1:], len(order)]
+
+    arrays = {'index': index, 'target_date': target_date[order]}
+    for col in SERIES_COLUMNS[1:]:
+        if col == 'stockout':
+            values = app[col].to_numpy(dtype=bool)
+        else:
+            values = app[col].to_numpy(dtype=np.float32, na_value=np.nan)
+        arrays[col] = values[order]
+    return arrays
+
+
+def write_series_index(arrays: Dict[str, np.ndarray], path: str) -> None:
+    """Writes the columns as ``.npy`` files of a new version directory under ``path``.
+
+    The ``CURRENT`` file of ``path`` names the version that is read. It is replaced once the
+    new version is complete, so readers never map a truncated or mixed index. Stores opened
+    before keep mapping the files of their version; on Windows mapped files cannot be deleted,
+    so such versions are left behind and removed by a later write.
+    """
+    version = datetime.now(tz=timezone.utc).strftime(VERSION_FORMAT)
+    os.makedirs(os.path.join(path, version))
+    try:
+        for column, values in arrays.items():
+            np.save(os.path.join(path, version, f'{column}.npy'), values, allow_pickle=False)
+    except BaseException:
+        shutil.rmtree(os.path.join(path, version), ignore_errors=True)
+        raise
+
+    pointer = os.path.join(path, CURRENT_FILE)
+    with open(f'{pointer}.tmp', 'w', encoding='utf-8') as file:
+        file.write(version)
+    os.replace(f'{pointer}.tmp', pointer)
+
+    for entry in os.scandir(path):
+        if entry.is_dir() and entry.name != version:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def current_version(path: str) -> str:
+    """The directory of the version of ``path`` named by its ``CURRENT`` file."""
+    with open(os.path.join(path, CURRENT_FILE), encoding='utf-8') as file:
+        return os.path.join(path, file.read().strip())
+
+
+class SeriesStore:
+    """Memory-mapped series of one or more ``app_series`` directories.
+
+    Series are served as DataFrames indexed by ``target_date``; the ``cache_size`` most
+    recently used ones are kept in memory. Returned frames are shared with the cache and
+    must not be modified in place.
+    """
+
+    def __init__(self, paths: Union[str, Iterable[str]], cache_size: int = 256):
+        paths = [paths] if isinstance(paths, (str, os.PathLike)) else list(paths)
+
+        self._columns = []
+        self._ranges: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+        for part, path in enumerate(paths):
+            path = current_version(path)
+            self._columns.append({
+                col: np.load(os.path.join(path, f'{col}.npy'), mmap_mode='r')
+                for col in SERIES_COLUMNS
+            })
+            index = np.load(os.path.join(path, INDEX_FILE))
+            self._ranges.update(zip(
+                zip(index['id_store'].tolist(), index['id_product'].tolist()),
+                zip([part] * len(index), index['start'].tolist(), index['stop'].tolist()),
+            ))
+
+        self._cache_size = cache_size
+        self._cache: 'OrderedDict[Tuple[int, int], pd.DataFrame]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self._ranges
+
+    def keys(self) -> Iterable[Tuple[int, int]]:
+        return self._ranges.keys()
+
+    def _read(self, key: Tuple[int, int]) -> pd.DataFrame:
+        part, start, stop = self._ranges[key]
+        columns = self._columns[part]
+        return pd.DataFrame(
+            {col: np.array(columns[col][start:stop]) for col in SERIES_COLUMNS[1:]},
+            index=pd.DatetimeIndex(np.array(columns['target_date'][start:stop]), name='target_date'),
+        )
+
+    def series(self, id_store: int, id_product: int, start=None, end=None) -> pd.DataFrame:
+        """Daily series of one store/product, optionally sliced to ``[start, end]``.
+
+        Raises ``KeyError`` if the store/product has no rows.
+        """
+        key = (int(id_store), int(id_product))
+        df = self._cache.get(key)
+        if df is None:
+            df = self._read(key)
+            self._cache[key] = df
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+
+        if start is None and end is None:
+            return df
+        return df.loc[start:end]
@@ -0,0 +1,149 @@
+"""``CachingSequentialRunner`` skips nodes whose inputs and code did not change.
+
+Nodes tagged ``cacheable`` are fingerprinted before they run: the ``fingerprint`` of every
+input dataset (path, size and modification time of its partitions), the values of ``params:``
+inputs and the source of the node's module and of ``coding_challenge.utils``. When an
+earlier run stored outputs under the same fingerprint they are returned instead of
+executing the node; otherwise the node runs and its outputs are stored. The cache is
+kept below ``max_size_mb`` by evicting the least recently used entries.
+
+The cache is configured by the ``node_cache`` parameters::
+
+    node_cache:
+      enabled: true
+      path: ${filepath_prefix}/05_node_cache
+      max_size_mb: 512
+
+and used with ``kedro run --runner coding_challenge.runner.CachingSequentialRunner``
+(``python -m coding_challenge run-customers`` always uses it).
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+from copy import copy
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from kedro.io import DataCatalog
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+from kedro.runner import SequentialRunner
+
+import coding_challenge.utils
+
+logger = logging.getLogger(__name__)
+
+CACHE_TAG = "cacheable"
+CACHE_PARAMETERS = "params:node_cache"
+
+
+def _hash(*parts: Any) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def code_version(func: Callable) -> str:
+    """Hash of the source of the module defining ``func`` and of the shared utils."""
+    module = __import__(func.__module__, fromlist=["_"])
+    paths = [Path(module.__file__)] + sorted(Path(coding_challenge.utils.__file__).parent.glob("*.py"))
+    return _hash(*(path.read_bytes() for path in paths))
+
+
+def dataset_fingerprint(catalog: DataCatalog, name: str) -> Optional[str]:
+    """Fingerprint of a node input, ``None`` if it cannot be fingerprinted cheaply.
+
+    Datasets are fingerprinted by their ``fingerprint`` method, e.g. the one of
+    ``coding_challenge.extras.datasets.FingerprintedPartitionedDataset``.
+    """
+    if name.startswith("params:") or name == "parameters":
+        return _hash(json.dumps(catalog.load(name), sort_keys=True, default=str))
+
+    fingerprint = getattr(getattr(catalog.datasets, name, None), "fingerprint", None)
+    return fingerprint() if fingerprint is not None else None
+
+
+class NodeCache:
+    def __init__(self, path: str, max_size_mb: float = 512):
+        self._path = Path(path)
+        self._max_bytes = int(max_size_mb * 1024 ** 2)
+
+    def _entry(self, fingerprint: str) -> Path:
+        return self._path / f"{fingerprint}.pkl"
+
+    def get(self, fingerprint: str) -> Any:
+        """Cached outputs, raises ``KeyError`` on a miss."""
+        entry = self._entry(fingerprint)
+        try:
+            with entry.open("rb") as f:
+                outputs = pickle.load(f)
+        except FileNotFoundError:
+            raise KeyError(fingerprint) from None
+        os.utime(entry)  # mark as recently used
+        return outputs
+
+    def put(self, fingerprint: str, outputs: Any) -> None:
+        self._path.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(fingerprint)
+        temporary = entry.with_suffix(".tmp")
+        with temporary.open("wb") as f:
+            pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+        temporary.replace(entry)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = sorted(self._path.glob("*.pkl"), key=lambda entry: entry.stat().st_mtime, reverse=True)
+        total = 0
+        for entry in entries:
+            total += entry.stat().st_size
+            if total > self._max_bytes:
+                logger.info("Evicting node cache entry %s", entry.name)
+                entry.unlink()
+
+
+def cached_node(node: Node, catalog: DataCatalog, cache: NodeCache) -> Node:
+    version = code_version(node.func)
+
+    @wraps(node.func)
+    def func(*args, **kwargs):
+        fingerprints = [dataset_fingerprint(catalog, name) for name in node.inputs]
+        if None in fingerprints:
+            return node.func(*args, **kwargs)
+
+        fingerprint = _hash(node.name, version, *fingerprints)
+        try:
+            outputs = cache.get(fingerprint)
+        except KeyError:
+            outputs = node.func(*args, **kwargs)
+            cache.put(fingerprint, outputs)
+            return outputs
+
+        logger.info("Inputs of node '%s' are unchanged, reusing its cached outputs", node.name)
+        return outputs
+
+    cached = copy(node)
+    cached.func = func
+    return cached
+
+
+class CachingSequentialRunner(SequentialRunner):
+    def run(
+        self,
+        pipeline: Pipeline,
+        catalog: DataCatalog,
+        hook_manager=None,
+        session_id: str = None,
+    ) -> Dict[str, Any]:
+        config = catalog.load(CACHE_PARAMETERS) if CACHE_PARAMETERS in catalog.list() else {}
+        if config.get("enabled", False):
+            cache = NodeCache(config["path"], config.get("max_size_mb", 512))
+            pipeline = Pipeline([
+                cached_node(node, catalog, cache) if CACHE_TAG in node.tags else node
+                for node in pipeline.nodes
+            ])
+        return super().run(pipeline, catalog, hook_manager, session_id)
@@ -3,9 +3,8 @@ from the Kedro defaults. For further information, including these default values
 https://kedro.readthedocs.io/en/stable/kedro_project_setup/settings.html."""
 
 # Instantiated project hooks.
-# For example, after creating a hooks.py and defining a ProjectHooks class there, do
-# from coding_challenge.hooks import ProjectHooks
-# HOOKS = (ProjectHooks(),)
+from coding_challenge.hooks import CheckpointHooks, PerformanceHooks
+HOOKS = (CheckpointHooks(), PerformanceHooks())
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
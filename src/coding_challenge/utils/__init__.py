@@ -5,13 +5,22 @@ from .transformations import (
     calculate_returns_from_sales,
     aggregate_multiple_deliveries,
     deduplicate_incremental_data,
+    aggregate_latest_extraction,
+    merge_incremental_state,
     calculate_stockout_simple,
 )
+from .joins import join_dimensions
+from .stockout import evaluate_stockout, stockout_rule
 
 __all__ = [
     "handle_empty_numeric",
     "calculate_returns_from_sales",
     "aggregate_multiple_deliveries",
     "deduplicate_incremental_data",
+    "aggregate_latest_extraction",
+    "merge_incremental_state",
     "calculate_stockout_simple",
+    "join_dimensions",
+    "evaluate_stockout",
+    "stockout_rule",
 ]
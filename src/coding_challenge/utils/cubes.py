@@ -0,0 +1,107 @@
+"""Weekly and monthly rollups of the daily app facts per store, product group and product."""
+
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .schema import cast_to_schema
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ['week', 'month']
+
+CUBE_KEYS = ['period_start', 'id_store', 'product_group', 'id_product']
+MEASURES = ['sales_qty', 'return_qty', 'delivery_qty', 'stockout_days', 'days']
+
+DAILY_COLUMNS = [
+    'target_date', 'id_store', 'product_group', 'id_product',
+    'sales_qty', 'return_qty', 'delivery_qty', 'stockout',
+]
+
+
+def period_start(dates: np.ndarray, period: str) -> np.ndarray:
+    """First day (``datetime64[D]``) of the ISO week (Monday) or month of every date."""
+    days = dates.astype('datetime64[D]')
+    if period == 'week':
+        # 1970-01-01 was a Thursday
+        return days - (days.astype(np.int64) + 3) % 7
+    if period == 'month':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f"Unknown period '{period}', expected one of {PERIODS}")
+
+
+def rollup_cube(daily: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Sums of the daily facts per period, store, product group and product, plus one
+    total row per period, store and product group with an empty ``id_product``.
+
+    ``stockout_days`` counts the days with a stockout, ``days`` the daily rows. Rows
+    without an ``id_store`` or ``id_product`` are left out, as in the series index.
+    """
+    daily = daily[daily['id_store'].notna() & daily['id_product'].notna()]
+    keyed = pd.DataFrame({
+        'period_start': period_start(daily['target_date'].to_numpy(), period),
+        'id_store': daily['id_store'].array,
+        'product_group': daily['product_group'].array,
+        'id_product': daily['id_product'].array,
+        'sales_qty': daily['sales_qty'].array,
+        'return_qty': daily['return_qty'].array,
+        'delivery_qty': daily['delivery_qty'].array,
+        'stockout_days': daily['stockout'].to_numpy(dtype=np.int32),
+        'days': np.ones(len(daily), dtype=np.int32),
+    })
+
+    by_product = keyed.groupby(CUBE_KEYS, observed=True, dropna=False, sort=False)[MEASURES].sum()
+    by_group = by_product.groupby(level=CUBE_KEYS[:-1], observed=True, dropna=False, sort=False).sum()
+    by_group = by_group.assign(id_product=pd.NA).set_index('id_product', append=True)
+
+    cube = pd.concat([by_product, by_group]).reset_index()
+    cube['id_product'] = cube['id_product'].astype('Int32')
+    return cube
+
+
+def update_cubes(
+    primary: pa.Table,
+    fingerprints: Dict[str, str],
+    sources: Optional[Dict[str, str]] = None,
+    previous: Optional[Dict[str, Optional[pd.DataFrame]]] = None
+) -> Dict[str, pd.DataFrame]:
+    """Brings the cube of every period in ``PERIODS`` up to date with ``primary``.
+
+    ``fingerprints`` are the per-day fingerprints of the primary dataset (see
+    ``UpsertParquetDataset``) and ``sources`` the ones the ``previous`` cubes were built
+    from. Only the periods containing a day whose fingerprint changed or that was removed
+    are aggregated again and replace their rows in the previous cube; the product group is
+    the one on ``target_date`` in the primary rows, so regrouped products change the
+    fingerprints of their days as well. Without sources or previous cubes all periods are built.
+    """
+    previous = previous or {}
+    rebuild = not sources or any(previous.get(period) is None for period in PERIODS)
+    changed = [day for day, fingerprint in fingerprints.items() if rebuild or sources.get(day) != fingerprint]
+    # days removed from the primary dataset change their periods as well
+    removed = [] if rebuild else [day for day in sources if day not in fingerprints]
+    stale_days = np.array(changed + removed, dtype='datetime64[D]')
+    dates = primary['target_date'].to_numpy().astype('datetime64[D]')
+
+    cubes = {}
+    for period in PERIODS:
+        stale_periods = np.unique(period_start(stale_days, period))
+        rows = np.isin(period_start(dates, period), stale_periods)
+        daily = primary.filter(pa.array(rows)).select(DAILY_COLUMNS).to_pandas(date_as_object=False)
+        fresh = rollup_cube(cast_to_schema(daily, 'primary', validate=False), period)
+
+        if rebuild:
+            cubes[period] = fresh
+        elif len(stale_periods):
+            kept = previous[period][~previous[period]['period_start'].isin(stale_periods)]
+            cubes[period] = pd.concat([kept, fresh], ignore_index=True)
+        else:
+            cubes[period] = previous[period]
+        logger.info(
+            "Rolled up %d of %d %ss from %d changed days",
+            len(stale_periods), cubes[period]['period_start'].nunique(), period, len(stale_days)
+        )
+
+    return cubes
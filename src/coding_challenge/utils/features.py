@@ -0,0 +1,137 @@
+"""Lag and rolling-window features of the dense ML panel, computed on flat sorted arrays."""
+
+import logging
+from typing import Dict, Iterator, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .grid import BYTES_PER_ROW, iter_dense_panel
+
+logger = logging.getLogger(__name__)
+
+FEATURE_KEYS = ['id_product', 'id_store', 'target_date']
+
+# float32 per feature column and row, plus the float64 prefix sums of the windows
+BYTES_PER_FEATURE = 4
+BYTES_PER_WINDOW_ROW = 3 * 8
+
+
+def feature_names(lags: Sequence[int], windows: Sequence[int]) -> list:
+    names = [f'sales_lag_{lag}' for lag in lags]
+    for window in windows:
+        names += [
+            f'sales_sum_{window}', f'sales_mean_{window}',
+            f'stockout_days_{window}', f'demand_mean_{window}',
+        ]
+    return names
+
+
+def _prefix_sum(values: np.ndarray) -> np.ndarray:
+    """``out[i]`` is the sum of ``values[:i]``."""
+    return np.r_[0.0, np.cumsum(values, dtype=np.float64)]
+
+
+def _trailing(prefix: np.ndarray, position: np.ndarray, window: int) -> np.ndarray:
+    """Sum of the ``window`` rows before every row, NaN where they reach into the previous series."""
+    rows = np.arange(len(position))
+    start = np.maximum(rows - window, 0)
+    return np.where(position >= window, prefix[rows] - prefix[start], np.nan)
+
+
+def series_features(
+    sales: np.ndarray,
+    stockout: np.ndarray,
+    position: np.ndarray,
+    lags: Sequence[int],
+    windows: Sequence[int]
+) -> Dict[str, np.ndarray]:
+    """Features of rows sorted by series and day, ``position`` is the day within the series.
+
+    Lags are the sales ``lag`` days before. A window covers the ``window`` days before the
+    row (not the row itself) and is NaN until the series has that many days; its
+    ``demand_mean`` is the mean sales of the days without stockout, as the sales of stockout
+    days understate the demand. Series boundaries are respected by masking, so every
+    feature is a shift or a difference of prefix sums over the whole array.
+    """
+    features = {}
+    for lag in lags:
+        shifted = np.full(len(sales), np.nan, dtype=np.float32)
+        shifted[lag:] = sales[:len(sales) - lag]
+        shifted[position < lag] = np.nan
+        features[f'sales_lag_{lag}'] = shifted
+
+    if windows:
+        available = ~stockout
+        sales_prefix = _prefix_sum(sales)
+        stockout_prefix = _prefix_sum(stockout)
+        demand_prefix = _prefix_sum(np.where(available, sales, 0))
+
+    for window in windows:
+        total = _trailing(sales_prefix, position, window)
+        stockout_days = _trailing(stockout_prefix, position, window)
+        available_days = window - stockout_days
+        with np.errstate(invalid='ignore', divide='ignore'):
+            demand = _trailing(demand_prefix, position, window) / available_days
+        features[f'sales_sum_{window}'] = total.astype(np.float32)
+        features[f'sales_mean_{window}'] = (total / window).astype(np.float32)
+        features[f'stockout_days_{window}'] = stockout_days.astype(np.float32)
+        features[f'demand_mean_{window}'] = np.where(available_days > 0, demand, np.nan).astype(np.float32)
+    return features
+
+
+def iter_feature_table(
+    table: pa.Table,
+    lags: Sequence[int],
+    windows: Sequence[int],
+    memory_budget_mb: float = 512
+) -> Iterator[pa.Table]:
+    """Yields the keys, ``sales_qty``, ``stockout`` and the features of the dense panel of
+    ``table`` (see ``iter_dense_panel``) in chunks of whole stores, sorted by store,
+    product and date."""
+    n_features = len(feature_names(lags, windows))
+    row_bytes = BYTES_PER_ROW + n_features * BYTES_PER_FEATURE + (BYTES_PER_WINDOW_ROW if windows else 0)
+    # the panel budget is in its own bytes per row, leave room for the features
+    panel_budget_mb = memory_budget_mb * BYTES_PER_ROW / row_bytes
+
+    for chunk in iter_dense_panel(table, panel_budget_mb):
+        store = chunk['id_store'].to_numpy()
+        product = chunk['id_product'].to_numpy()
+        starts = np.r_[0, np.flatnonzero((store[1:] != store[:-1]) | (product[1:] != product[:-1])) + 1]
+        lengths = np.diff(np.r_[starts, len(chunk)])
+        position = np.arange(len(chunk)) - np.repeat(starts, lengths)
+
+        features = series_features(
+            chunk['sales_qty'].to_numpy(), chunk['stockout'].to_numpy(zero_copy_only=False),
+            position, lags, windows,
+        )
+        for name, values in features.items():
+            chunk = chunk.append_column(name, pa.array(values, from_pandas=True))
+        yield chunk
+
+
+def feature_table(
+    table: pa.Table,
+    lags: Sequence[int],
+    windows: Sequence[int],
+    memory_budget_mb: float = 512
+) -> ds.Scanner:
+    """``iter_feature_table`` as a scanner that datasets write chunk by chunk."""
+    schema = pa.schema(
+        [
+            ('id_product', pa.int32()),
+            ('id_store', pa.int32()),
+            ('target_date', pa.date32()),
+            ('sales_qty', pa.float32()),
+            ('stockout', pa.bool_()),
+        ]
+        + [(name, pa.float32()) for name in feature_names(lags, windows)]
+    )
+    logger.info("Computing %d ML features", len(schema) - 5)
+    batches = (
+        batch
+        for chunk in iter_feature_table(table, lags, windows, memory_budget_mb)
+        for batch in chunk.cast(schema).to_batches()
+    )
+    return ds.Scanner.from_batches(batches, schema=schema)
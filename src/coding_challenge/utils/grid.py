@@ -0,0 +1,126 @@
+"""Dense product x store x day panel of the ML table, expanded in store chunks."""
+
+import logging
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+logger = logging.getLogger(__name__)
+
+ML_COLUMNS = ['id_product', 'id_store', 'target_date', 'sales_qty', 'stockout']
+
+# memory per panel row while a chunk is expanded and written: the output columns (17 B),
+# the int32 day/position temporaries and the sorted copy + month labels of the writer
+BYTES_PER_ROW = 64
+
+
+def _listings(store: np.ndarray, product: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """First and end (exclusive) row of every store/product in rows sorted by store, product."""
+    changes = np.flatnonzero((store[1:] != store[:-1]) | (product[1:] != product[:-1])) + 1
+    return np.r_[0, changes], np.r_[changes, len(store)]
+
+
+def store_chunks(listing_store: np.ndarray, panel_rows: np.ndarray, max_rows: int) -> List[Tuple[int, int]]:
+    """Listing ranges ``[start, end)`` made of whole stores with at most ``max_rows`` panel rows.
+
+    A store that alone exceeds ``max_rows`` becomes a chunk of its own.
+    """
+    store_starts = np.r_[0, np.flatnonzero(listing_store[1:] != listing_store[:-1]) + 1]
+    store_rows = np.add.reduceat(panel_rows, store_starts)
+    store_ends = np.r_[store_starts[1:], len(listing_store)]
+
+    chunks = []
+    start, rows = 0, 0
+    for store_start, store_end, n_rows in zip(store_starts, store_ends, store_rows):
+        if rows and rows + n_rows > max_rows:
+            chunks.append((start, store_start))
+            start, rows = store_start, 0
+        if n_rows > max_rows:
+            logger.warning(
+                "Panel of store %s (%d rows) exceeds the memory budget", listing_store[store_start], n_rows
+            )
+        rows += n_rows
+    if rows:
+        chunks.append((start, len(listing_store)))
+    return chunks
+
+
+def iter_dense_panel(table: pa.Table, memory_budget_mb: float = 512) -> Iterator[pa.Table]:
+    """Yields the ML columns of ``table`` with a row for every day between the first and
+    the last date of each store/product, sorted by store, product and date. Missing days
+    get ``sales_qty`` 0 and ``stockout`` False. Rows without ids are dropped.
+
+    Every yielded table covers whole stores and holds at most about ``memory_budget_mb``
+    of panel rows (see ``BYTES_PER_ROW``).
+    """
+    table = table.select(ML_COLUMNS)
+    valid = pc.and_(pc.is_valid(table['id_store']), pc.is_valid(table['id_product']))
+    n_invalid = len(table) - pc.sum(valid).as_py() if len(table) else 0
+    if n_invalid:
+        logger.warning("Dropping %d rows without id_store/id_product from the ML panel", n_invalid)
+        table = table.filter(valid)
+    table = table.take(pc.sort_indices(table, [
+        ('id_store', 'ascending'), ('id_product', 'ascending'), ('target_date', 'ascending')
+    ]))
+
+    store = table['id_store'].to_numpy()
+    product = table['id_product'].to_numpy()
+    day = table['target_date'].cast(pa.int32()).to_numpy()
+    sales = table['sales_qty'].fill_null(0).to_numpy().astype(np.float32, copy=False)
+    stockout = table['stockout'].fill_null(False).to_numpy(zero_copy_only=False)
+    del table
+
+    if not len(store):
+        return
+
+    starts, ends = _listings(store, product)
+    first_day, last_day = day[starts], day[ends - 1]
+    panel_rows = (last_day - first_day + 1).astype(np.int64)
+    max_rows = max(int(memory_budget_mb * 1024 ** 2 // BYTES_PER_ROW), 1)
+
+    for chunk_start, chunk_end in store_chunks(store[starts], panel_rows, max_rows):
+        lengths = panel_rows[chunk_start:chunk_end]
+        offsets = np.r_[0, np.cumsum(lengths)[:-1]].astype(np.int32)
+        n_rows = int(lengths.sum())
+
+        # day of every panel row: its listing's first day plus the position within the listing
+        panel_day = np.arange(n_rows, dtype=np.int32)
+        panel_day -= np.repeat(offsets - first_day[chunk_start:chunk_end], lengths)
+
+        # observed rows are scattered to (listing offset + days since the first day)
+        rows = slice(starts[chunk_start], ends[chunk_end - 1])
+        observed_lengths = ends[chunk_start:chunk_end] - starts[chunk_start:chunk_end]
+        positions = day[rows] + np.repeat(offsets - first_day[chunk_start:chunk_end], observed_lengths)
+
+        panel_sales = np.zeros(n_rows, dtype=np.float32)
+        panel_sales[positions] = sales[rows]
+        panel_stockout = np.zeros(n_rows, dtype=bool)
+        panel_stockout[positions] = stockout[rows]
+
+        yield pa.table({
+            'id_product': np.repeat(product[starts[chunk_start:chunk_end]], lengths),
+            'id_store': np.repeat(store[starts[chunk_start:chunk_end]], lengths),
+            'target_date': pa.array(panel_day).cast(pa.date32()),
+            'sales_qty': panel_sales,
+            'stockout': panel_stockout,
+        })
+
+
+def dense_panel(table: pa.Table, memory_budget_mb: float = 512) -> ds.Scanner:
+    """``iter_dense_panel`` as a scanner that datasets write chunk by chunk."""
+    schema = pa.schema([
+        ('id_product', pa.int32()),
+        ('id_store', pa.int32()),
+        ('target_date', pa.date32()),
+        ('sales_qty', pa.float32()),
+        ('stockout', pa.bool_()),
+    ])
+    batches = (
+        batch
+        for chunk in iter_dense_panel(table, memory_budget_mb)
+        for batch in chunk.cast(schema).to_batches()
+    )
+    return ds.Scanner.from_batches(batches, schema=schema)
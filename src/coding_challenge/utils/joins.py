@@ -0,0 +1,132 @@
+"""Dimension lookups for the fact tables of the ERP pipelines."""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+from .scd import VALID_FROM, VALID_TO
+
+# fact rows per lookup pass of the as-of join, bounds its int64 temporaries
+ASOF_CHUNK_ROWS = 10_000_000
+# largest dense (key, day) grid of the as-of join, 4 bytes per cell
+ASOF_GRID_CELLS = 50_000_000
+
+
+def dimension_indexer(fact_codes: np.ndarray, fact_keys: pd.Index, dimension_keys: pd.Series) -> np.ndarray:
+    """Row of the dimension for every fact row, -1 where the key is not in the dimension.
+
+    ``fact_codes``/``fact_keys`` are the ``pd.factorize`` result of the fact key column.
+    The dimension is turned into a dense array of its row per fact key code, which is
+    then gathered with the codes; a trailing -1 serves the missing (-1) fact keys.
+    """
+    if dimension_keys.duplicated().any():
+        duplicated = dimension_keys[dimension_keys.duplicated()].unique()[:5].tolist()
+        raise ValueError(f"Dimension key '{dimension_keys.name}' is not unique, e.g. {duplicated}")
+
+    rows = np.full(len(fact_keys) + 1, -1, dtype=np.intp)
+    positions = fact_keys.get_indexer(dimension_keys)
+    found = positions >= 0
+    rows[positions[found]] = np.flatnonzero(found)
+    return rows[fact_codes]
+
+
+def asof_indexer(
+    fact_codes: np.ndarray,
+    fact_keys: pd.Index,
+    fact_days: np.ndarray,
+    dimension_keys: pd.Series,
+    valid_from: pd.Series
+) -> np.ndarray:
+    """Row of the dimension version valid on the fact's day for every fact row, -1 where
+    the key is not in the dimension.
+
+    ``fact_days`` are the days since the epoch of the fact rows. Every version is placed
+    in a cell ``key code * span + day`` of the fact date range, the first version of a key
+    on its first day, as the master data before the first snapshot is unknown. If the cells
+    of all keys fit into ``ASOF_GRID_CELLS`` they are forward filled into a dense grid that
+    the facts gather from directly, otherwise the facts are ``searchsorted`` into the cells.
+    """
+    version_days = valid_from.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    if pd.MultiIndex.from_arrays([dimension_keys, version_days]).duplicated().any():
+        raise ValueError(f"Dimension key '{dimension_keys.name}' has several versions starting the same day")
+
+    key_codes = fact_keys.get_indexer(dimension_keys)
+    versions = np.flatnonzero(key_codes >= 0)
+    rows = np.full(len(fact_codes), -1, dtype=np.intp)
+    if not len(versions) or not len(fact_codes):
+        return rows
+
+    versions = versions[np.lexsort((version_days[versions], key_codes[versions]))]
+    codes = key_codes[versions]
+    first_day = fact_days.min()
+    span = fact_days.max() - first_day + 1
+    days = version_days[versions] - first_day
+    days[np.r_[True, codes[1:] != codes[:-1]]] = 0
+    # versions that start after the last fact are never valid, those before the first fact
+    # share its cell, where the later one wins
+    in_range = days < span
+    versions, codes, days = versions[in_range], codes[in_range], np.maximum(days[in_range], 0)
+    cells = codes * span + days
+
+    grid = None
+    if len(fact_keys) * span <= ASOF_GRID_CELLS:
+        grid = np.full(len(fact_keys) * span, -1, dtype=np.int32)
+        np.maximum.at(grid, cells, np.arange(len(cells), dtype=np.int32))
+        grid = np.maximum.accumulate(grid)
+
+    for start in range(0, len(fact_codes), ASOF_CHUNK_ROWS):
+        chunk = slice(start, start + ASOF_CHUNK_ROWS)
+        fact_code = fact_codes[chunk]
+        fact_cells = np.maximum(fact_code, 0) * span + (fact_days[chunk] - first_day)
+        if grid is not None:
+            position = grid[fact_cells]
+        else:
+            position = np.searchsorted(cells, fact_cells, side='right') - 1
+        # keys without versions fall into the cells of the preceding key
+        found = (fact_code >= 0) & (position >= 0) & (codes[np.maximum(position, 0)] == fact_code)
+        rows[chunk] = np.where(found, versions[position], -1)
+    return rows
+
+
+def join_dimensions(
+    fact: pd.DataFrame,
+    dimensions: Sequence[Tuple[pd.DataFrame, str]],
+    date_col: str = 'target_date'
+) -> pd.DataFrame:
+    """Left-joins every ``(dimension, key)`` onto ``fact`` in one pass.
+
+    Gives the same rows and columns as chaining ``fact.merge(dimension, on=key, how='left')``
+    for dimensions with one row per key, but factorizes each fact key only once and
+    gathers every dimension column with a single ``take`` instead of copying the growing
+    fact table per merge. Missing values follow ``merge``: integer columns become float.
+
+    Versioned dimensions (with ``valid_from``, see ``utils.scd``) are joined as of the
+    ``date_col`` of every fact row; their validity columns are not added to the result.
+    """
+    factorized: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+    fact_days: Optional[np.ndarray] = None
+    # one copy of the fact columns, the result does not share memory with the input
+    columns = {col: fact[col].array.copy() for col in fact.columns}
+
+    for dimension, key in dimensions:
+        if key not in factorized:
+            codes, uniques = pd.factorize(fact[key])
+            factorized[key] = codes, pd.Index(uniques)
+
+        if VALID_FROM in dimension.columns:
+            if fact_days is None:
+                fact_days = fact[date_col].to_numpy(dtype='datetime64[D]').astype(np.int64)
+            indexer = asof_indexer(*factorized[key], fact_days, dimension[key], dimension[VALID_FROM])
+            dimension = dimension.drop(columns=[VALID_FROM, VALID_TO], errors='ignore')
+        else:
+            indexer = dimension_indexer(*factorized[key], dimension[key])
+
+        for col in dimension.columns.drop(key):
+            if col in columns:
+                raise ValueError(f"Column '{col}' of the '{key}' dimension is already in the fact table")
+            columns[col] = take(dimension[col].array, indexer, allow_fill=True)
+
+    # every column is already a fresh array, so skip the consolidating copy
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,79 @@
+"""Landing (bronze) layer: every raw partition parsed once into a typed Parquet copy."""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+from .partitions import load_partitions
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_columns(df: pd.DataFrame, columns: Dict[str, str]) -> pd.DataFrame:
+    """The raw ``columns`` of ``df`` present in the file, renamed to their canonical names."""
+    return df[[col for col in columns if col in df.columns]].rename(columns=columns)
+
+
+def land_partitions(
+    raw: Dict[str, Any],
+    landed: Optional[Dict[str, Any]] = None,
+    preprocess: Optional[Callable[[Any], pd.DataFrame]] = None,
+    full_rebuild: bool = False,
+    max_workers: Optional[int] = None,
+    executor: str = 'thread',
+    fingerprints: Optional[Dict[str, str]] = None,
+    sources: Optional[Dict[str, str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """Parses the raw partitions that have no landed copy yet (all with ``full_rebuild``).
+
+    ``landed`` are the partitions of the landing ``PartitionedDataset`` (``None`` before
+    the first run); only their ids are used. With ``fingerprints`` (the manifest's
+    ``content_hash`` per raw partition) a landed copy is only kept if ``sources``, the hashes
+    recorded at landing (see ``update_landed_sources``), has the same one, so files changed
+    after landing are parsed again. The returned partitions keep the raw ids, so saving
+    them to the landing dataset adds or replaces their files next to the existing ones.
+    """
+    landed = {} if full_rebuild else (landed or {})
+    sources = sources or {}
+
+    def is_landed(partition_id: str) -> bool:
+        if partition_id not in landed:
+            return False
+        return fingerprints is None or sources.get(partition_id) == fingerprints.get(partition_id)
+
+    new_partitions = {
+        partition_id: partition
+        for partition_id, partition in raw.items()
+        if not is_landed(partition_id)
+    }
+    if not new_partitions:
+        logger.info("All %d raw partitions are landed", len(raw))
+        return {}
+
+    changed = sorted(partition_id for partition_id in new_partitions if partition_id in landed)
+    if changed:
+        logger.info("Landing %d partitions again whose raw files changed, e.g. %s", len(changed), changed[:3])
+    logger.info("Landing %d of %d raw partitions", len(new_partitions), len(raw))
+    return load_partitions(
+        new_partitions, preprocess=preprocess, max_workers=max_workers, executor=executor
+    )
+
+
+def update_landed_sources(
+    sources: Optional[Dict[str, str]],
+    partition_ids: Iterable[str],
+    fingerprints: Dict[str, str],
+    full_rebuild: bool = False
+) -> Dict[str, str]:
+    """The content hash every landed partition was parsed from, after landing ``partition_ids``.
+
+    Partitions whose raw file is gone (not in ``fingerprints``) are dropped.
+    """
+    recorded = {} if full_rebuild else dict(sources or {})
+    recorded.update({partition_id: fingerprints[partition_id] for partition_id in partition_ids})
+    return {
+        partition_id: content_hash
+        for partition_id, content_hash in sorted(recorded.items())
+        if partition_id in fingerprints
+    }
@@ -0,0 +1,79 @@
+"""Output nodes shared by the ERP pipelines: the ML and app datasets and the app cubes."""
+
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from coding_challenge.query import build_series_index
+
+from .cubes import update_cubes
+from .grid import dense_panel
+
+
+def create_ml_dataset(primary: pa.Table, ml_grid: Optional[dict] = None) -> Union[pa.Table, ds.Scanner]:
+    ml = primary.select([
+        'id_product',
+        'id_store',
+        'target_date',
+        'sales_qty',
+        'stockout'
+    ])
+
+    if not (ml_grid or {}).get('enabled', False):
+        return ml
+
+    # complete daily panel per store/product, expanded and written in store chunks
+    return dense_panel(ml, ml_grid.get('memory_budget_mb', 512))
+
+
+def create_app_dataset(
+    primary: pa.Table,
+    products: pd.DataFrame,
+    stores: pd.DataFrame
+) -> Tuple[pa.Table, pd.DataFrame, pd.DataFrame, Dict[str, np.ndarray]]:
+    # star schema: narrow daily facts keyed by number_product/number_store, the names,
+    # moq and addresses are stored once per version in the product and store dimensions
+    app = primary.select([
+        'id_product',
+        'id_store',
+        'target_date',
+        'sales_qty',
+        'return_qty',
+        'delivery_qty',
+        'stockout',
+        'price',
+        'number_product',
+        'number_store'
+    ])
+    app_products = products[[
+        'number_product', 'product_name', 'product_group', 'moq', 'valid_from', 'valid_to'
+    ]]
+    app_stores = stores[['number_store', 'store_name', 'store_address', 'valid_from', 'valid_to']]
+
+    return app, app_products, app_stores, build_series_index(app)
+
+
+def create_output_datasets(
+    primary: pa.Table,
+    products: pd.DataFrame,
+    stores: pd.DataFrame,
+    ml_grid: Optional[dict] = None
+) -> Tuple[Union[pa.Table, ds.Scanner], pa.Table, pd.DataFrame, pd.DataFrame, Dict[str, np.ndarray]]:
+    # projections of the same arrow buffers, nothing is copied until the datasets write them
+    app, app_products, app_stores, app_series = create_app_dataset(primary, products, stores)
+    return create_ml_dataset(primary, ml_grid), app, app_products, app_stores, app_series
+
+
+def create_app_cubes(
+    primary: pa.Table,
+    primary_fingerprints: Dict[str, str],
+    sources: Optional[Dict[str, str]] = None,
+    weekly: Optional[pd.DataFrame] = None,
+    monthly: Optional[pd.DataFrame] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, str]]:
+    # only the weeks/months with changed days of the primary dataset are aggregated again
+    cubes = update_cubes(primary, primary_fingerprints, sources, {'week': weekly, 'month': monthly})
+    return cubes['week'], cubes['month'], primary_fingerprints
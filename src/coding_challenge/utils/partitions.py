@@ -0,0 +1,206 @@
+"""Helpers for working with ``PartitionedDataset`` inputs across runs."""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def _load_partition(
+    partition: Any,
+    preprocess: Optional[Callable[[Any], pd.DataFrame]],
+    extraction_date: Optional[pd.Timestamp]
+) -> pd.DataFrame:
+    if callable(partition):
+        data = partition()
+    else:
+        # in-memory partitions are shared with the caller, so never mutate them
+        data = partition.copy(deep=False) if isinstance(partition, pd.DataFrame) else partition
+
+    df = preprocess(data) if preprocess is not None else data
+
+    if extraction_date is not None:
+        df['extraction_date'] = extraction_date
+
+    return df
+
+
+def load_partitions(
+    partitions: Dict[str, Any],
+    extraction_date_of: Optional[Callable[[str], pd.Timestamp]] = None,
+    preprocess: Optional[Callable[[Any], pd.DataFrame]] = None,
+    max_workers: Optional[int] = None,
+    executor: str = 'thread'
+) -> Dict[str, pd.DataFrame]:
+    """Loads (and optionally pre-processes) all partitions concurrently.
+
+    Each result is tagged with the ``extraction_date`` parsed from its partition id
+    when ``extraction_date_of`` is given. The returned dict keeps the order of
+    ``partitions`` so callers can ``pd.concat`` its values once.
+    ``executor='process'`` requires ``preprocess`` to be a module-level function.
+    """
+    tasks = {
+        partition_id: (
+            partition,
+            preprocess,
+            extraction_date_of(partition_id) if extraction_date_of is not None else None
+        )
+        for partition_id, partition in partitions.items()
+    }
+
+    if max_workers == 1 or len(tasks) <= 1:
+        return {partition_id: _load_partition(*task) for partition_id, task in tasks.items()}
+
+    with EXECUTORS[executor](max_workers=max_workers) as pool:
+        futures = {
+            partition_id: pool.submit(_load_partition, *task)
+            for partition_id, task in tasks.items()
+        }
+        return {partition_id: future.result() for partition_id, future in futures.items()}
+
+
+def manifest_lookup(manifest: pd.DataFrame, column: str) -> Callable[[str], Any]:
+    return manifest.set_index('partition_id')[column].to_dict().__getitem__
+
+
+def superseded_partitions(manifest: pd.DataFrame) -> Set[str]:
+    """Partitions whose whole date range is re-extracted by newer partitions.
+
+    Assumes every extraction is complete for the days it covers, so the rows of a
+    superseded file would all be dropped again by the latest-extraction-wins dedup.
+    """
+    covered = []
+    superseded = set()
+
+    for _, extraction in manifest.sort_values('extraction_date', ascending=False).groupby(
+        'extraction_date', sort=False
+    ):
+        for entry in extraction.itertuples():
+            if pd.notna(entry.min_date) and _is_covered(covered, entry.min_date, entry.max_date):
+                superseded.add(entry.partition_id)
+
+        for entry in extraction.dropna(subset=['min_date', 'max_date']).itertuples():
+            covered = _add_interval(covered, entry.min_date, entry.max_date)
+
+    return superseded
+
+
+def with_raw_files(partitions: Dict[str, Any], manifest: pd.DataFrame) -> Dict[str, Any]:
+    """The partitions whose raw file is in the manifest.
+
+    Landed copies are never deleted, so the copy of a raw file that was removed upstream
+    stays in the landing dataset and is skipped here.
+    """
+    removed = partitions.keys() - set(manifest['partition_id'])
+    if removed:
+        logger.warning(
+            "Skipping %d partitions whose raw file was removed, e.g. %s", len(removed), sorted(removed)[:3]
+        )
+
+    return {
+        partition_id: partition
+        for partition_id, partition in partitions.items()
+        if partition_id not in removed
+    }
+
+
+def prune_superseded_partitions(partitions: Dict[str, Any], manifest: pd.DataFrame) -> Dict[str, Any]:
+    partitions = with_raw_files(partitions, manifest)
+    superseded = superseded_partitions(manifest) & partitions.keys()
+    if superseded:
+        logger.info("Skipping %d partitions superseded by newer extractions", len(superseded))
+
+    return {
+        partition_id: partition
+        for partition_id, partition in partitions.items()
+        if partition_id not in superseded
+    }
+
+
+def _is_covered(intervals: List[tuple], start: pd.Timestamp, end: pd.Timestamp) -> bool:
+    return any(covered_start <= start and end <= covered_end for covered_start, covered_end in intervals)
+
+
+def _add_interval(intervals: List[tuple], start: pd.Timestamp, end: pd.Timestamp) -> List[tuple]:
+    # days are the unit of the date ranges, so adjacent intervals are merged too
+    merged = []
+    for covered_start, covered_end in sorted(intervals + [(start, end)]):
+        if merged and covered_start <= merged[-1][1] + pd.Timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], covered_end))
+        else:
+            merged.append((covered_start, covered_end))
+    return merged
+
+
+def select_new_partitions(
+    partitions: Dict[str, Any],
+    watermark: Optional[dict],
+    manifest: pd.DataFrame,
+    full_rebuild: bool = False
+) -> Tuple[Dict[str, Any], bool]:
+    partitions = with_raw_files(partitions, manifest)
+    if full_rebuild or not watermark:
+        return partitions, True
+
+    extraction_date_of = manifest_lookup(manifest, 'extraction_date')
+    content_hash_of = manifest_lookup(manifest, 'content_hash')
+    last_extraction = pd.Timestamp(watermark['last_extraction'])
+    processed = watermark.get('partitions', {})
+
+    # the rows of removed files are only dropped from the state by a rebuild
+    removed = sorted(processed.keys() - partitions.keys())
+    if removed:
+        logger.warning("Processed partitions %s were removed, falling back to a full rebuild", removed)
+        return partitions, True
+
+    # files re-delivered under a processed name count as new, their content hash changed
+    new_partitions = {
+        partition_id: partition
+        for partition_id, partition in partitions.items()
+        if processed.get(partition_id) != content_hash_of(partition_id)
+    }
+    changed = sorted(partition_id for partition_id in new_partitions if partition_id in processed)
+    if changed:
+        logger.warning("Partitions %s changed since they were processed", changed)
+
+    # their rows (or those of late files) may be older than processed extractions of the
+    # same days, which an incremental merge would let win
+    late = [
+        partition_id for partition_id in new_partitions
+        if extraction_date_of(partition_id) <= last_extraction
+    ]
+    if late:
+        logger.warning(
+            "Partitions %s are not newer than the watermark %s, falling back to a full rebuild",
+            sorted(late), last_extraction.date()
+        )
+        return partitions, True
+
+    return new_partitions, False
+
+
+def update_watermark(
+    watermark: Optional[dict],
+    partition_ids: Iterable[str],
+    manifest: pd.DataFrame,
+    full_rebuild: bool
+) -> dict:
+    entries = manifest.set_index('partition_id')
+
+    fingerprints = {} if full_rebuild or not watermark else dict(watermark.get('partitions', {}))
+    fingerprints.update(entries.loc[list(partition_ids), 'content_hash'].to_dict())
+
+    last_extraction = entries['extraction_date'].reindex(list(fingerprints)).max()
+
+    return {
+        'last_extraction': last_extraction.isoformat(),
+        'partitions': dict(sorted(fingerprints.items()))
+    }
@@ -0,0 +1,62 @@
+"""Versioned (SCD type 2) master data built from the daily snapshots of the ERP extracts."""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from .transformations import deduplicate_incremental_data
+
+VALID_FROM = 'valid_from'
+VALID_TO = 'valid_to'
+
+
+def _differs(values: pd.Series) -> np.ndarray:
+    """Whether every row differs from the previous one, missing values are equal."""
+    current, previous = values.iloc[1:].array, values.iloc[:-1].array
+    # nullable dtypes compare to NA where either side is missing
+    not_equal = pd.array(current != previous, dtype='boolean').fillna(True).to_numpy(dtype=bool)
+    both_missing = np.asarray(pd.isna(current)) & np.asarray(pd.isna(previous))
+    return np.r_[True, not_equal & ~both_missing]
+
+
+def build_versions(
+    snapshots: pd.DataFrame,
+    key_cols: List[str],
+    value_cols: List[str],
+    extraction_date_col: str = 'extraction_date'
+) -> pd.DataFrame:
+    """Validity intervals of the ``value_cols`` per key from a stack of snapshots.
+
+    A snapshot extracted on a day is valid from that day on (the latest extraction of a
+    day wins). Consecutive snapshots with the same values are compacted into one version,
+    so the result only grows when the master data changes. ``valid_to`` is the exclusive
+    end of a version, missing for the current one. A key that is missing from a later
+    snapshot keeps its last version.
+    """
+    columns = key_cols + value_cols
+    if snapshots.empty:
+        empty = snapshots[columns].copy()
+        empty[VALID_FROM] = pd.Series(dtype='datetime64[ns]')
+        empty[VALID_TO] = pd.Series(dtype='datetime64[ns]')
+        return empty
+
+    df = snapshots[columns + [extraction_date_col]].assign(
+        **{VALID_FROM: pd.to_datetime(snapshots[extraction_date_col]).dt.normalize()}
+    )
+    df = deduplicate_incremental_data(df, key_cols + [VALID_FROM], extraction_date_col)
+    df = df.sort_values(key_cols + [VALID_FROM], kind='stable').reset_index(drop=True)
+
+    new_key = np.zeros(len(df), dtype=bool)
+    for col in key_cols:
+        new_key |= _differs(df[col])
+    changed = new_key.copy()
+    for col in value_cols:
+        changed |= _differs(df[col])
+
+    versions = df.loc[changed, columns + [VALID_FROM]].reset_index(drop=True)
+    # a version ends where the next version of the same key starts
+    next_from = versions[VALID_FROM].shift(-1)
+    last_of_key = np.r_[new_key[changed][1:], True]
+    versions[VALID_TO] = next_from.mask(last_of_key)
+    return versions
@@ -0,0 +1,129 @@
+"""Declared column types of the intermediate and primary tables (see README)."""
+
+from typing import Dict, List
+
+import pandas as pd
+import pyarrow as pa
+
+DATE = 'date'
+
+COLUMN_TYPES: Dict[str, str] = {
+    'id_product': 'Int32',
+    'id_store': 'Int32',
+    'number_product': 'int32',
+    'number_store': 'int32',
+    'target_date': DATE,
+    'sales_qty': 'float32',
+    'return_qty': 'float32',
+    'delivery_qty': 'float32',
+    'customer_order_qty': 'float32',
+    'delivery_number': 'Int16',
+    'stockout': 'bool',
+    'price': 'float32',
+    'moq': 'int32',
+    'product_name': 'category',
+    'product_group': 'category',
+    'store_name': 'category',
+    'store_address': 'category',
+    'valid_from': DATE,
+    'valid_to': DATE,
+    'period_start': DATE,
+    'stockout_days': 'int32',
+    'days': 'int32',
+}
+
+# columns with a DEFAULT in the spec
+FILL_VALUES = {
+    'sales_qty': 0,
+    'return_qty': 0,
+    'delivery_qty': 0,
+    'moq': 0,
+    'stockout': False,
+}
+
+KEY_COLUMNS = ['target_date', 'number_store', 'number_product']
+
+TABLES: Dict[str, List[str]] = {
+    'sales': KEY_COLUMNS + ['sales_qty', 'return_qty'],
+    'deliveries': KEY_COLUMNS + ['delivery_qty'],
+    'sales_deliveries': KEY_COLUMNS + ['sales_qty', 'return_qty', 'delivery_qty'],
+    'products': ['number_product', 'product_name', 'product_group', 'moq', 'valid_from', 'valid_to'],
+    'prices': ['number_product', 'price', 'valid_from', 'valid_to'],
+    'stores': ['number_store', 'store_name', 'store_address', 'valid_from', 'valid_to'],
+    'primary': [
+        'id_product', 'id_store', 'target_date', 'sales_qty', 'return_qty', 'delivery_qty',
+        'stockout', 'price', 'product_name', 'product_group', 'number_product', 'moq', 'number_store',
+        'store_name', 'store_address',
+    ],
+    'ml': ['id_product', 'id_store', 'target_date', 'sales_qty', 'stockout'],
+    # the ML panel plus the float32 lag/window columns of utils.features
+    'ml_features': ['id_product', 'id_store', 'target_date', 'sales_qty', 'stockout'],
+    # facts of the app star schema, the dimensions are 'products' and 'stores'
+    'app': [
+        'id_product', 'id_store', 'target_date', 'sales_qty', 'return_qty', 'delivery_qty',
+        'stockout', 'price', 'number_product', 'number_store',
+    ],
+    # weekly/monthly rollups of the app facts (utils.cubes), empty id_product: group total
+    'cube': [
+        'period_start', 'id_store', 'product_group', 'id_product', 'sales_qty', 'return_qty',
+        'delivery_qty', 'stockout_days', 'days',
+    ],
+}
+
+
+def check_columns(columns: List[str], table: str) -> None:
+    missing = [col for col in TABLES[table] if col not in columns]
+    if missing:
+        raise KeyError(f"Columns {missing} required by the '{table}' schema are missing")
+
+
+def cast_to_schema(df: pd.DataFrame, table: str, validate: bool = True) -> pd.DataFrame:
+    if validate:
+        check_columns(list(df.columns), table)
+
+    casts = {}
+    for col in df.columns:
+        dtype = COLUMN_TYPES.get(col)
+        if dtype is None:
+            continue
+
+        series = original = df[col]
+        if col in FILL_VALUES and series.hasnans:
+            series = series.fillna(FILL_VALUES[col])
+
+        if dtype == DATE:
+            if str(series.dtype) != 'datetime64[ns]':
+                # pyarrow loads date32 as datetime64[ms]
+                series = pd.to_datetime(series).astype('datetime64[ns]')
+        elif str(series.dtype) != dtype:
+            series = series.astype(dtype)
+
+        if series is not original:
+            casts[col] = series
+
+    return df.assign(**casts) if casts else df
+
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    for col, dtype in COLUMN_TYPES.items():
+        if dtype == DATE and col in table.column_names:
+            index = table.schema.get_field_index(col)
+            table = table.set_column(index, col, table[col].cast(pa.date32()))
+
+    return table
+
+
+def to_default_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Undoes ``cast_to_schema``: the dtypes pandas infers without a schema."""
+    casts = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            casts[col] = df[col].astype(object)
+        elif pd.api.types.is_integer_dtype(dtype):
+            casts[col] = df[col].astype('float64' if df[col].hasnans else 'int64')
+        elif pd.api.types.is_float_dtype(dtype):
+            casts[col] = df[col].astype('float64')
+    return df.assign(**casts)
@@ -0,0 +1,155 @@
+"""Stockout flag from configurable rules, evaluated as numpy expressions over column batches.
+
+A rule is a function of a dict of numpy columns (one batch of rows) and its options that
+returns a boolean array. Rules are registered by name with ``stockout_rule`` or referenced
+by their import path, and selected per ERP in the ``stockout`` parameters::
+
+    stockout:
+      combine: any            # any | all of the rules
+      rules:
+        - rule: sold_out
+        - rule: early_last_sale
+          closing_time: "20:00:00"
+          min_gap: "02:00:00"
+        - rule: my_package.rules.custom_rule
+          columns: [sales_qty, customer_order_qty]
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from kedro.utils import load_obj
+
+from .transformations import calculate_stockout_simple
+
+Columns = Dict[str, np.ndarray]
+Rule = Callable[..., np.ndarray]
+
+STOCKOUT_RULES: Dict[str, Tuple[Tuple[str, ...], Rule]] = {}
+
+DEFAULT_CONFIG = {'combine': 'any', 'rules': [{'rule': 'sales_exceed_deliveries'}]}
+
+COMBINE = {'any': np.logical_or, 'all': np.logical_and}
+
+
+def stockout_rule(name: str, columns: Sequence[str]) -> Callable[[Rule], Rule]:
+    """Registers ``func(columns, **options)`` as the rule ``name`` reading ``columns``."""
+    def register(func: Rule) -> Rule:
+        STOCKOUT_RULES[name] = (tuple(columns), func)
+        return func
+    return register
+
+
+@stockout_rule('sales_exceed_deliveries', ['sales_qty', 'delivery_qty'])
+def sales_exceed_deliveries(columns: Columns) -> np.ndarray:
+    return calculate_stockout_simple(columns['sales_qty'], columns['delivery_qty'])
+
+
+@stockout_rule('sold_out', ['sales_qty', 'delivery_qty'])
+def sold_out(columns: Columns, min_delivery: float = 0.0) -> np.ndarray:
+    """Everything that was delivered was sold."""
+    delivered = columns['delivery_qty']
+    return (delivered > min_delivery) & (columns['sales_qty'] >= delivered)
+
+
+@stockout_rule('early_last_sale', ['sales_qty', 'last_sale_time'])
+def early_last_sale(
+    columns: Columns,
+    closing_time: str = '20:00:00',
+    min_gap: str = '02:00:00'
+) -> np.ndarray:
+    """The product sold, but not during the last ``min_gap`` before closing."""
+    cutoff = (pd.Timedelta(closing_time) - pd.Timedelta(min_gap)).to_timedelta64()
+    # missing sale times (NaT) never compare as earlier
+    return (columns['sales_qty'] > 0) & (columns['last_sale_time'] < cutoff)
+
+
+@stockout_rule('unserved_customer_orders', ['sales_qty', 'delivery_qty', 'customer_order_qty'])
+def unserved_customer_orders(columns: Columns) -> np.ndarray:
+    """Sales plus customer orders exceed the delivered quantity."""
+    orders = columns['customer_order_qty']
+    return (orders > 0) & (columns['sales_qty'] + orders > columns['delivery_qty'])
+
+
+@stockout_rule('restocked', ['delivery_number'])
+def restocked(columns: Columns, min_deliveries: int = 2) -> np.ndarray:
+    """The store needed more than one delivery that day."""
+    return columns['delivery_number'] >= min_deliveries
+
+
+def _resolve(spec: Dict[str, Any]) -> Tuple[Tuple[str, ...], Rule, Dict[str, Any]]:
+    options = dict(spec)
+    name = options.pop('rule')
+    columns = options.pop('columns', None)
+
+    if name in STOCKOUT_RULES:
+        registered_columns, func = STOCKOUT_RULES[name]
+        return tuple(columns or registered_columns), func, options
+    if '.' not in name:
+        raise KeyError(f"Unknown stockout rule '{name}', expected one of {sorted(STOCKOUT_RULES)}")
+    if columns is None:
+        raise KeyError(f"Stockout rule '{name}' needs the 'columns' it reads")
+    return tuple(columns), load_obj(name), options
+
+
+def _to_numpy(data: Any, col: str) -> np.ndarray:
+    if isinstance(data, (pa.Table, pa.RecordBatch)):
+        column = data.column(col)
+        if pa.types.is_integer(column.type) and column.null_count:
+            column = column.cast(pa.float64())
+        return column.to_numpy(zero_copy_only=False)
+
+    series = data[col]
+    dtype = series.dtype
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_numeric_dtype(dtype):
+        # nullable ints/floats: missing values become NaN, which fails every comparison
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return series.to_numpy()
+
+
+def _column_names(data: Any) -> List[str]:
+    if isinstance(data, (pa.Table, pa.RecordBatch)):
+        return data.schema.names
+    return list(data.columns)
+
+
+def required_columns(config: Dict[str, Any] = None) -> List[str]:
+    columns = []
+    for spec in (config or DEFAULT_CONFIG)['rules']:
+        columns.extend(col for col in _resolve(spec)[0] if col not in columns)
+    return columns
+
+
+def evaluate_stockout(data: Any, config: Dict[str, Any] = None, batch_size: int = None) -> np.ndarray:
+    """Stockout flag of every row of a DataFrame or arrow table/record batch.
+
+    The configured rules run on slices of ``batch_size`` rows (``config['batch_size']``,
+    default 10M), so their temporaries stay bounded for tables of any length.
+    """
+    config = config or DEFAULT_CONFIG
+    rules = [_resolve(spec) for spec in config['rules']]
+    if not rules:
+        raise ValueError("The stockout configuration has no rules")
+    combine = COMBINE[config.get('combine', 'any')]
+    batch_size = batch_size or config.get('batch_size', 10_000_000)
+
+    missing = [col for col in required_columns(config) if col not in _column_names(data)]
+    if missing:
+        raise KeyError(f"Columns {missing} required by the stockout rules are missing")
+    arrays = {col: _to_numpy(data, col) for col in required_columns(config)}
+
+    n_rows = len(data)
+    stockout = np.zeros(n_rows, dtype=bool)
+    for start in range(0, n_rows, batch_size):
+        batch = {col: array[start:start + batch_size] for col, array in arrays.items()}
+        flags = stockout[start:start + batch_size]
+        for i, (columns, func, options) in enumerate(rules):
+            result = func({col: batch[col] for col in columns}, **options)
+            if i == 0:
+                flags[:] = result
+            else:
+                combine(flags, result, out=flags)
+
+    return stockout
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from typing import Tuple
 
 
 def handle_empty_numeric(series: pd.Series, default: float = 0.0) -> pd.Series:
@@ -24,16 +25,78 @@ def aggregate_multiple_deliveries(
     return df.groupby(group_cols, as_index=False).agg({agg_col: 'sum'})
 
 
+def factorize_keys(df: pd.DataFrame, key_cols: list) -> Tuple[np.ndarray, int]:
+    # Dense group code per row: mixed-radix combination of the per-column codes, compacted
+    # with a hash whenever the key space outgrows the rows, so n_groups <= len(df) and the
+    # combined code stays below len(df) ** 2.
+    codes = np.zeros(len(df), dtype=np.int64)
+    n_groups = 1
+
+    for col in key_cols:
+        col_codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+        codes = codes * len(uniques) + col_codes
+        n_groups *= len(uniques)
+        if n_groups > len(df):
+            codes, compacted = pd.factorize(codes)
+            n_groups = len(compacted)
+
+    return codes, n_groups
+
+
 def deduplicate_incremental_data(
     df: pd.DataFrame,
     key_cols: list,
     extraction_date_col: str = 'extraction_date'
 ) -> pd.DataFrame:
-    return df.sort_values(extraction_date_col).drop_duplicates(
+    # Same rows as sort_values(extraction_date_col, kind='stable').drop_duplicates(
+    # key_cols, keep='last') without sorting the frame: rank the few unique
+    # extraction dates and reduce (rank, row position) per key with a scatter-max.
+    n_rows = len(df)
+    if n_rows == 0:
+        return df
+
+    extraction_rank, uniques = pd.factorize(df[extraction_date_col], sort=True)
+    # missing extraction dates sort last, just like in sort_values
+    extraction_rank = np.where(extraction_rank < 0, len(uniques), extraction_rank)
+    score = extraction_rank.astype(np.int64) * n_rows + np.arange(n_rows, dtype=np.int64)
+
+    codes, n_groups = factorize_keys(df, key_cols)
+    best = np.full(n_groups, -1, dtype=np.int64)
+    np.maximum.at(best, codes, score)
+
+    keep = np.zeros(n_rows, dtype=bool)
+    keep[best[best >= 0] % n_rows] = True
+
+    return df[keep]
+
+
+def aggregate_latest_extraction(
+    df: pd.DataFrame,
+    key_cols: list,
+    agg: dict,
+    extraction_date_col: str = 'extraction_date'
+) -> pd.DataFrame:
+    aggregated = df.groupby(key_cols + [extraction_date_col], as_index=False).agg(**agg)
+    return aggregated.drop_duplicates(
         subset=key_cols,
         keep='last'
+    ).drop(columns=extraction_date_col).reset_index(drop=True)
+
+
+def merge_incremental_state(
+    previous: pd.DataFrame,
+    new: pd.DataFrame,
+    key_cols: list
+) -> pd.DataFrame:
+    if previous is None or previous.empty:
+        return new.reset_index(drop=True)
+
+    superseded = pd.MultiIndex.from_frame(previous[key_cols]).isin(
+        pd.MultiIndex.from_frame(new[key_cols])
     )
 
+    return pd.concat([previous[~superseded], new], ignore_index=True)
+
 
 def calculate_stockout_simple(
     sales_qty: pd.Series,
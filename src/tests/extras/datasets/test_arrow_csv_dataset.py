@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from kedro.io.core import DatasetError
+
+from coding_challenge.extras.datasets import ArrowCSVDataset
+
+SALES_ARGS = {
+    'sep': ';',
+    'decimal': ',',
+    'encoding': 'cp1250',
+    'parse_dates': ['Datum'],
+    'date_format': '%d.%m.%Y',
+    'dtype': {'VK-Menge': 'double'},
+    'fill_null': {'VK-Menge': 0},
+}
+
+
+@pytest.fixture
+def sales_csv(tmp_path):
+    # cosmos export: cp1250, decimal commas, dd.mm.yyyy dates and an empty quantity
+    path = tmp_path / 'Verkauf_2024_01_02.csv'
+    path.write_bytes(
+        'Datum;Kunde;Artikel;VK-Menge;Filiale\n'
+        '01.01.2024;1;10;2,5;Hauptstraße\n'
+        '31.12.2023;2;11;;Grüner Weg\n'
+        '02.01.2024;1;12;-1,25;Hauptstraße\n'.encode('cp1250')
+    )
+    return path
+
+
+class TestArrowCSVDataset:
+    def test_cosmos_dialect_is_typed(self, sales_csv):
+        sales = ArrowCSVDataset(str(sales_csv), load_args=SALES_ARGS).load()
+
+        assert sales['Datum'].tolist() == list(pd.to_datetime(['2024-01-01', '2023-12-31', '2024-01-02']))
+        assert sales['VK-Menge'].tolist() == [2.5, 0.0, -1.25]
+        assert str(sales['VK-Menge'].dtype) == 'float64'
+        assert sales['Filiale'].tolist() == ['Hauptstraße', 'Grüner Weg', 'Hauptstraße']
+
+    def test_usecols_converts_only_the_selected_columns(self, sales_csv):
+        dates = ArrowCSVDataset(str(sales_csv), load_args={**SALES_ARGS, 'usecols': ['Datum']}).load()
+
+        assert list(dates.columns) == ['Datum']
+        assert dates['Datum'].max() == pd.Timestamp('2024-01-02')
+
+    def test_missing_fill_null_column_is_rejected(self, sales_csv):
+        dataset = ArrowCSVDataset(str(sales_csv), load_args={**SALES_ARGS, 'fill_null': {'LI-Menge': 0}})
+
+        with pytest.raises(DatasetError, match="fill_null columns \\['LI-Menge'\\]"):
+            dataset.load()
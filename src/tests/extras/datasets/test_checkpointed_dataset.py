@@ -0,0 +1,68 @@
+import json
+
+import pandas as pd
+
+from coding_challenge.extras.datasets import CheckpointedDataset
+from coding_challenge.extras.datasets.checkpointed_dataset import wait_for_checkpoints
+
+
+def _dataset(tmp_path, **kwargs):
+    return CheckpointedDataset(
+        {'type': 'kedro_datasets.json.JSONDataset', 'filepath': str(tmp_path / 'watermark.json')},
+        **kwargs
+    )
+
+
+class TestCheckpointedDataset:
+    def test_memory_handoff_serves_the_saved_object_and_checkpoints(self, tmp_path):
+        dataset = _dataset(tmp_path, handoff='memory', checkpoint='async')
+        watermark = {'last_extraction': '2024-01-03T00:00:00'}
+
+        dataset.save(watermark)
+
+        assert dataset.load() is watermark
+        wait_for_checkpoints()
+        assert json.loads((tmp_path / 'watermark.json').read_text()) == watermark
+
+    def test_skipped_checkpoint_is_never_written(self, tmp_path):
+        dataset = _dataset(tmp_path, handoff='memory', checkpoint='skip')
+
+        dataset.save({'a': 1})
+        wait_for_checkpoints()
+
+        assert dataset.load() == {'a': 1}
+        assert not (tmp_path / 'watermark.json').exists()
+        dataset.release()
+        assert not dataset.exists()
+
+    def test_disk_handoff_materializes_every_save(self, tmp_path):
+        dataset = _dataset(tmp_path, checkpoint='skip')
+
+        dataset.save({'a': 1})
+
+        assert (tmp_path / 'watermark.json').exists()
+
+    def test_memory_handoff_loads_the_dtypes_of_the_checkpoint(self, tmp_path):
+        def typed(**kwargs):
+            return CheckpointedDataset({
+                'type': 'coding_challenge.extras.datasets.TypedParquetDataset',
+                'filepath': str(tmp_path / 'stores.parquet'),
+                'schema': 'stores',
+            }, **kwargs)
+
+        in_memory, on_disk = typed(handoff='memory'), typed(handoff='disk')
+        stores = pd.DataFrame({
+            'number_store': [10, 20],
+            'store_name': ['a', 'b'],
+            'store_address': ['x', 'y'],
+            'valid_from': pd.to_datetime(['2024-01-01', '2024-01-01']),
+            'valid_to': pd.NaT,
+        })
+
+        in_memory.save(stores)
+        loaded = in_memory.load()
+        stores['number_store'] = 30
+        wait_for_checkpoints()
+
+        pd.testing.assert_frame_equal(loaded, on_disk.load())
+        assert on_disk.load()['number_store'].tolist() == [10, 20]
@@ -0,0 +1,80 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from coding_challenge.extras.datasets import HiveParquetDataset
+from coding_challenge.utils.schema import cast_to_schema, to_arrow
+
+
+def _ml_dataset(dates, id_store):
+    return pd.DataFrame({
+        'id_product': 1,
+        'id_store': id_store,
+        'target_date': pd.to_datetime(dates),
+        'sales_qty': 1.0,
+        'stockout': False,
+    })
+
+
+class TestHiveParquetDataset:
+    def test_partitions_by_customer_and_month_sorted_by_store(self, tmp_path):
+        dataset = HiveParquetDataset(str(tmp_path / 'ml_dataset'), 'ml', customer=1001)
+        data = _ml_dataset(['2024-02-01', '2024-01-31', '2024-01-01', '2024-01-15'], [2, 2, 1, 1])
+
+        dataset.save(data)
+
+        january = tmp_path / 'ml_dataset' / 'customer=1001' / 'target_month=2024-01' / 'part-0.parquet'
+        assert sorted(p.parent.name for p in (tmp_path / 'ml_dataset').glob('*/*/*.parquet')) == [
+            'target_month=2024-01', 'target_month=2024-02'
+        ]
+        assert pq.read_table(january)['id_store'].to_pylist() == [1, 1, 2]
+
+        loaded = dataset.load()
+        assert list(loaded.columns) == list(data.columns)
+        assert len(loaded) == 4
+
+        filtered = pd.read_parquet(tmp_path / 'ml_dataset', filters=[('id_store', '=', 2)])
+        assert filtered['target_date'].astype(str).tolist() == ['2024-01-31', '2024-02-01']
+
+    def test_save_replaces_previous_months(self, tmp_path):
+        dataset = HiveParquetDataset(str(tmp_path / 'ml_dataset'), 'ml', customer=1001)
+        dataset.save(_ml_dataset(['2023-12-31'], 1))
+
+        dataset.save(_ml_dataset(['2024-01-01'], 1))
+
+        assert dataset.load()['target_date'].tolist() == [pd.Timestamp('2024-01-01')]
+
+    def test_scanner_batches_are_appended_per_month(self, tmp_path):
+        dataset = HiveParquetDataset(str(tmp_path / 'ml_dataset'), 'ml', customer=1001)
+        chunks = [
+            _ml_dataset(['2024-02-01', '2024-01-31'], 1),
+            _ml_dataset(['2024-01-15', '2024-02-02'], 2),
+        ]
+        schema = pa.Schema.from_pandas(chunks[0], preserve_index=False)
+
+        dataset.save(ds.Scanner.from_batches(
+            (batch for chunk in chunks for batch in pa.Table.from_pandas(chunk, schema).to_batches()),
+            schema=schema,
+        ))
+
+        february = tmp_path / 'ml_dataset' / 'customer=1001' / 'target_month=2024-02' / 'part-0.parquet'
+        assert pq.read_table(february)['id_store'].to_pylist() == [1, 2]
+        assert pq.ParquetFile(february).metadata.num_row_groups == 2
+        assert len(dataset.load()) == 4
+
+    def test_unchanged_months_are_not_rewritten(self, tmp_path):
+        dataset = HiveParquetDataset(str(tmp_path / 'ml_dataset'), 'ml', customer=1001)
+        data = _ml_dataset(['2024-01-01', '2024-02-01'], 1)
+        dataset.save(data)
+        customer = tmp_path / 'ml_dataset' / 'customer=1001'
+        before = {p.parent.name: p.stat().st_ino for p in customer.glob('*/part-0.parquet')}
+
+        data.loc[1, 'sales_qty'] = 2.0
+        table = to_arrow(cast_to_schema(data, 'ml'))
+        dataset.save(ds.Scanner.from_batches(table.to_batches(), schema=table.schema))
+
+        after = {p.parent.name: p.stat().st_ino for p in customer.glob('*/part-0.parquet')}
+        assert after['target_month=2024-01'] == before['target_month=2024-01']
+        assert after['target_month=2024-02'] != before['target_month=2024-02']
+        assert dataset.load()['sales_qty'].tolist() == [1.0, 2.0]
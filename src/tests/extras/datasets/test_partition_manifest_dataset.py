@@ -0,0 +1,126 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+from kedro.io.core import DatasetError
+
+from coding_challenge.extras.datasets import PartitionManifestDataset
+from coding_challenge.utils.partitions import superseded_partitions
+
+SALES_CSV = {
+    'type': 'coding_challenge.extras.datasets.ArrowCSVDataset',
+    'load_args': {
+        'sep': ';',
+        'decimal': ',',
+        'parse_dates': ['Datum'],
+        'dtype': {'VK-Menge': 'double'},
+        'fill_null': {'VK-Menge': 0},
+    },
+}
+
+
+def _write_sales(folder, name, dates, quantity='1,0'):
+    folder.mkdir(exist_ok=True)
+    rows = ''.join(f'{date};1;2;{quantity}\n' for date in dates)
+    (folder / f'{name}.csv').write_text('Datum;Kunde;Artikel;VK-Menge\n' + rows)
+
+
+def _manifest_dataset(tmp_path, **kwargs):
+    return PartitionManifestDataset(
+        path=str(tmp_path / 'sales'),
+        dataset=SALES_CSV,
+        filename_suffix='.csv',
+        manifest=str(tmp_path / 'sales_manifest.parquet'),
+        **({'date_column': 'Datum'} if not kwargs else kwargs),
+    )
+
+
+class TestPartitionManifestDataset:
+    def test_describes_extraction_date_and_date_range(self, tmp_path):
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_03', ['01.01.2024', '02.01.2024'])
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_04_06_30_00', ['03.01.2024'])
+
+        manifest = _manifest_dataset(tmp_path).load().set_index('partition_id')
+
+        assert manifest.loc['Verkauf_2024_01_03', 'extraction_date'] == pd.Timestamp('2024-01-03')
+        assert manifest.loc['Verkauf_2024_01_04_06_30_00', 'extraction_date'] == pd.Timestamp(
+            '2024-01-04 06:30:00'
+        )
+        assert manifest.loc['Verkauf_2024_01_03', 'min_date'] == pd.Timestamp('2024-01-01')
+        assert manifest.loc['Verkauf_2024_01_03', 'max_date'] == pd.Timestamp('2024-01-02')
+
+    def test_file_name_without_timestamp_is_rejected(self, tmp_path):
+        _write_sales(tmp_path / 'sales', 'Verkauf_latest', ['01.01.2024'])
+
+        with pytest.raises(DatasetError, match="No extraction timestamp"):
+            _manifest_dataset(tmp_path).load()
+
+    def test_raw_files_are_read_for_the_date_column_only(self, tmp_path):
+        # an unparsable quantity does not matter for the date range
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_03', ['01.01.2024'], quantity='n/a')
+
+        manifest = _manifest_dataset(tmp_path).load()
+
+        assert manifest['max_date'].tolist() == [pd.Timestamp('2024-01-01')]
+
+    def test_only_new_or_changed_files_are_described_again(self, tmp_path, monkeypatch):
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_03', ['01.01.2024'])
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_04', ['02.01.2024'])
+        first = _manifest_dataset(tmp_path).load()
+
+        described = []
+        original = PartitionManifestDataset._describe_partition
+
+        def spy(self, path, partition_id, *args):
+            described.append(partition_id)
+            return original(self, path, partition_id, *args)
+
+        monkeypatch.setattr(PartitionManifestDataset, '_describe_partition', spy)
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_04', ['02.01.2024', '05.01.2024'])
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_05', ['03.01.2024'])
+        second = _manifest_dataset(tmp_path).load().set_index('partition_id')
+
+        assert sorted(described) == ['Verkauf_2024_01_04', 'Verkauf_2024_01_05']
+        assert second.loc['Verkauf_2024_01_04', 'max_date'] == pd.Timestamp('2024-01-05')
+        assert second.loc['Verkauf_2024_01_04', 'content_hash'] != first.set_index('partition_id').loc[
+            'Verkauf_2024_01_04', 'content_hash'
+        ]
+        assert pd.read_parquet(tmp_path / 'sales_manifest.parquet')['partition_id'].tolist() == [
+            'Verkauf_2024_01_03', 'Verkauf_2024_01_04', 'Verkauf_2024_01_05'
+        ]
+
+    def test_superseded_files_follow_from_the_manifest(self, tmp_path):
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_03', ['01.01.2024', '02.01.2024'])
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_04', ['01.01.2024', '02.01.2024', '03.01.2024'])
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_05', ['03.01.2024', '04.01.2024'])
+
+        manifest = _manifest_dataset(tmp_path).load()
+
+        assert superseded_partitions(manifest) == {'Verkauf_2024_01_03'}
+
+    def test_date_range_from_the_landed_copy(self, tmp_path):
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_03', ['01.01.2024'])
+        landed = tmp_path / 'landed'
+        dataset = _manifest_dataset(tmp_path, landed_path=str(landed))
+
+        # not landed yet: no range and the raw file is not parsed
+        pending = dataset.load()
+        assert pending['min_date'].isna().all()
+
+        landed.mkdir()
+        pd.DataFrame({'target_date': pd.to_datetime(['2023-12-30', '2023-12-31'])}).to_parquet(
+            landed / 'Verkauf_2024_01_03.parquet'
+        )
+        (landed / '_sources.json').write_text(json.dumps({
+            'Verkauf_2024_01_03': pending['content_hash'].item(),
+        }))
+        manifest = dataset.load()
+
+        assert manifest['min_date'].item() == pd.Timestamp('2023-12-30')
+        assert manifest['max_date'].item() == pd.Timestamp('2023-12-31')
+
+        # a landed copy of an older version of the file is not used
+        _write_sales(tmp_path / 'sales', 'Verkauf_2024_01_03', ['01.01.2024', '02.01.2024'])
+        os.utime(tmp_path / 'sales' / 'Verkauf_2024_01_03.csv', (0, 0))
+        assert dataset.load()['min_date'].isna().all()
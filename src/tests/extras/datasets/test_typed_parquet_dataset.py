@@ -0,0 +1,59 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from coding_challenge.extras.datasets import TypedParquetDataset
+
+
+def _sales():
+    return pd.DataFrame({
+        'target_date': pd.to_datetime(['2024-01-01', '2024-01-02']),
+        'number_store': [1, 1],
+        'number_product': [2, 3],
+        'sales_qty': [1.0, None],
+        'return_qty': [0.0, 0.0],
+    })
+
+
+class TestTypedParquetDataset:
+    def test_round_trip_casts_to_schema(self, tmp_path):
+        dataset = TypedParquetDataset(str(tmp_path / 'sales.parquet'), 'sales')
+
+        dataset.save(_sales())
+        loaded = dataset.load()
+
+        assert loaded.dtypes.astype(str).to_dict() == {
+            'target_date': 'datetime64[ns]',
+            'number_store': 'int32',
+            'number_product': 'int32',
+            'sales_qty': 'float32',
+            'return_qty': 'float32',
+        }
+        assert loaded['sales_qty'].tolist() == [1.0, 0.0]
+
+    def test_arrow_projection_is_written_as_is(self, tmp_path):
+        TypedParquetDataset(str(tmp_path / 'sales.parquet'), 'sales').save(_sales())
+        table = TypedParquetDataset(
+            str(tmp_path / 'sales.parquet'),
+            'sales',
+            return_type='arrow',
+            load_args={'columns': ['target_date', 'number_store', 'number_product', 'sales_qty']},
+        ).load()
+
+        assert isinstance(table, pa.Table)
+        assert table.schema.field('target_date').type == pa.date32()
+
+        projection = TypedParquetDataset(str(tmp_path / 'deliveries.parquet'), 'deliveries')
+        projection.save(table.select(['target_date', 'number_store', 'number_product']).append_column(
+            'delivery_qty', table['sales_qty']
+        ))
+
+        assert projection.load()['delivery_qty'].tolist() == [1.0, 0.0]
+
+    def test_scanner_is_written_batch_by_batch(self, tmp_path):
+        table = pa.Table.from_pandas(_sales().fillna(0), preserve_index=False)
+        dataset = TypedParquetDataset(str(tmp_path / 'sales.parquet'), 'sales')
+
+        dataset.save(ds.Scanner.from_batches(table.to_reader(max_chunksize=1)))
+
+        assert dataset.load()['number_product'].tolist() == [2, 3]
@@ -0,0 +1,100 @@
+import json
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+from kedro.io.core import DatasetError
+
+from coding_challenge.extras.datasets import UpsertParquetDataset
+from coding_challenge.extras.datasets import upsert_parquet_dataset
+from coding_challenge.utils.schema import cast_to_schema, to_arrow
+
+
+def _sales(dates, sales_qty):
+    return pd.DataFrame({
+        'target_date': pd.to_datetime(dates),
+        'number_store': 1,
+        'number_product': range(len(dates)),
+        'sales_qty': sales_qty,
+        'return_qty': 0.0,
+    })
+
+
+def _inodes(path):
+    return {p.name: p.stat().st_ino for p in path.glob('*.parquet')}
+
+
+class TestUpsertParquetDataset:
+    def test_only_changed_days_are_rewritten(self, tmp_path):
+        dataset = UpsertParquetDataset(str(tmp_path / 'sales'), 'sales')
+        sales = _sales(['2024-01-01', '2024-01-02', '2024-01-02'], [1.0, 2.0, 3.0])
+        dataset.save(sales)
+        before = _inodes(tmp_path / 'sales')
+
+        # same rows in another order, then a correction of 2024-01-02
+        dataset.save(sales.iloc[::-1])
+        assert _inodes(tmp_path / 'sales') == before
+
+        dataset.save(_sales(['2024-01-01', '2024-01-02', '2024-01-02'], [1.0, 2.0, 5.0]))
+        after = _inodes(tmp_path / 'sales')
+
+        assert sorted(after) == ['2024-01-01.parquet', '2024-01-02.parquet']
+        assert after['2024-01-01.parquet'] == before['2024-01-01.parquet']
+        assert after['2024-01-02.parquet'] != before['2024-01-02.parquet']
+        assert dataset.load()['sales_qty'].tolist() == [1.0, 2.0, 5.0]
+
+    def test_days_missing_from_the_data_are_kept(self, tmp_path):
+        dataset = UpsertParquetDataset(str(tmp_path / 'sales'), 'sales', return_type='arrow')
+        dataset.save(_sales(['2024-01-01'], [1.0]))
+
+        table = pa.Table.from_pandas(
+            _sales(['2024-01-03', '2024-01-02'], [3.0, 2.0]).astype({'number_product': 'int32'}),
+            preserve_index=False,
+        )
+        dataset.save(ds.Scanner.from_batches(table.to_batches(), schema=table.schema))
+
+        loaded = dataset.load()
+        assert [d.isoformat() for d in loaded['target_date'].to_pylist()] == [
+            '2024-01-01', '2024-01-02', '2024-01-03'
+        ]
+        assert not list((tmp_path / 'sales').glob('.*'))
+
+    def test_replace_mode_removes_days_missing_from_the_data(self, tmp_path):
+        dataset = UpsertParquetDataset(str(tmp_path / 'sales'), 'sales', mode='replace')
+        dataset.save(_sales(['2024-01-03', '2024-01-02', '2024-01-01'], [3.0, 2.0, 1.0]))
+        before = _inodes(tmp_path / 'sales')
+
+        # a full rebuild without 2024-01-01, 2024-01-03 unchanged
+        dataset.save(_sales(['2024-01-03', '2024-01-02'], [3.0, 5.0]))
+
+        after = _inodes(tmp_path / 'sales')
+        assert sorted(after) == ['2024-01-02.parquet', '2024-01-03.parquet']
+        assert after['2024-01-03.parquet'] == before['2024-01-03.parquet']
+        assert sorted(json.loads((tmp_path / 'sales' / '_fingerprints.json').read_text())) == [
+            '2024-01-02', '2024-01-03'
+        ]
+        assert dataset.load()['sales_qty'].tolist() == [5.0, 3.0]
+
+    def test_unknown_mode_is_rejected(self, tmp_path):
+        with pytest.raises(DatasetError, match="Unknown mode 'append'"):
+            UpsertParquetDataset(str(tmp_path / 'sales'), 'sales', mode='append')
+
+    def test_scanner_is_spilled_per_day_and_sorted(self, tmp_path, monkeypatch):
+        # one open spill file at a time, so every day is spread over several of them
+        monkeypatch.setattr(upsert_parquet_dataset, 'MAX_OPEN_SPILLS', 1)
+        sales = _sales(['2024-01-02', '2024-01-01'] * 6, [float(i) for i in range(12)])
+        table = to_arrow(cast_to_schema(sales, 'sales'))
+        batches = table.sort_by([('number_product', 'descending')]).to_batches(max_chunksize=3)
+
+        dataset = UpsertParquetDataset(str(tmp_path / 'sales'), 'sales', sort_by=['number_product'])
+        dataset.save(ds.Scanner.from_batches(batches, schema=table.schema))
+        before = _inodes(tmp_path / 'sales')
+
+        day = pq.read_table(tmp_path / 'sales' / '2024-01-01.parquet')
+        assert day['number_product'].to_pylist() == [1, 3, 5, 7, 9, 11]
+        assert not list((tmp_path / 'sales').glob('.*'))
+        # same fingerprints as the table, so nothing is rewritten
+        dataset.save(sales)
+        assert _inodes(tmp_path / 'sales') == before
@@ -0,0 +1,152 @@
+import pandas as pd
+
+from coding_challenge.pipelines.etl_cosmos.nodes import land_sales_files, process_sales_files
+
+
+def _sales_file(rows):
+    # landed copy of a sales file (canonical column names)
+    return pd.DataFrame(
+        rows, columns=['target_date', 'number_store', 'number_product', 'raw_quantity', 'revenue']
+    ).assign(target_date=lambda df: pd.to_datetime(df['target_date']))
+
+
+def _manifest(partitions, content_hashes=None):
+    return pd.DataFrame([
+        {
+            'partition_id': partition_id,
+            'extraction_date': pd.Timestamp(partition_id[-10:].replace('_', '-')),
+            'content_hash': (content_hashes or {}).get(partition_id, partition_id),
+            'min_date': df['target_date'].min(),
+            'max_date': df['target_date'].max(),
+        }
+        for partition_id, df in partitions.items()
+    ])
+
+
+class TestIncrementalSales:
+    def test_incremental_run_matches_full_rebuild(self):
+        partitions = {
+            'sales_2024_01_01': _sales_file([['2024-01-01', 1, 1, 2.0, 1.0], ['2024-01-01', 1, 2, -1.0, 1.0]]),
+            'sales_2024_01_02': _sales_file([['2024-01-01', 1, 1, 3.0, 1.0], ['2024-01-02', 1, 2, 4.0, 1.0]]),
+        }
+        state, watermark = process_sales_files(dict(partitions), _manifest(partitions))
+
+        partitions['sales_2024_01_03'] = _sales_file([['2024-01-02', 1, 2, 7.0, 1.0]])
+        manifest = _manifest(partitions)
+        incremental, watermark = process_sales_files(dict(partitions), manifest, state, watermark)
+        full, _ = process_sales_files(dict(partitions), manifest, state, watermark, {'full_rebuild': True})
+
+        key_cols = ['target_date', 'number_store', 'number_product']
+        pd.testing.assert_frame_equal(
+            incremental.sort_values(key_cols).reset_index(drop=True),
+            full.sort_values(key_cols).reset_index(drop=True)
+        )
+        assert watermark['last_extraction'] == '2024-01-03T00:00:00'
+        assert sorted(watermark['partitions']) == sorted(partitions)
+
+    def test_corrected_file_with_the_same_name_is_reprocessed(self):
+        partitions = {
+            'sales_2024_01_01': _sales_file([['2024-01-01', 1, 1, 2.0, 1.0]]),
+            'sales_2024_01_02': _sales_file([['2024-01-02', 1, 1, 3.0, 1.0]]),
+        }
+        state, watermark = process_sales_files(dict(partitions), _manifest(partitions))
+
+        partitions['sales_2024_01_01'] = _sales_file([['2024-01-01', 1, 1, 5.0, 1.0]])
+        manifest = _manifest(partitions, {'sales_2024_01_01': 'corrected'})
+        corrected, watermark = process_sales_files(dict(partitions), manifest, state, watermark)
+
+        assert corrected.sort_values('target_date')['sales_qty'].tolist() == [5.0, 3.0]
+        assert watermark['partitions']['sales_2024_01_01'] == 'corrected'
+
+    def test_removed_file_is_dropped_by_a_rebuild(self):
+        partitions = {
+            'sales_2024_01_01': _sales_file([['2024-01-01', 1, 1, 2.0, 1.0]]),
+            'sales_2024_01_02': _sales_file([['2024-01-02', 1, 1, 3.0, 1.0]]),
+        }
+        state, watermark = process_sales_files(dict(partitions), _manifest(partitions))
+
+        # the raw file is gone, its landed copy is still passed in
+        manifest = _manifest({'sales_2024_01_02': partitions['sales_2024_01_02']})
+        rebuilt, watermark = process_sales_files(dict(partitions), manifest, state, watermark)
+
+        assert rebuilt['target_date'].tolist() == [pd.Timestamp('2024-01-02')]
+        assert list(watermark['partitions']) == ['sales_2024_01_02']
+
+    def test_no_new_partitions_keeps_state(self):
+        partitions = {'sales_2024_01_01': _sales_file([['2024-01-01', 1, 1, 2.0, 1.0]])}
+        manifest = _manifest(partitions)
+        state, watermark = process_sales_files(partitions, manifest)
+
+        unchanged, unchanged_watermark = process_sales_files(partitions, manifest, state, watermark)
+
+        assert unchanged is state
+        assert unchanged_watermark == watermark
+
+
+class TestSupersededPartitions:
+    def test_fully_re_extracted_files_are_not_loaded(self):
+        partitions = {
+            'sales_2024_01_01': _sales_file([['2024-01-01', 1, 1, 2.0, 1.0]]),
+            'sales_2024_01_02': _sales_file([['2024-01-01', 1, 1, 3.0, 1.0], ['2024-01-02', 1, 1, 4.0, 1.0]]),
+        }
+        manifest = _manifest(partitions)
+
+        def superseded_partition():
+            raise AssertionError("superseded partition was loaded")
+
+        sales, watermark = process_sales_files(
+            {**partitions, 'sales_2024_01_01': superseded_partition}, manifest
+        )
+
+        assert sales['sales_qty'].tolist() == [3.0, 4.0]
+        assert sorted(watermark['partitions']) == sorted(partitions)
+
+
+class TestLandSalesFiles:
+    def test_only_new_files_are_landed_with_canonical_columns(self):
+        raw = {
+            'sales_2024_01_01': pd.DataFrame({
+                'Datum': pd.to_datetime(['2024-01-01']), 'Kunde': [1], 'Artikel': [2],
+                'VK-Menge': [3.0], 'VK-Betrag': [4.5], 'Filiale': ['unused'],
+            }),
+        }
+        landed_file = raw['sales_2024_01_01'].rename(columns={'Datum': 'target_date'})
+        manifest = _manifest({'sales_2024_01_01': landed_file})
+
+        def landed_partition():
+            raise AssertionError("landed partition was loaded")
+
+        def raw_partition():
+            raise AssertionError("landed raw file was parsed again")
+
+        landed, sources = land_sales_files(raw, None, manifest, partition_loading={'max_workers': 1})
+        unchanged, unchanged_sources = land_sales_files(
+            {'sales_2024_01_01': raw_partition}, {'sales_2024_01_01': landed_partition}, manifest, sources
+        )
+
+        assert list(landed) == ['sales_2024_01_01']
+        assert list(landed['sales_2024_01_01'].columns) == [
+            'target_date', 'number_store', 'number_product', 'raw_quantity', 'revenue'
+        ]
+        assert sources == {'sales_2024_01_01': 'sales_2024_01_01'}
+        assert unchanged == {}
+        assert unchanged_sources == sources
+
+    def test_changed_file_with_the_same_name_is_landed_again(self):
+        raw = {'sales_2024_01_01': pd.DataFrame({
+            'Datum': pd.to_datetime(['2024-01-01']), 'Kunde': [1], 'Artikel': [2], 'VK-Menge': [5.0],
+        })}
+        manifest = _manifest(
+            {'sales_2024_01_01': raw['sales_2024_01_01'].rename(columns={'Datum': 'target_date'})},
+            {'sales_2024_01_01': 'corrected'},
+        )
+
+        def landed_partition():
+            raise AssertionError("landed partition was loaded")
+
+        landed, sources = land_sales_files(
+            raw, {'sales_2024_01_01': landed_partition}, manifest, {'sales_2024_01_01': 'original'}
+        )
+
+        assert landed['sales_2024_01_01']['raw_quantity'].tolist() == [5.0]
+        assert sources == {'sales_2024_01_01': 'corrected'}
@@ -0,0 +1,142 @@
+import pandas as pd
+import pytest
+
+from coding_challenge.pipelines.etl_cosmos.nodes import (
+    join_all_data,
+    land_delivery_files,
+    land_sales_files,
+    process_delivery_files,
+    process_sales_files,
+)
+from coding_challenge.pipelines.etl_cosmos_duckdb.nodes import build_primary_dataset
+from coding_challenge.utils.schema import cast_to_schema
+
+KEY_COLS = ['target_date', 'number_store', 'number_product']
+
+
+def _write(path, name, columns, rows):
+    path.mkdir(exist_ok=True)
+    pd.DataFrame(rows, columns=columns).to_csv(
+        path / f'{name}.csv', sep=';', decimal=',', index=False, encoding='cp1250'
+    )
+
+
+def _read(path, name):
+    return pd.read_csv(
+        path / f'{name}.csv', sep=';', decimal=',', encoding='cp1250',
+        parse_dates=['Datum'], date_format='%d.%m.%Y'
+    )
+
+
+def _manifest(partitions):
+    return pd.DataFrame([
+        {
+            'partition_id': partition_id,
+            'extraction_date': pd.Timestamp(partition_id[-10:].replace('_', '-')),
+            'content_hash': partition_id,
+            'min_date': df['Datum'].min(),
+            'max_date': df['Datum'].max(),
+        }
+        for partition_id, df in partitions.items()
+    ])
+
+
+@pytest.fixture
+def sources(tmp_path):
+    sales = ['Datum', 'Kunde', 'Artikel', 'VK-Menge', 'VK-Betrag']
+    _write(tmp_path / 'sales', 'Verkauf_2024_01_01', sales, [
+        ['01.01.2024', 1, 10, 2.5, 1.0], ['01.01.2024', 1, 11, -1.0, 1.0],
+    ])
+    _write(tmp_path / 'sales', 'Verkauf_2024_01_02', sales, [
+        ['01.01.2024', 1, 10, 3.0, 1.0], ['02.01.2024', 2, 11, None, 1.0],
+    ])
+    deliveries = ['Datum', 'ArtNr', 'Kunde_Nummer', 'LI-Menge', 'Lieferzeit']
+    _write(tmp_path / 'deliveries', 'Lieferung_2024_01_02', deliveries, [
+        ['01.01.2024', 10, 1, 4.0, '06:00'], ['01.01.2024', 10, 1, 1.5, '14:00'],
+        ['02.01.2024', 12, 2, 2.0, '06:00'],
+    ])
+
+    mappings = tmp_path / 'mappings'
+    mappings.mkdir()
+    pd.DataFrame({'id_product': [100, 101], 'number_product': [10, 11]}).to_parquet(
+        mappings / 'mapping_product.parquet'
+    )
+    pd.DataFrame({'id_store': [900, 901], 'number_store': [1, 2]}).to_parquet(
+        mappings / 'mapping_store.parquet'
+    )
+
+    return {
+        'sales': str(tmp_path / 'sales'),
+        'deliveries': str(tmp_path / 'deliveries'),
+        'mapping_product': str(mappings / 'mapping_product.parquet'),
+        'mapping_store': str(mappings / 'mapping_store.parquet'),
+    }
+
+
+def _dimensions():
+    # product 11 changes its price after the sales, the first version of 10 also applies before
+    products = cast_to_schema(pd.DataFrame({
+        'number_product': [10, 11, 11, 12], 'product_name': ['Brötchen', 'Brezel', 'Brezel', 'Kuchen'],
+        'product_group': ['Brot', 'Kleingebäck', 'Kleingebäck', 'Konditorei'],
+        'price': [0.5, 0.8, 0.9, None], 'moq': [5, 0, 0, 1],
+        'valid_from': pd.to_datetime(['2024-01-02', '2024-01-01', '2024-01-03', '2024-01-01']),
+        'valid_to': pd.to_datetime([None, '2024-01-03', None, None]),
+    }), 'products')
+    stores = cast_to_schema(pd.DataFrame({
+        'number_store': [1, 2], 'store_name': ['Hauptstraße 1', 'Markt 2'],
+        'store_address': ['Hauptstraße 1 – 80331 – München', 'Markt 2 – 50667 – Köln'],
+        'valid_from': pd.to_datetime(['2024-01-01', '2024-01-01']),
+        'valid_to': pd.to_datetime([None, None]),
+    }), 'stores')
+    return products, stores
+
+
+class TestBuildPrimaryDataset:
+    def test_matches_pandas_path(self, tmp_path, sources):
+        sales = {
+            name: _read(tmp_path / 'sales', name).fillna({'VK-Menge': 0})
+            for name in ['Verkauf_2024_01_01', 'Verkauf_2024_01_02']
+        }
+        deliveries = {'Lieferung_2024_01_02': _read(tmp_path / 'deliveries', 'Lieferung_2024_01_02')}
+        sales_manifest, deliveries_manifest = _manifest(sales), _manifest(deliveries)
+        products, stores = _dimensions()
+
+        expected = join_all_data(
+            process_sales_files(land_sales_files(sales, None, sales_manifest)[0], sales_manifest)[0],
+            process_delivery_files(
+                land_delivery_files(deliveries, None, deliveries_manifest)[0], deliveries_manifest
+            )[0],
+            products,
+            stores,
+            pd.read_parquet(sources['mapping_product']),
+            pd.read_parquet(sources['mapping_store']),
+        )
+        primary = build_primary_dataset(
+            sales_manifest, deliveries_manifest, products, stores, {'sources': sources}
+        ).to_table()
+
+        assert primary.column_names == list(expected.columns)
+        actual = cast_to_schema(primary.to_pandas(date_as_object=False), 'primary')
+        expected = cast_to_schema(expected, 'primary')
+        pd.testing.assert_frame_equal(
+            actual.sort_values(KEY_COLS).reset_index(drop=True),
+            expected.sort_values(KEY_COLS).reset_index(drop=True),
+            check_categorical=False,
+        )
+        # latest extraction wins, the later of two deliveries in one file is kept
+        assert actual.set_index(KEY_COLS).loc[(pd.Timestamp('2024-01-01'), 1, 10), 'delivery_qty'] == 1.5
+        # prices as of target_date
+        prices = actual.set_index(KEY_COLS)['price']
+        assert prices.loc[(pd.Timestamp('2024-01-02'), 2, 11)] == pytest.approx(0.8)
+        assert prices.loc[(pd.Timestamp('2024-01-01'), 1, 10)] == pytest.approx(0.5)
+
+    def test_duplicated_dimension_keys_are_rejected(self, tmp_path, sources):
+        sales = {'Verkauf_2024_01_01': _read(tmp_path / 'sales', 'Verkauf_2024_01_01')}
+        deliveries = {'Lieferung_2024_01_02': _read(tmp_path / 'deliveries', 'Lieferung_2024_01_02')}
+        products, stores = _dimensions()
+
+        with pytest.raises(ValueError, match='number_store'):
+            build_primary_dataset(
+                _manifest(sales), _manifest(deliveries), products, pd.concat([stores, stores]),
+                {'sources': sources}
+            )
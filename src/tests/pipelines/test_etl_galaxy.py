@@ -0,0 +1,219 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from coding_challenge.pipelines.etl_galaxy.nodes import (
+    land_deliveries_sales_json,
+    land_prices_json,
+    land_products_json,
+    land_stores_json,
+    process_deliveries_sales_json,
+    process_stores_json,
+)
+
+
+def _artikel(number, delivery_number, delivered, sold, last_sale="17:30:00"):
+    return {
+        "ArtikelNummer": str(number),
+        "Kundenbestellmenge": "1",
+        "LieferNummer": str(delivery_number),
+        "Liefermenge": str(delivered),
+        "UhrzeitErsterVk": "08:15:00",
+        "UhrzeitLetzterVk": last_sale,
+        "Verkaufsmenge": str(sold),
+    }
+
+
+def _deliveries_sales_file(*filialen):
+    return json.dumps({"Filiale": [
+        {"Datum": datum, "FilialNummer": str(store), "ArtikelHistory": artikel}
+        for datum, store, artikel in filialen
+    ]})
+
+
+def _manifest(partitions, content_hashes=None):
+    return pd.DataFrame({
+        "partition_id": list(partitions),
+        "content_hash": [(content_hashes or {}).get(pid, pid) for pid in partitions],
+    })
+
+
+def _land_one(content):
+    partitions = {"deliveries_sales_2024_01_02_06_00_00": content}
+    landed, _ = land_deliveries_sales_json(partitions, None, _manifest(partitions))
+    return landed["deliveries_sales_2024_01_02_06_00_00"]
+
+
+class TestLandDeliveriesSalesJson:
+    def test_entries_are_decoded_into_typed_columns(self):
+        landed = _land_one(_deliveries_sales_file(
+            ("01/01/24", 5, [_artikel(1070, 1, "2.5", "1.25"), _artikel(1070, 2, 4, " 3 ", "19:45:00")]),
+            ("02/01/24", 6, [_artikel(1071, 1, 1, 1)]),
+        ))
+
+        assert landed["target_date"].tolist() == list(
+            pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02"])
+        )
+        assert landed["number_store"].tolist() == [5, 5, 6]
+        # both deliveries of the day are kept as rows
+        assert landed["number_product"].tolist() == [1070, 1070, 1071]
+        assert landed["delivery_number"].tolist() == [1, 2, 1]
+        assert landed["delivery_qty"].tolist() == [2.5, 4.0, 1.0]
+        assert landed["sales_qty"].tolist() == [1.25, 3.0, 1.0]
+        assert landed["last_sale_time"].tolist() == [
+            pd.Timedelta("17:30:00"), pd.Timedelta("19:45:00"), pd.Timedelta("17:30:00")
+        ]
+        assert landed.dtypes.astype(str).to_dict() == {
+            "target_date": "datetime64[ns]",
+            "number_store": "int64",
+            "number_product": "int64",
+            "delivery_qty": "float64",
+            "sales_qty": "float64",
+            "customer_order_qty": "float64",
+            "delivery_number": "Int16",
+            "first_sale_time": "timedelta64[ns]",
+            "last_sale_time": "timedelta64[ns]",
+        }
+
+    def test_missing_and_empty_fields_are_null(self):
+        artikel = [
+            {"ArtikelNummer": "1070", "Liefermenge": "", "Verkaufsmenge": "n/a", "UhrzeitErsterVk": ""},
+            {"ArtikelNummer": "1071", "Liefermenge": "3"},
+        ]
+        # an export wrapped in a list, without last sale times and customer orders in the whole file
+        landed = _land_one(json.dumps([{"Filiale": [
+            {"Datum": "01/01/24", "FilialNummer": "5", "ArtikelHistory": artikel},
+        ]}]))
+
+        assert np.isnan(landed["delivery_qty"][0]) and landed["delivery_qty"][1] == 3.0
+        assert landed["sales_qty"].isna().all()
+        assert landed["customer_order_qty"].isna().all()
+        assert landed["delivery_number"].isna().all()
+        assert landed["first_sale_time"].isna().all()
+        assert landed["last_sale_time"].isna().all()
+
+    def test_entries_without_product_number_are_rejected(self):
+        content = _deliveries_sales_file(("01/01/24", 5, [{"ArtikelNummer": "", "Liefermenge": "1"}]))
+
+        with pytest.raises(ValueError, match="ArtikelNummer"):
+            _land_one(content)
+
+    def test_only_new_or_changed_files_are_landed(self):
+        first, second = "deliveries_sales_2024_01_02_06_00_00", "deliveries_sales_2024_01_03_06_00_00"
+        partitions = {
+            first: _deliveries_sales_file(("01/01/24", 5, [_artikel(1070, 1, 3, 2)])),
+            second: _deliveries_sales_file(("02/01/24", 5, [_artikel(1070, 1, 4, 2)])),
+        }
+        landed, sources = land_deliveries_sales_json(partitions, None, _manifest(partitions))
+
+        def landed_partition():
+            raise AssertionError("landed raw file was parsed again")
+
+        manifest = _manifest(partitions, {second: "corrected"})
+        relanded, relanded_sources = land_deliveries_sales_json(
+            {**partitions, first: landed_partition}, landed, manifest, sources
+        )
+
+        assert list(relanded) == [second]
+        assert relanded_sources == {first: first, second: "corrected"}
+
+
+class TestLandMasterDataJson:
+    def test_products(self):
+        products = json.dumps({"Artikel": [
+            {
+                "ArtikelNummer": "1070", "ArtikelName": "Brötchen", "Artikelgruppe": "Brot",
+                "BestellMindestEinheit": "2.0",
+            },
+            {"ArtikelNummer": "1071", "ArtikelName": "Brezel", "BestellMindestEinheit": ""},
+        ]})
+
+        landed = land_products_json({"Artikel_2024_01_02_06_00_00": products})["Artikel_2024_01_02_06_00_00"]
+
+        assert landed.to_dict("list") == {
+            "number_product": [1070, 1071],
+            "product_name": ["Brötchen", "Brezel"],
+            "product_group": ["Brot", None],
+            "moq": [2, 0],
+        }
+
+    def test_prices(self):
+        prices = json.dumps({"Verkaufspreise": [
+            {"ArtikelNummer": "1070", "Artikelpreis": "2.80"},
+            {"ArtikelNummer": "1071", "ArtikelPreis": "1.15"},
+        ]})
+
+        landed = land_prices_json({"Preise_2024_01_02_06_00_00": prices})["Preise_2024_01_02_06_00_00"]
+
+        assert landed.to_dict("list") == {"number_product": [1070, 1071], "price": [2.8, 1.15]}
+
+    def test_stores(self):
+        stores = json.dumps({"Filialliste": [
+            {
+                "FilialNummer": "101", "FilialName": "Filiale München",
+                "FilialAnschrift": "Hauptstraße 1\n80331\nMünchen",
+            },
+        ]})
+
+        landed = land_stores_json({"Filialen_2024_01_02_06_00_00": stores})["Filialen_2024_01_02_06_00_00"]
+
+        assert landed.to_dict("list") == {
+            "number_store": [101],
+            "store_name": ["Filiale München"],
+            "store_address": ["Hauptstraße 1 – 80331 – München"],
+        }
+
+
+class TestProcessStoresJson:
+    def test_renamed_store_gets_a_new_version(self):
+        def stores(name):
+            return json.dumps({"Filialliste": [
+                {"FilialNummer": "101", "FilialName": name, "FilialAnschrift": "Hauptstraße 1"},
+            ]})
+
+        landed = land_stores_json({
+            "Filialen_2024_01_02_06_00_00": stores("Filiale"),
+            "Filialen_2024_01_03_06_00_00": stores("Filiale"),
+            "Filialen_2024_01_05_06_00_00": stores("Filiale Mitte"),
+        })
+        versions = process_stores_json(landed, {"max_workers": 1})
+
+        assert versions["store_name"].tolist() == ["Filiale", "Filiale Mitte"]
+        assert versions["valid_from"].tolist()[1] == pd.Timestamp("2024-01-05")
+
+
+class TestProcessDeliveriesSalesJson:
+    def test_latest_extraction_wins_and_deliveries_are_summed(self):
+        partitions = {
+            "deliveries_sales_2024_01_02_06_00_00": _deliveries_sales_file(
+                ("01/01/24", 5, [_artikel(1070, 1, 3, 2), _artikel(1071, 1, 1, 1)]),
+            ),
+            "deliveries_sales_2024_01_03_06_00_00": _deliveries_sales_file(
+                ("01/01/24", 5, [_artikel(1070, 1, 3, 5), _artikel(1070, 2, 4, 5, "19:45:00")]),
+            ),
+        }
+
+        manifest = pd.DataFrame({
+            "partition_id": list(partitions),
+            "extraction_date": pd.to_datetime(["2024-01-02 06:00", "2024-01-03 06:00"]),
+            "content_hash": list(partitions),
+            "min_date": pd.Timestamp("2024-01-01"),
+            "max_date": pd.Timestamp("2024-01-01"),
+        })
+        manifest.loc[0, "min_date"] = pd.Timestamp("2023-12-31")
+
+        landed, _ = land_deliveries_sales_json(
+            partitions, None, manifest, partition_loading={"max_workers": 1}
+        )
+        result = process_deliveries_sales_json(landed, manifest, {"max_workers": 1})
+        result = result.set_index("number_product")
+
+        assert result.loc[1070, "delivery_qty"] == 7.0
+        assert result.loc[1070, "sales_qty"] == 5.0
+        assert result.loc[1070, "delivery_number"] == 2
+        assert result.loc[1070, "last_sale_time"] == pd.Timedelta("19:45:00")
+        assert result.loc[1071, "delivery_qty"] == 1.0
+        assert (result["target_date"] == pd.Timestamp("2024-01-01")).all()
+        assert (result["return_qty"] == 0.0).all()
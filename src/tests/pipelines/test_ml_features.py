@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from coding_challenge.pipelines.ml_features.nodes import create_ml_features
+
+
+def _ml():
+    # store 1: product 10 on four days with a stockout on the third, product 11 without 2024-01-02
+    return pa.table({
+        'id_product': pa.array([10, 10, 10, 10, 11, 11], pa.int32()),
+        'id_store': pa.array([1, 1, 1, 1, 1, 1], pa.int32()),
+        'target_date': pa.array(pd.to_datetime([
+            '2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-01', '2024-01-03',
+        ]).date, pa.date32()),
+        'sales_qty': pa.array([1, 2, 3, 4, 5, 6], pa.float32()),
+        'stockout': [False, False, True, False, False, False],
+    })
+
+
+class TestCreateMlFeatures:
+    def test_lags_and_trailing_windows_on_a_small_grid(self):
+        features = create_ml_features(_ml(), {'lags': [1], 'windows': [2]}).to_table().to_pandas()
+
+        product = features[features['id_product'] == 10]
+        np.testing.assert_array_equal(product['sales_lag_1'], [np.nan, 1, 2, 3])
+        np.testing.assert_array_equal(product['sales_sum_2'], [np.nan, np.nan, 3, 5])
+        np.testing.assert_array_equal(product['sales_mean_2'], [np.nan, np.nan, 1.5, 2.5])
+        np.testing.assert_array_equal(product['stockout_days_2'], [np.nan, np.nan, 0, 1])
+        # the stockout day is left out of the demand mean
+        np.testing.assert_array_equal(product['demand_mean_2'], [np.nan, np.nan, 1.5, 2])
+
+    def test_missing_days_are_filled_before_the_lags(self):
+        features = create_ml_features(_ml(), {'lags': [1], 'windows': []}).to_table().to_pandas()
+
+        product = features[features['id_product'] == 11]
+        assert product['sales_qty'].tolist() == [5, 0, 6]
+        np.testing.assert_array_equal(product['sales_lag_1'], [np.nan, 5, 0])
+        assert list(features.columns) == [
+            'id_product', 'id_store', 'target_date', 'sales_qty', 'stockout', 'sales_lag_1'
+        ]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from coding_challenge.extras.datasets import HiveParquetDataset, TypedParquetDataset
+from coding_challenge.query import read_app_view
+from coding_challenge.utils.joins import join_dimensions
+from coding_challenge.utils.outputs import create_app_dataset
+from coding_challenge.utils.schema import TABLES, cast_to_schema, to_arrow
+
+
+def _dimensions():
+    # product 1 is renamed and gets a new moq on 2024-01-02
+    products = cast_to_schema(pd.DataFrame({
+        'number_product': [1, 1, 2],
+        'product_name': ['Brot', 'Vollkornbrot', 'Brezel'],
+        'product_group': ['Brot', 'Brot', 'Kleingebäck'],
+        'price': [1.0, 1.2, 0.5],
+        'moq': [5, 10, 0],
+        'valid_from': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-01']),
+        'valid_to': pd.to_datetime(['2024-01-02', None, None]),
+    }), 'products')
+    stores = cast_to_schema(pd.DataFrame({
+        'number_store': [7],
+        'store_name': ['Markt'],
+        'store_address': ['Markt – 50667 – Köln'],
+        'valid_from': pd.to_datetime(['2024-01-01']),
+        'valid_to': pd.to_datetime([None]),
+    }), 'stores')
+    return products, stores
+
+
+def _primary(products, stores):
+    facts = pd.DataFrame({
+        'target_date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-02', '2024-01-02']),
+        'number_store': [7, 7, 7, 7, 8],
+        'number_product': [1, 1, 1, 2, 3],
+        'sales_qty': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'return_qty': 0.0,
+        'delivery_qty': [1.0, 0.0, 3.0, 4.0, 0.0],
+        'stockout': [False, True, False, False, True],
+        'id_product': pd.array([101, 101, 101, 102, None], dtype='Int32'),
+        'id_store': pd.array([907, 907, 907, 907, None], dtype='Int32'),
+    })
+    primary = join_dimensions(facts, [(products, 'number_product'), (stores, 'number_store')])
+    return cast_to_schema(primary, 'primary')[TABLES['primary']]
+
+
+@pytest.fixture
+def primary_path(tmp_path):
+    products, stores = _dimensions()
+    primary = to_arrow(_primary(products, stores))
+    app, app_products, app_stores, _ = create_app_dataset(primary, products, stores)
+
+    HiveParquetDataset(str(tmp_path / 'app_dataset'), schema='app', customer=1001).save(app)
+    TypedParquetDataset(str(tmp_path / 'app_products.parquet'), schema='products').save(app_products)
+    TypedParquetDataset(str(tmp_path / 'app_stores.parquet'), schema='stores').save(app_stores)
+    return str(tmp_path)
+
+
+class TestReadAppView:
+    def test_reproduces_the_wide_app_table(self, primary_path):
+        products, stores = _dimensions()
+        expected = _primary(products, stores)
+
+        wide = read_app_view(primary_path)
+
+        assert list(wide.columns[:len(TABLES['primary'])]) == TABLES['primary']
+        actual = cast_to_schema(wide[TABLES['primary']], 'primary')
+        sort_by = ['number_store', 'number_product', 'target_date']
+        pd.testing.assert_frame_equal(
+            actual.sort_values(sort_by).reset_index(drop=True),
+            expected.sort_values(sort_by).reset_index(drop=True),
+            check_categorical=False,
+        )
+
+    def test_names_and_moq_as_of_target_date(self, primary_path):
+        wide = read_app_view(primary_path, filters=[('id_store', '=', 907), ('id_product', '=', 101)])
+
+        wide = wide.sort_values('target_date')
+        assert wide['product_name'].tolist() == ['Brot', 'Vollkornbrot', 'Vollkornbrot']
+        np.testing.assert_array_equal(wide['moq'], [5, 10, 10])
+        assert (wide['store_name'] == 'Markt').all()
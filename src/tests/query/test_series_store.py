@@ -0,0 +1,99 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from coding_challenge.query import SeriesStore, build_series_index, write_series_index
+
+
+def _app_dataset():
+    return pd.DataFrame({
+        'id_product': pd.array([2, 1, 1, 2, None], dtype='Int32'),
+        'id_store': pd.array([10, 10, 10, 10, 10], dtype='Int32'),
+        'target_date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-01', '2024-01-02', '2024-01-01']),
+        'sales_qty': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'return_qty': 0.0,
+        'delivery_qty': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'stockout': [True, False, False, True, False],
+        'price': [1.5, np.nan, np.nan, 1.5, 2.0],
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    write_series_index(build_series_index(_app_dataset()), str(tmp_path))
+    return SeriesStore(str(tmp_path), cache_size=1)
+
+
+class TestSeriesStore:
+    def test_series_are_sorted_by_date(self, store):
+        series = store.series(10, 1)
+
+        assert series.index.strftime('%Y-%m-%d').tolist() == ['2024-01-01', '2024-01-02']
+        assert series['sales_qty'].tolist() == [3.0, 2.0]
+
+    def test_rows_without_ids_are_not_indexed(self, store):
+        assert sorted(store.keys()) == [(10, 1), (10, 2)]
+        with pytest.raises(KeyError):
+            store.series(10, 3)
+
+    def test_date_range_slice(self, store):
+        series = store.series(10, 2, start='2024-01-02', end='2024-01-31')
+
+        assert series['stockout'].tolist() == [True]
+
+    def test_least_recently_used_series_is_evicted(self, store):
+        first = store.series(10, 1)
+        assert store.series(10, 1) is first
+
+        store.series(10, 2)
+
+        assert store.series(10, 1) is not first
+
+
+class TestWriteSeriesIndex:
+    def test_rewrite_replaces_the_index_of_open_stores(self, tmp_path):
+        path = str(tmp_path / 'app_series')
+        write_series_index(build_series_index(_app_dataset()), path)
+        opened = SeriesStore(path)
+
+        write_series_index(build_series_index(_app_dataset().assign(sales_qty=0.0)), path)
+
+        assert opened.series(10, 1)['sales_qty'].tolist() == [3.0, 2.0]
+        assert SeriesStore(path).series(10, 1)['sales_qty'].tolist() == [0.0, 0.0]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['app_series']
+        assert len([p for p in (tmp_path / 'app_series').iterdir() if p.is_dir()]) == 1
+
+    def test_versions_that_could_not_be_removed_are_removed_later(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'app_series')
+        write_series_index(build_series_index(_app_dataset()), path)
+        # mapped files cannot be deleted on Windows
+        monkeypatch.setattr(shutil, 'rmtree', lambda *args, **kwargs: None)
+        write_series_index(build_series_index(_app_dataset().assign(sales_qty=0.0)), path)
+        monkeypatch.undo()
+
+        assert len([p for p in (tmp_path / 'app_series').iterdir() if p.is_dir()]) == 2
+        assert SeriesStore(path).series(10, 1)['sales_qty'].tolist() == [0.0, 0.0]
+
+        write_series_index(build_series_index(_app_dataset()), path)
+
+        assert len([p for p in (tmp_path / 'app_series').iterdir() if p.is_dir()]) == 1
+        assert SeriesStore(path).series(10, 1)['sales_qty'].tolist() == [3.0, 2.0]
+
+    def test_failed_write_keeps_the_previous_index(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'app_series')
+        write_series_index(build_series_index(_app_dataset()), path)
+        save = np.save
+
+        def failing_save(file, values, **kwargs):
+            if file.endswith('sales_qty.npy'):
+                raise OSError('disk full')
+            save(file, values, **kwargs)
+
+        monkeypatch.setattr(np, 'save', failing_save)
+        with pytest.raises(OSError):
+            write_series_index(build_series_index(_app_dataset().assign(stockout=False)), path)
+
+        assert SeriesStore(path).series(10, 2)['stockout'].tolist() == [True, True]
+        assert len([p for p in (tmp_path / 'app_series').iterdir() if p.is_dir()]) == 1
@@ -0,0 +1,42 @@
+import multiprocessing
+import subprocess
+import sys
+from pathlib import Path
+
+from kedro.framework.startup import bootstrap_project
+
+from coding_challenge.customer_runner import CustomerRun, discover_customers, format_summary, run_customers
+
+
+class TestCustomerRunner:
+    def test_every_customer_environment_has_an_erp_pipeline(self):
+        assert discover_customers(Path.cwd()) == {
+            '1001_customer': 'etl_cosmos',
+            '1002_customer': 'etl_cosmos',
+            '1003_customer': 'etl_galaxy',
+        }
+
+    def test_summary_reports_failed_customers(self):
+        runs = [
+            CustomerRun('1001_customer', 'etl_cosmos', seconds=2.0),
+            CustomerRun('1003_customer', 'etl_galaxy', seconds=1.0, error='Traceback ...'),
+        ]
+
+        summary = format_summary(runs, wall_seconds=2.5)
+
+        assert '1003_customer        etl_galaxy   FAILED' in summary
+        assert summary.endswith('2 customers in 2.5s wall time (3.0s summed), 1 failed')
+
+    def test_spawned_workers_bootstrap_the_project(self, tmp_path, monkeypatch):
+        subprocess.run(
+            [sys.executable, 'benchmarks/synthetic_data.py', str(tmp_path),
+             '--stores', '2', '--products', '5', '--days', '2', '--overlap', '2'],
+            check=True,
+        )
+        monkeypatch.setenv('filepath_prefix', str(tmp_path / 'customer_1001'))
+        bootstrap_project(Path.cwd())
+
+        runs = run_customers(Path.cwd(), ['1001_customer'], 1, mp_context=multiprocessing.get_context('spawn'))
+
+        assert [(run.env, run.error) for run in runs] == [('1001_customer', None)]
+        assert (tmp_path / 'customer_1001' / '03_primary' / 'primary_dataset').is_dir()
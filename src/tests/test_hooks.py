@@ -0,0 +1,34 @@
+import logging
+
+import pandas as pd
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import node
+
+from coding_challenge.hooks import PerformanceHooks
+
+
+class TestPerformanceHooks:
+    def test_records_nodes_and_datasets_of_a_run(self, caplog):
+        hooks = PerformanceHooks()
+        join = node(lambda sales: sales, 'sales', 'primary', name='join_all_data')
+        sales = pd.DataFrame({'sales_qty': [1.0, 2.0, 3.0]})
+        catalog = DataCatalog({'performance_metrics': MemoryDataset()})
+        run_params = {'session_id': 's1', 'env': '1001_customer', 'pipeline_name': 'etl_cosmos'}
+
+        hooks.before_pipeline_run()
+        hooks.before_dataset_loaded('sales', join)
+        hooks.after_dataset_loaded('sales', sales)
+        hooks.before_node_run(join)
+        hooks.after_node_run(join, {'sales': sales}, {'primary': sales.head(2)})
+        with caplog.at_level(logging.INFO, logger='coding_challenge.hooks'):
+            hooks.after_pipeline_run(run_params, catalog)
+
+        metrics = catalog.load('performance_metrics').set_index('kind')
+        assert metrics.loc['node', ['rows_in', 'rows_out', 'bytes_in']].tolist() == [3, 2, 24]
+        assert metrics.loc['load', 'name'] == 'sales'
+        assert (metrics['env'] == '1001_customer').all()
+        summary = [
+            record.getMessage() for record in caplog.records if record.name == 'coding_challenge.hooks'
+        ]
+        assert summary[0] == 'Slowest nodes of 1001_customer:'
+        assert summary[1].startswith('  join_all_data: ') and summary[1].endswith('3 -> 2 rows')
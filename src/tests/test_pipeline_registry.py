@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+from kedro.framework.project import configure_project, settings
+
+from coding_challenge.customer_runner import discover_customers
+from coding_challenge.pipeline_registry import register_pipelines
+
+# etl_cosmos_duckdb is selected on the command line and shares the cosmos catalog
+ML_FEATURE_RUNS = sorted(discover_customers(Path.cwd()).items()) + [('1001_customer', 'etl_cosmos_duckdb')]
+
+
+@pytest.fixture(scope='module')
+def pipelines():
+    configure_project('coding_challenge')
+    return register_pipelines()
+
+
+def _config(env):
+    return settings.CONFIG_LOADER_CLASS(
+        conf_source=str(Path.cwd() / settings.CONF_SOURCE), env=env, **settings.CONFIG_LOADER_ARGS
+    )
+
+
+class TestRegisterPipelines:
+    @pytest.mark.parametrize('env, erp_pipeline', ML_FEATURE_RUNS)
+    def test_ml_features_resolve_to_catalog_entries(self, pipelines, env, erp_pipeline):
+        config = _config(env)
+        catalog, parameters = config['catalog'], config['parameters']
+
+        ml_features = [
+            node for node in pipelines[f'{erp_pipeline}_ml_features'].nodes
+            if node.name.split('.')[-1] == 'create_ml_features'
+        ]
+
+        assert len(ml_features) == 1
+        (ml_dataset,) = [name for name in ml_features[0].inputs if not name.startswith('params:')]
+        (output,) = ml_features[0].outputs
+        assert ml_dataset in catalog and output in catalog
+        # the ML dataset is produced by the ERP pipeline and read by the features
+        assert ml_dataset in pipelines[erp_pipeline].all_outputs()
+        assert 'ml_features' in parameters
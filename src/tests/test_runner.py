@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import node
+
+from coding_challenge.extras.datasets import FingerprintedPartitionedDataset
+from coding_challenge.runner import NodeCache, cached_node
+
+
+def _catalog(tmp_path):
+    return DataCatalog({
+        'raw_products': FingerprintedPartitionedDataset(
+            path=str(tmp_path / 'products'), dataset='pandas.CSVDataset', filename_suffix='.csv'
+        ),
+        'params:partition_loading': MemoryDataset({'max_workers': 1}),
+    })
+
+
+class TestCachedNode:
+    def test_node_runs_again_only_when_a_partition_changes(self, tmp_path):
+        (tmp_path / 'products').mkdir()
+        snapshot = tmp_path / 'products' / 'products_2024_01_01.csv'
+        snapshot.write_text('ArtNr,Bezeichnung\n1,Brot\n')
+        calls = []
+
+        def process_products(product_dict, partition_loading):
+            calls.append(sorted(product_dict))
+            return pd.DataFrame({'number_product': [len(calls)]})
+
+        cached = cached_node(
+            node(process_products, ['raw_products', 'params:partition_loading'], 'products', name='products'),
+            _catalog(tmp_path),
+            NodeCache(str(tmp_path / 'cache')),
+        )
+        inputs = {'raw_products': {}, 'params:partition_loading': {'max_workers': 1}}
+
+        first = cached.run(inputs)
+        second = cached.run(inputs)
+        assert len(calls) == 1
+        pd.testing.assert_frame_equal(first['products'], second['products'])
+
+        snapshot.write_text('ArtNr,Bezeichnung\n1,Brot\n2,Semmel\n')
+        os.utime(snapshot, (0, 0))
+        cached.run(inputs)
+        assert len(calls) == 2
+
+
+class TestNodeCache:
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = NodeCache(str(tmp_path), max_size_mb=1.5 / 1024)
+        cache.put('a', b'x' * 700)
+        os.utime(tmp_path / 'a.pkl', (1, 1))
+        cache.put('b', b'x' * 700)
+        os.utime(tmp_path / 'b.pkl', (2, 2))
+
+        cache.get('a')
+        cache.put('c', b'x' * 700)
+
+        assert sorted(path.stem for path in tmp_path.glob('*.pkl')) == ['a', 'c']
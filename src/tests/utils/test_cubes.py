@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from coding_challenge.utils.cubes import period_start, rollup_cube, update_cubes
+from coding_challenge.utils.schema import cast_to_schema, to_arrow
+
+
+def _primary(sales_qty=None):
+    dates = pd.date_range('2024-01-29', '2024-02-06')
+    n = len(dates)
+    return cast_to_schema(pd.DataFrame({
+        'id_product': pd.array([101] * n + [102] * n, dtype='Int32'),
+        'id_store': pd.array([900] * 2 * n, dtype='Int32'),
+        'target_date': dates.append(dates),
+        'sales_qty': sales_qty if sales_qty is not None else np.ones(2 * n),
+        'return_qty': 0.0,
+        'delivery_qty': 2.0,
+        'stockout': np.arange(2 * n) % 3 == 0,
+        'price': 1.0,
+        'product_group': 'Brot',
+        'number_product': [1] * n + [2] * n,
+        'number_store': 7,
+    }), 'app')
+
+
+def _fingerprints(primary, changed=()):
+    return {
+        day.strftime('%Y-%m-%d'): 'changed' if day.strftime('%Y-%m-%d') in changed else 'same'
+        for day in primary['target_date'].unique()
+    }
+
+
+class TestPeriodStart:
+    def test_weeks_start_on_monday_and_months_on_the_first(self):
+        dates = np.array(['2024-01-31', '2024-02-04', '2024-02-05'], dtype='datetime64[D]')
+        weeks = np.array(['2024-01-29', '2024-01-29', '2024-02-05'], dtype='datetime64[D]')
+        months = np.array(['2024-01-01', '2024-02-01', '2024-02-01'], dtype='datetime64[D]')
+
+        np.testing.assert_array_equal(period_start(dates, 'week'), weeks)
+        np.testing.assert_array_equal(period_start(dates, 'month'), months)
+
+    def test_unknown_period_is_rejected(self):
+        with pytest.raises(ValueError, match='quarter'):
+            period_start(np.array(['2024-01-31'], dtype='datetime64[D]'), 'quarter')
+
+
+class TestRollupCube:
+    def test_products_and_group_totals(self):
+        daily = _primary()
+
+        cube = rollup_cube(daily, 'week').set_index(['period_start', 'id_product'])
+
+        first_week = pd.Timestamp('2024-01-29')
+        assert cube.loc[(first_week, 101), 'sales_qty'] == 7
+        assert cube.loc[(first_week, 101), 'days'] == 7
+        group_total = cube.loc[first_week].loc[pd.isna(cube.loc[first_week].index)]
+        assert group_total['sales_qty'].item() == 14
+        first_week_days = daily['target_date'] < '2024-02-05'
+        assert group_total['stockout_days'].item() == daily.loc[first_week_days, 'stockout'].sum()
+        assert len(cube) == 6
+
+
+class TestUpdateCubes:
+    def test_only_periods_with_changed_days_are_recomputed(self):
+        primary = _primary()
+        fingerprints = _fingerprints(primary)
+        cubes = update_cubes(to_arrow(primary), fingerprints)
+
+        # sales of 2024-02-06 corrected, only the second week and February change
+        sales_qty = np.ones(len(primary))
+        sales_qty[8] = 5.0
+        corrected = _primary(sales_qty)
+        stale = {period: cube.assign(sales_qty=-1.0) for period, cube in cubes.items()}
+        updated = update_cubes(
+            to_arrow(corrected), _fingerprints(corrected, changed={'2024-02-06'}), fingerprints, stale
+        )
+
+        weekly = updated['week'].set_index(['period_start', 'id_product'])
+        assert weekly.loc[(pd.Timestamp('2024-01-29'), 101), 'sales_qty'] == -1.0
+        assert weekly.loc[(pd.Timestamp('2024-02-05'), 101), 'sales_qty'] == 6.0
+        monthly = updated['month'].set_index(['period_start', 'id_product'])
+        assert monthly.loc[(pd.Timestamp('2024-01-01'), 101), 'sales_qty'] == -1.0
+        assert monthly.loc[(pd.Timestamp('2024-02-01'), 101), 'sales_qty'] == 10.0
+
+    def test_periods_of_removed_days_are_recomputed(self):
+        primary = _primary()
+        fingerprints = _fingerprints(primary)
+        cubes = update_cubes(to_arrow(primary), fingerprints)
+
+        # 2024-02-06 no longer exists upstream, it leaves the primary dataset and its fingerprints
+        remaining = primary[primary['target_date'] != pd.Timestamp('2024-02-06')]
+        stale = {period: cube.assign(sales_qty=-1.0) for period, cube in cubes.items()}
+        updated = update_cubes(to_arrow(remaining), _fingerprints(remaining), fingerprints, stale)
+
+        weekly = updated['week'].set_index(['period_start', 'id_product'])
+        assert weekly.loc[(pd.Timestamp('2024-01-29'), 101), 'sales_qty'] == -1.0
+        assert weekly.loc[(pd.Timestamp('2024-02-05'), 101), 'sales_qty'] == 1.0
+
+    def test_unchanged_days_keep_the_previous_cubes(self):
+        primary = _primary()
+        fingerprints = _fingerprints(primary)
+        cubes = update_cubes(to_arrow(primary), fingerprints)
+
+        updated = update_cubes(to_arrow(primary), fingerprints, fingerprints, cubes)
+
+        for period in cubes:
+            pd.testing.assert_frame_equal(updated[period], cubes[period])
+
+    def test_missing_previous_cube_rebuilds_all_periods(self):
+        primary = _primary()
+        fingerprints = _fingerprints(primary)
+        cubes = update_cubes(to_arrow(primary), fingerprints)
+
+        previous = {'week': cubes['week'], 'month': None}
+        updated = update_cubes(to_arrow(primary), fingerprints, fingerprints, previous)
+
+        # two products and the group total per month
+        assert len(updated['month']) == len(cubes['month']) == 6
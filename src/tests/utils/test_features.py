@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from coding_challenge.utils.features import feature_names, feature_table, iter_feature_table
+
+
+def _ml(seed=0):
+    # three stores, listings with gaps and of different lengths, unsorted rows
+    rng = np.random.default_rng(seed)
+    frames = []
+    for store, product, first, n_days in [(1, 10, 0, 40), (1, 11, 5, 3), (2, 10, 2, 60), (3, 12, 0, 31)]:
+        days = np.sort(rng.choice(n_days, size=max(n_days * 2 // 3, 1), replace=False)) + first
+        frames.append(pd.DataFrame({
+            'id_product': product,
+            'id_store': store,
+            'target_date': np.datetime64('2024-01-01') + days.astype('timedelta64[D]'),
+            'sales_qty': rng.integers(0, 9, len(days)).astype(np.float32),
+            'stockout': rng.random(len(days)) < 0.3,
+        }))
+    ml = pd.concat(frames).sample(frac=1, random_state=seed)
+    return pa.Table.from_pandas(ml, preserve_index=False).cast(pa.schema([
+        ('id_product', pa.int32()),
+        ('id_store', pa.int32()),
+        ('target_date', pa.date32()),
+        ('sales_qty', pa.float32()),
+        ('stockout', pa.bool_()),
+    ]))
+
+
+def _expected(panel: pd.DataFrame, lags, windows) -> pd.DataFrame:
+    """The features with a groupby per series."""
+    series = panel.groupby(['id_store', 'id_product'], sort=False)
+    demand = panel['sales_qty'].where(~panel['stockout'], 0.0)
+    expected = {}
+    for lag in lags:
+        expected[f'sales_lag_{lag}'] = series['sales_qty'].shift(lag)
+    for window in windows:
+        def before(values, window=window):
+            return values.groupby([panel['id_store'], panel['id_product']], sort=False).transform(
+                lambda x: x.shift(1).rolling(window).sum()
+            )
+        stockout_days = before(panel['stockout'].astype(float))
+        expected[f'sales_sum_{window}'] = before(panel['sales_qty'].astype(float))
+        expected[f'sales_mean_{window}'] = expected[f'sales_sum_{window}'] / window
+        expected[f'stockout_days_{window}'] = stockout_days
+        expected[f'demand_mean_{window}'] = before(demand) / (window - stockout_days).where(
+            stockout_days < window
+        )
+    return pd.DataFrame(expected).astype('float32')
+
+
+class TestFeatureTable:
+    def test_features_match_a_groupby_per_series(self):
+        lags, windows = [1, 7], [3, 28]
+
+        features = feature_table(_ml(), lags, windows).to_table().to_pandas()
+
+        assert list(features.columns[5:]) == feature_names(lags, windows)
+        pd.testing.assert_frame_equal(
+            features[feature_names(lags, windows)], _expected(features, lags, windows), rtol=1e-6
+        )
+
+    def test_series_start_without_history(self):
+        features = feature_table(_ml(), [1], [7]).to_table().to_pandas()
+
+        first_days = ~features.duplicated(['id_store', 'id_product'])
+        assert features.loc[first_days, 'sales_lag_1'].isna().all()
+        # the listing of product 11 is shorter than the window
+        short = features[features['id_product'] == 11]
+        assert short['sales_sum_7'].isna().all()
+
+    def test_chunks_cover_whole_stores_in_order(self):
+        ml = _ml()
+
+        chunks = list(iter_feature_table(ml, [1], [7], memory_budget_mb=1e-4))
+
+        stores = [set(chunk['id_store'].to_pylist()) for chunk in chunks]
+        assert stores == [{1}, {2}, {3}]
+        combined = pa.concat_tables(chunks).to_pandas()
+        whole = feature_table(ml, [1], [7]).to_table().to_pandas()
+        pd.testing.assert_frame_equal(combined, whole, check_dtype=False)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from coding_challenge.utils.grid import BYTES_PER_ROW, dense_panel, iter_dense_panel
+from coding_challenge.utils.schema import to_arrow
+
+
+def _ml():
+    return pd.DataFrame({
+        'id_product': pd.array([1, 1, 2, 1, 1, 3], dtype='Int32'),
+        'id_store': pd.array([10, 10, 10, 20, 20, None], dtype='Int32'),
+        'target_date': pd.to_datetime([
+            '2024-01-30', '2024-02-02', '2024-01-05', '2024-01-01', '2024-01-03', '2024-01-01'
+        ]),
+        'sales_qty': np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0], dtype='float32'),
+        'stockout': [True, False, False, True, True, False],
+    })
+
+
+def _naive_panel(ml):
+    ml = ml.dropna(subset=['id_store', 'id_product'])
+    days = ml.groupby(['id_store', 'id_product'])['target_date'].agg(['min', 'max'])
+    panel = pd.concat([
+        pd.DataFrame({'id_store': store, 'id_product': product, 'target_date': pd.date_range(first, last)})
+        for (store, product), (first, last) in days.iterrows()
+    ])
+    panel = panel.merge(ml, on=['id_store', 'id_product', 'target_date'], how='left')
+    return panel.fillna({'sales_qty': 0, 'stockout': False}).astype({'stockout': bool})
+
+
+class TestDensePanel:
+    def test_matches_naive_expansion(self):
+        ml = _ml()
+
+        panel = dense_panel(to_arrow(ml)).to_table().to_pandas(date_as_object=False)
+
+        expected = _naive_panel(ml)[list(panel.columns)]
+        assert len(panel) == 4 + 1 + 3
+        pd.testing.assert_frame_equal(
+            panel.astype({'target_date': 'datetime64[ns]'}),
+            expected.reset_index(drop=True),
+            check_dtype=False,
+        )
+
+    def test_chunks_are_whole_stores_within_budget(self):
+        chunks = list(iter_dense_panel(to_arrow(_ml()), memory_budget_mb=5 * BYTES_PER_ROW / 1024 ** 2))
+
+        assert [chunk['id_store'].unique().to_pylist() for chunk in chunks] == [[10], [20]]
+        assert [len(chunk) for chunk in chunks] == [4 + 1, 3]
+
+    def test_empty_table(self):
+        empty = to_arrow(_ml().iloc[:0])
+
+        assert dense_panel(empty).to_table().num_rows == 0
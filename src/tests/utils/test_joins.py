@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from coding_challenge.utils.joins import join_dimensions
+
+
+def _fact():
+    return pd.DataFrame({
+        'number_product': [1, 2, 3, np.nan, 1],
+        'number_store': np.array([5, 5, 6, 6, 7], dtype='int32'),
+        'sales_qty': [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+
+class TestJoinDimensions:
+    def test_matches_chained_left_merges(self):
+        fact = _fact()
+        mapping_product = pd.DataFrame({'number_product': [1, 2], 'id_product': [10, 20]})
+        mapping_store = pd.DataFrame({'number_store': [5, 6, 7], 'id_store': pd.array([1, 2, 3], dtype='Int32')})
+        products = pd.DataFrame({
+            'number_product': [2, 3, 4],
+            'product_name': pd.Categorical(['b', 'c', 'd']),
+            'moq': [1, 2, 3],
+        })
+        dimensions = [
+            (mapping_product, 'number_product'), (mapping_store, 'number_store'), (products, 'number_product'),
+        ]
+
+        expected = fact
+        for dimension, key in dimensions:
+            expected = expected.merge(dimension, on=key, how='left')
+
+        pd.testing.assert_frame_equal(join_dimensions(fact, dimensions), expected)
+
+    def test_duplicated_dimension_keys_are_rejected(self):
+        mapping_product = pd.DataFrame({'number_product': [1, 1], 'id_product': [10, 11]})
+
+        with pytest.raises(ValueError, match='not unique'):
+            join_dimensions(_fact(), [(mapping_product, 'number_product')])
+
+    def test_versioned_dimension_is_joined_as_of_the_fact_date(self):
+        fact = _fact().assign(target_date=pd.to_datetime(
+            ['2024-01-01', '2024-01-05', '2024-01-03', '2024-01-03', '2024-01-10']
+        ))
+        prices = pd.DataFrame({
+            'number_product': [1, 1, 1, 2],
+            'price': [1.0, 1.5, 2.0, 3.0],
+            'valid_from': pd.to_datetime(['2024-01-02', '2024-01-05', '2024-01-10', '2024-01-01']),
+            'valid_to': pd.to_datetime(['2024-01-05', '2024-01-10', None, None]),
+        })
+
+        joined = join_dimensions(fact, [(prices, 'number_product')])
+
+        # before its first version a product gets that version, unknown products get nothing
+        np.testing.assert_array_equal(joined['price'], [1.0, 3.0, np.nan, np.nan, 2.0])
+        assert list(joined.columns) == list(fact.columns) + ['price']
+
+    def test_versions_starting_the_same_day_are_rejected(self):
+        prices = pd.DataFrame({
+            'number_product': [1, 1],
+            'price': [1.0, 1.5],
+            'valid_from': pd.to_datetime(['2024-01-02', '2024-01-02']),
+        })
+
+        fact = _fact().assign(target_date=pd.Timestamp('2024-01-03'))
+
+        with pytest.raises(ValueError, match='same day'):
+            join_dimensions(fact, [(prices, 'number_product')])
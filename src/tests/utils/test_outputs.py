@@ -0,0 +1,30 @@
+import pandas as pd
+import pyarrow as pa
+
+from coding_challenge.utils.outputs import create_ml_dataset
+
+
+def _primary():
+    return pa.table({
+        'id_product': pa.array([1, 1, None], pa.int32()),
+        'id_store': pa.array([10, 10, 10], pa.int32()),
+        'target_date': pa.array(pd.to_datetime(['2024-01-01', '2024-01-03', '2024-01-01']).date, pa.date32()),
+        'sales_qty': pa.array([1, 2, 3], pa.float32()),
+        'return_qty': pa.array([0, 0, 0], pa.float32()),
+        'stockout': [False, True, False],
+    })
+
+
+class TestCreateMlDataset:
+    def test_observed_rows_by_default(self):
+        ml = create_ml_dataset(_primary())
+
+        assert ml.column_names == ['id_product', 'id_store', 'target_date', 'sales_qty', 'stockout']
+        assert ml.num_rows == 3
+
+    def test_dense_panel_when_enabled(self):
+        ml = create_ml_dataset(_primary(), {'enabled': True}).to_table()
+
+        # the missing day is filled, the row without a product is dropped
+        assert ml['sales_qty'].to_pylist() == [1, 0, 2]
+        assert ml['stockout'].to_pylist() == [False, False, True]
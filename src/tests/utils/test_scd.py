@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from coding_challenge.utils.scd import build_versions
+
+
+def _snapshots():
+    return pd.DataFrame({
+        'number_product': [1, 2, 1, 2, 1, 1, 2],
+        'price': [1.0, np.nan, 1.0, np.nan, 1.2, 1.5, np.nan],
+        'extraction_date': pd.to_datetime([
+            '2024-01-01 06:00', '2024-01-01 06:00', '2024-01-02 06:00', '2024-01-02 06:00',
+            '2024-01-03 06:00', '2024-01-03 18:00', '2024-01-04 06:00',
+        ]),
+    })
+
+
+class TestBuildVersions:
+    def test_unchanged_snapshots_are_compacted(self):
+        versions = build_versions(_snapshots(), ['number_product'], ['price'])
+
+        expected = pd.DataFrame({
+            'number_product': [1, 1, 2],
+            # the latest extraction of a day wins, missing prices are equal
+            'price': [1.0, 1.5, np.nan],
+            'valid_from': pd.to_datetime(['2024-01-01', '2024-01-03', '2024-01-01']),
+            'valid_to': pd.to_datetime(['2024-01-03', None, None]),
+        })
+        pd.testing.assert_frame_equal(versions, expected)
+
+    def test_reverting_values_start_a_new_version(self):
+        snapshots = _snapshots()
+        snapshots.loc[len(snapshots)] = [1, 1.0, pd.Timestamp('2024-01-05 06:00')]
+
+        versions = build_versions(snapshots, ['number_product'], ['price'])
+
+        assert versions.loc[versions['number_product'] == 1, 'price'].tolist() == [1.0, 1.5, 1.0]
+        assert versions['valid_to'].isna().sum() == 2
+
+    def test_empty_snapshots(self):
+        versions = build_versions(_snapshots().iloc[:0], ['number_product'], ['price'])
+
+        assert versions.empty
+        assert list(versions.columns) == ['number_product', 'price', 'valid_from', 'valid_to']
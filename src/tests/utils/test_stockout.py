@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from coding_challenge.utils.stockout import evaluate_stockout, required_columns
+
+
+def large_orders(columns, threshold=5):
+    return columns['customer_order_qty'] > threshold
+
+
+def _galaxy():
+    return pd.DataFrame({
+        'sales_qty': [5.0, 3.0, 2.0, np.nan, 4.0],
+        'delivery_qty': [4.0, 3.0, 6.0, 1.0, 0.0],
+        'customer_order_qty': [0.0, 1.0, 8.0, 0.0, np.nan],
+        'delivery_number': pd.array([1, 2, None, 1, 1], dtype='Int16'),
+        'last_sale_time': pd.to_timedelta(['19:00:00', '17:30:00', None, '12:00:00', '20:00:00']),
+    })
+
+
+class TestEvaluateStockout:
+    def test_default_flags_sales_above_deliveries(self):
+        data = _galaxy()
+
+        stockout = evaluate_stockout(data)
+
+        assert stockout.tolist() == [True, False, False, False, True]
+        assert stockout.tolist() == (data['sales_qty'] > data['delivery_qty']).tolist()
+
+    def test_rules_are_combined_with_any_or_all(self):
+        data = _galaxy()
+        rules = [
+            {'rule': 'sold_out'},
+            {'rule': 'early_last_sale', 'closing_time': '20:00:00', 'min_gap': '02:00:00'},
+        ]
+
+        assert evaluate_stockout(data, {'combine': 'any', 'rules': rules}).tolist() == [
+            True, True, False, False, False
+        ]
+        assert evaluate_stockout(data, {'combine': 'all', 'rules': rules}).tolist() == [
+            False, True, False, False, False
+        ]
+
+    def test_missing_values_never_flag(self):
+        data = _galaxy()
+        config = {'rules': [{'rule': 'restocked'}, {'rule': 'unserved_customer_orders'}]}
+
+        assert evaluate_stockout(data, config).tolist() == [False, True, True, False, False]
+
+    def test_batches_and_arrow_input_give_the_same_flags(self):
+        data = _galaxy()
+        config = {'combine': 'any', 'rules': [{'rule': 'sold_out'}, {'rule': 'restocked'}]}
+        expected = evaluate_stockout(data, config)
+
+        assert evaluate_stockout(data, config, batch_size=2).tolist() == expected.tolist()
+        assert evaluate_stockout(pa.Table.from_pandas(data), config).tolist() == expected.tolist()
+
+    def test_rule_by_import_path(self):
+        config = {'rules': [{
+            'rule': 'tests.utils.test_stockout.large_orders',
+            'columns': ['customer_order_qty'],
+            'threshold': 1,
+        }]}
+
+        assert required_columns(config) == ['customer_order_qty']
+        assert evaluate_stockout(_galaxy(), config).tolist() == [False, False, True, False, False]
+
+    def test_unknown_rules_and_missing_columns_raise(self):
+        data = _galaxy()
+
+        with pytest.raises(KeyError, match='Unknown stockout rule'):
+            evaluate_stockout(data, {'rules': [{'rule': 'nope'}]})
+        with pytest.raises(KeyError, match='needs the'):
+            evaluate_stockout(data, {'rules': [{'rule': 'tests.utils.test_stockout.large_orders'}]})
+        with pytest.raises(KeyError, match='first_sale_time'):
+            evaluate_stockout(data, {'rules': [{'rule': 'restocked', 'columns': ['first_sale_time']}]})
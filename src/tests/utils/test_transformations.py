@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from coding_challenge.utils.transformations import deduplicate_incremental_data, factorize_keys
+
+
+def _reference(df, key_cols):
+    return df.sort_values('extraction_date', kind='stable').drop_duplicates(
+        subset=key_cols,
+        keep='last'
+    )
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(7)
+    n_rows = 5000
+    extraction_dates = pd.date_range('2024-01-01', periods=10).to_numpy()
+    return pd.DataFrame({
+        'target_date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 20, n_rows), unit='D'),
+        'number_store': rng.integers(1, 5, n_rows),
+        'number_product': rng.integers(1, 30, n_rows),
+        'extraction_date': extraction_dates[rng.integers(0, 10, n_rows)],
+        'quantity': np.arange(n_rows, dtype=float),
+    })
+
+
+class TestDeduplicateIncrementalData:
+    @pytest.mark.parametrize('key_cols', [
+        ['target_date', 'number_store', 'number_product'],
+        ['number_product'],
+    ])
+    def test_matches_sort_then_drop_duplicates(self, history, key_cols):
+        expected = _reference(history, key_cols).sort_index()
+        actual = deduplicate_incremental_data(history, key_cols)
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_missing_extraction_date_wins_like_sort_values(self, history):
+        history.loc[[3, 10], 'extraction_date'] = pd.NaT
+        key_cols = ['number_product']
+
+        pd.testing.assert_frame_equal(
+            deduplicate_incremental_data(history, key_cols),
+            _reference(history, key_cols).sort_index()
+        )
+
+
+class TestFactorizeKeys:
+    def test_group_count_is_bounded_by_the_rows_with_realistic_cardinality(self):
+        # ~365 dates x 1000 stores x 5000 products would span 1.8e9 mixed-radix codes
+        rng = np.random.default_rng(3)
+        n_rows = 200_000
+        days = pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D')
+        df = pd.DataFrame({
+            'target_date': pd.Timestamp('2024-01-01') + days,
+            'number_store': rng.integers(0, 1000, n_rows),
+            'number_product': rng.integers(0, 5000, n_rows),
+        })
+
+        codes, n_groups = factorize_keys(df, list(df.columns))
+
+        assert n_groups <= n_rows
+        assert codes.max() < n_groups
+        assert n_groups == len(df.drop_duplicates())
+        pd.testing.assert_series_equal(
+            pd.Series(codes).duplicated(), pd.Series(df.duplicated().to_numpy()), check_names=False
+        )